@@ -0,0 +1,351 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import random
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import boto3
+from botocore.exceptions import ClientError
+from common.batch_loader import BATCH_WRITE_LIMIT, batch_get_items, batch_put_items, chunked
+from common.building_roles import composite_key
+from common.cognito_auth import ROLE_CODES, authorize_building, forget_cached_roles
+from common.pagination import InvalidPageToken, decode_next_token, encode_next_token
+
+cognito_client = boto3.client('cognito-idp')
+
+USERS_TABLE_NAME = os.environ.get('TABLE_USERS', 'Users-dev')
+USER_BUILDING_ROLES_TABLE = os.environ.get('TABLE_USER_BUILDING_ROLES', 'UserBuildingRoles-dev')
+USER_POOL_ID = os.environ.get('USER_POOL_ID')
+
+# Cognito admin APIs are rate limited per pool, so keep the pool small and
+# back off on throttling rather than fanning out wide.
+BULK_COGNITO_WORKERS = int(os.environ.get('BULK_COGNITO_WORKERS', '8'))
+MAX_COGNITO_ATTEMPTS = 6
+THROTTLING_ERRORS = {'TooManyRequestsException', 'ThrottlingException', 'LimitExceededException'}
+MAX_RESIDENTS_PER_REQUEST = 1000
+# Stop starting new chunks when less than this much Lambda time is left and
+# hand back a checkpoint instead.
+TIME_RESERVE_MS = 8000
+
+cognito_executor = ThreadPoolExecutor(max_workers=BULK_COGNITO_WORKERS)
+
+
+def response(status, body):
+    return {
+        'statusCode': status,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Credentials': 'true'
+        },
+        'body': json.dumps(body)
+    }
+
+
+def parse_residents(body):
+    """Return resident rows from a JSON `residents` list or a `csv` string with a header row"""
+    if body.get('csv'):
+        reader = csv.DictReader(io.StringIO(body['csv']))
+        return [{(k or '').strip().lower(): (v or '') for k, v in row.items()} for row in reader]
+    residents = body.get('residents') or []
+    if not isinstance(residents, list):
+        raise ValueError('residents must be a list')
+    return residents
+
+
+def validate_resident(resident):
+    """Normalise one row; returns (row, None) or (None, error message)"""
+    if not isinstance(resident, dict):
+        return None, 'Row must be an object'
+
+    name = str(resident.get('name', '')).strip()
+    mobile = str(resident.get('mobile', '')).strip()
+    password = str(resident.get('password', '')).strip()
+    role = str(resident.get('role') or 'member').strip().lower()
+
+    if not name or not mobile or not password:
+        return None, 'Name, mobile, and password are required'
+    if not mobile.isdigit() or len(mobile) != 10:
+        return None, 'Please enter a valid 10-digit mobile number'
+    if len(password) < 6:
+        return None, 'Password must be at least 6 characters'
+    if role not in ROLE_CODES:
+        return None, f"Role must be one of: {', '.join(ROLE_CODES)}"
+
+    return {
+        'name': name,
+        'mobile': mobile,
+        'password': password,
+        'role': role,
+        'user_id': f"user_{mobile}",
+        'cognito_username': f"+91{mobile}"
+    }, None
+
+
+def residents_digest(building_id, residents):
+    """Fingerprint of an import so a checkpoint cannot be replayed against other rows"""
+    canonical = json.dumps([building_id, residents], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+def call_with_backoff(operation, **kwargs):
+    """Call a Cognito admin API, retrying throttling errors with jittered exponential backoff"""
+    for attempt in range(MAX_COGNITO_ATTEMPTS):
+        try:
+            return operation(**kwargs)
+        except ClientError as e:
+            if e.response['Error']['Code'] not in THROTTLING_ERRORS or attempt == MAX_COGNITO_ATTEMPTS - 1:
+                raise
+            time.sleep(random.uniform(0, min(0.1 * (2 ** attempt), 3.0)))
+
+
+def ensure_cognito_user(row):
+    """
+    Create the resident's Cognito user; returns 'created' or 'exists'.
+    An account that already exists belongs to someone else's login, so it
+    is never touched here: no password, no attributes. The import only
+    attaches the building role to it.
+    """
+    try:
+        call_with_backoff(
+            cognito_client.admin_create_user,
+            UserPoolId=USER_POOL_ID,
+            Username=row['cognito_username'],
+            TemporaryPassword=row['password'],
+            MessageAction='SUPPRESS',
+            # Never move a phone alias off another account
+            ForceAliasCreation=False,
+            UserAttributes=[
+                {'Name': 'phone_number', 'Value': row['cognito_username']},
+                {'Name': 'phone_number_verified', 'Value': 'true'},
+                {'Name': 'name', 'Value': row['name']},
+                {'Name': 'email', 'Value': f"{row['mobile']}@example.com"}
+            ]
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'UsernameExistsException':
+            raise
+        return 'exists'
+
+    call_with_backoff(
+        cognito_client.admin_set_user_password,
+        UserPoolId=USER_POOL_ID,
+        Username=row['cognito_username'],
+        Password=row['password'],
+        Permanent=True
+    )
+    return 'created'
+
+
+def save_rows(building_id, rows):
+    """
+    Batch-write Users and UserBuildingRoles for rows whose Cognito user is
+    ready. Each row is merged over the full existing item, so attributes the
+    import does not set (last_login, approved_by, unit details, ...) are
+    kept. The Users profile of an account that already existed is left as
+    it is. Returns the set of user_ids whose writes failed.
+    """
+    now = datetime.now().isoformat()
+    existing_users = batch_get_items(USERS_TABLE_NAME, 'user_id', [r['user_id'] for r in rows])
+    existing_roles = batch_get_items(
+        USER_BUILDING_ROLES_TABLE, 'user_building_composite',
+        [composite_key(r['user_id'], building_id) for r in rows]
+    )
+
+    role_items = []
+    role_changed = set()
+    for row in rows:
+        key = composite_key(row['user_id'], building_id)
+        existing_role = existing_roles.get(key, {})
+        if existing_role.get('role') != row['role']:
+            role_changed.add(row['user_id'])
+        role_items.append({
+            **existing_role,
+            'user_building_composite': key,
+            'user_id': row['user_id'],
+            'building_id': building_id,
+            'role': row['role'],
+            'created_at': existing_role.get('created_at', now),
+            'updated_at': now
+        })
+
+    # Roles are written before the users' roles_updated_at moves, so a
+    # token minted in between can only carry the new role
+    failed = {item['user_id'] for item in batch_put_items(USER_BUILDING_ROLES_TABLE, role_items)}
+
+    roles_updated_at = int(time.time())
+    user_items = []
+    for row in rows:
+        existing_user = existing_users.get(row['user_id'], {})
+        if row.get('existing_account') and existing_user:
+            if row['user_id'] not in role_changed:
+                continue
+            user_item = dict(existing_user)
+        else:
+            user_item = {
+                **existing_user,
+                'user_id': row['user_id'],
+                'cognito_username': row['cognito_username'],
+                'name': row['name'],
+                'mobile': row['mobile'],
+                'status': existing_user.get('status', 'active'),
+                'created_at': existing_user.get('created_at', now),
+                'updated_at': now
+            }
+        if row['user_id'] in role_changed:
+            # Same stamp mark_roles_changed writes: older tokens must refresh
+            user_item['roles_updated_at'] = roles_updated_at
+        user_items.append(user_item)
+
+    failed.update(item['user_id'] for item in batch_put_items(USERS_TABLE_NAME, user_items))
+
+    for user_id in role_changed:
+        forget_cached_roles(user_id, building_id)
+    return failed
+
+
+def safe_ensure_cognito_user(row):
+    try:
+        return ensure_cognito_user(row), None
+    except ClientError as e:
+        print(f"Cognito error for {row['mobile']}: {e.response['Error']['Code']}")
+        return None, e.response['Error']['Message']
+    except Exception as e:
+        print(f"Unexpected Cognito error for {row['mobile']}: {str(e)}")
+        return None, str(e)
+
+
+def import_chunk(building_id, chunk):
+    """Run one chunk of (index, row) pairs through Cognito and DynamoDB; returns per-row results"""
+    results = {}
+    ready = []
+
+    outcomes = cognito_executor.map(
+        lambda item: (item, safe_ensure_cognito_user(item[1])), chunk
+    )
+    for (index, row), (outcome, error) in outcomes:
+        if error:
+            results[index] = {'row': index, 'mobile': row['mobile'], 'status': 'failed', 'error': error}
+        else:
+            results[index] = {'row': index, 'mobile': row['mobile'], 'user_id': row['user_id'], 'status': outcome}
+            ready.append({**row, 'existing_account': outcome == 'exists'})
+
+    if ready:
+        try:
+            failed_ids = save_rows(building_id, ready)
+        except Exception as e:
+            print(f"Error saving residents: {str(e)}")
+            failed_ids = {row['user_id'] for row in ready}
+        for index, row in chunk:
+            if row['user_id'] in failed_ids and results[index]['status'] != 'failed':
+                results[index] = {'row': index, 'mobile': row['mobile'], 'status': 'failed',
+                                  'error': 'Could not save user records'}
+
+    return [results[index] for index, _ in chunk]
+
+
+def lambda_handler(event, context):
+    """
+    POST /register/bulk
+    Body: {building_id, residents: [{name, mobile, password, role?}] | csv, checkpoint?}
+    A mobile that already has an account is reported as `exists` and only
+    gets the building role; its password and profile are left alone.
+    Rows are processed in order in chunks. If the Lambda runs short of time
+    the response carries a checkpoint; resubmit the same rows with it to
+    continue where the previous call stopped.
+    """
+    try:
+        print("=== BULK REGISTER STARTED ===")
+
+        if isinstance(event.get('body'), str):
+            body = json.loads(event.get('body') or '{}')
+        else:
+            body = event.get('body') or {}
+
+        building_id = str(body.get('building_id', '')).strip()
+        if not building_id:
+            return response(400, {'message': 'building_id is required', 'success': False})
+
+        if not USER_POOL_ID:
+            return response(500, {'message': 'Server configuration error', 'success': False,
+                                  'error': 'Cognito configuration missing'})
+
+        user, role, error = authorize_building(event, building_id, allowed_roles=('admin',))
+        if error:
+            return error
+
+        try:
+            residents = parse_residents(body)
+        except (ValueError, csv.Error) as e:
+            return response(400, {'message': f'Invalid residents payload: {str(e)}', 'success': False})
+
+        if not residents:
+            return response(400, {'message': 'No residents supplied', 'success': False})
+        if len(residents) > MAX_RESIDENTS_PER_REQUEST:
+            return response(400, {'message': f'At most {MAX_RESIDENTS_PER_REQUEST} residents per request',
+                                  'success': False})
+
+        digest = residents_digest(building_id, residents)
+        start = 0
+        if body.get('checkpoint'):
+            try:
+                checkpoint = decode_next_token(body['checkpoint'])
+            except InvalidPageToken:
+                return response(400, {'message': 'Invalid checkpoint', 'success': False})
+            if checkpoint.get('digest') != digest:
+                return response(400, {'message': 'Checkpoint does not match these residents', 'success': False})
+            start = int(checkpoint.get('offset', 0))
+
+        # Every row is validated, even before a checkpoint's offset, so a
+        # duplicate is judged against the whole import on every call
+        results = []
+        valid = []
+        seen_mobiles = set()
+        for index, resident in enumerate(residents):
+            row, row_error = validate_resident(resident)
+            if row and row['mobile'] in seen_mobiles:
+                row, row_error = None, 'Duplicate mobile in this import'
+            if row:
+                seen_mobiles.add(row['mobile'])
+            if index < start:
+                continue
+            if row_error:
+                results.append({'row': index, 'status': 'invalid', 'error': row_error})
+            else:
+                valid.append((index, row))
+
+        next_offset = None
+        for chunk in chunked(valid, BATCH_WRITE_LIMIT):
+            if context and context.get_remaining_time_in_millis() < TIME_RESERVE_MS:
+                next_offset = chunk[0][0]
+                # Rows from here on are reported by the resumed call
+                results = [r for r in results if r['row'] < next_offset]
+                break
+            results.extend(import_chunk(building_id, chunk))
+
+        results.sort(key=lambda r: r['row'])
+        summary = {}
+        for r in results:
+            summary[r['status']] = summary.get(r['status'], 0) + 1
+
+        body_out = {
+            'message': 'Import incomplete, resubmit with checkpoint' if next_offset is not None else 'Import complete',
+            'success': True,
+            'building_id': building_id,
+            'summary': summary,
+            'results': results,
+            'checkpoint': encode_next_token({'offset': next_offset, 'digest': digest}) if next_offset is not None else None
+        }
+        print(f"Bulk register for {building_id}: {summary}, checkpoint at {next_offset}")
+        return response(200, body_out)
+
+    except Exception as e:
+        print(f"Unexpected bulk registration error: {str(e)}")
+        traceback.print_exc()
+        return response(500, {'message': 'Bulk registration failed. Please try again.', 'success': False,
+                              'error': str(e)})
@@ -2,8 +2,12 @@ import json
 import boto3
 import os
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from botocore.exceptions import ClientError
+from common.batch_loader import query_all
+from common.cognito_auth import decode_role_claim
+from common.common_utils import decode_trusted_token
 
 cognito_client = boto3.client('cognito-idp')
 dynamodb = boto3.resource('dynamodb')
@@ -19,10 +23,47 @@ print(f"Login Function - Env Variables: USER_POOL_ID={USER_POOL_ID}, CLIENT_ID={
 users_table = dynamodb.Table(USERS_TABLE_NAME)
 user_building_roles_table = dynamodb.Table(USER_BUILDING_ROLES_TABLE)
 
+# Post-auth DynamoDB work (users upsert + roles query) runs side by side
+login_executor = ThreadPoolExecutor(max_workers=2)
+
 def get_consistent_user_id(mobile):
     """Get consistent user_id based on mobile number"""
     return f"user_{mobile}"
 
+def upsert_user(user_id, name, mobile, cognito_mobile):
+    """Record the login, creating the Users row on first login, in one write"""
+    now = datetime.now().isoformat()
+    users_table.update_item(
+        Key={'user_id': user_id},
+        UpdateExpression=(
+            'SET last_login = :login, '
+            '#name = if_not_exists(#name, :name), '
+            'mobile = if_not_exists(mobile, :mobile), '
+            'cognito_username = if_not_exists(cognito_username, :cognito_username), '
+            '#status = if_not_exists(#status, :active), '
+            'created_at = if_not_exists(created_at, :login)'
+        ),
+        ExpressionAttributeNames={'#name': 'name', '#status': 'status'},
+        ExpressionAttributeValues={
+            ':login': now,
+            ':name': name,
+            ':mobile': mobile,
+            ':cognito_username': cognito_mobile,
+            ':active': 'active'
+        }
+    )
+
+def get_building_roles(user_id):
+    """Return the user's building roles with only the fields the app uses"""
+    return query_all(
+        user_building_roles_table,
+        IndexName='UserIdIndex',
+        KeyConditionExpression='user_id = :uid',
+        ProjectionExpression='building_id, #role',
+        ExpressionAttributeNames={'#role': 'role'},
+        ExpressionAttributeValues={':uid': user_id}
+    )
+
 def lambda_handler(event, context):
     try:
         print("=== LOGIN STARTED ===")
@@ -196,66 +237,44 @@ def lambda_handler(event, context):
                     })
                 }
 
-        # Get user info from Cognito
+        # Profile and role claims come from the ID token Cognito just returned
         try:
-            user_info = cognito_client.get_user(AccessToken=auth_result['AccessToken'])
-            user_attributes = {attr['Name']: attr['Value'] for attr in user_info.get('UserAttributes', [])}
-            name = user_attributes.get('name', '')
+            id_claims = decode_trusted_token(auth_result['IdToken'])
         except Exception as e:
-            print(f"Error getting user info: {str(e)}")
-            name = ''
+            print(f"Error reading ID token claims: {str(e)}")
+            id_claims = {}
+        name = id_claims.get('name', '')
+        claimed_roles = decode_role_claim(id_claims)
 
-        # DYNAMODB USERS TABLE HANDLING
+        # USERS UPSERT AND BUILDING ROLES, IN PARALLEL
         user_id = get_consistent_user_id(mobile)
-        
+        upsert_future = login_executor.submit(upsert_user, user_id, name, mobile, cognito_mobile)
+        # The pre-token trigger already put the roles in the ID token; only
+        # query when it did not (e.g. trigger not attached to the pool)
+        roles_future = None
+        if claimed_roles is None:
+            roles_future = login_executor.submit(get_building_roles, user_id)
+
         try:
-            # Check if user exists in our Users table
-            response = users_table.get_item(
-                Key={'user_id': user_id}
-            )
-            
-            if 'Item' in response:
-                user_item = response['Item']
-                # Update last login
-                users_table.update_item(
-                    Key={'user_id': user_id},
-                    UpdateExpression='SET last_login = :login',
-                    ExpressionAttributeValues={':login': datetime.now().isoformat()}
-                )
-                print(f"User found in DynamoDB: {user_id}")
-            else:
-                # Create new user record if doesn't exist
-                users_table.put_item(
-                    Item={
-                        'user_id': user_id,
-                        'name': name,
-                        'mobile': mobile,
-                        'cognito_username': cognito_mobile,
-                        'status': 'active',
-                        'created_at': datetime.now().isoformat(),
-                        'last_login': datetime.now().isoformat()
-                    }
-                )
-                print(f"Created new user record in DynamoDB: {user_id}")
-                
+            upsert_future.result()
+            print(f"Recorded login for user: {user_id}")
         except Exception as db_error:
             print(f"Database error: {str(db_error)}")
             # Continue even if DB operation fails
 
-        # GET USER'S BUILDING ROLES
-        try:
-            roles_response = user_building_roles_table.query(
-                IndexName='UserIdIndex',
-                KeyConditionExpression='user_id = :uid',
-                ExpressionAttributeValues={':uid': user_id}
-            )
-            
-            building_roles = roles_response.get('Items', [])
-            print(f"Found {len(building_roles)} building roles for user {user_id}")
-            
-        except Exception as roles_error:
-            print(f"Error fetching user roles: {str(roles_error)}")
-            building_roles = []
+        if roles_future is None:
+            building_roles = [
+                {'building_id': building_id, 'role': role}
+                for building_id, role in claimed_roles.items()
+            ]
+            print(f"Read {len(building_roles)} building roles from ID token for user {user_id}")
+        else:
+            try:
+                building_roles = roles_future.result()
+                print(f"Found {len(building_roles)} building roles for user {user_id}")
+            except Exception as roles_error:
+                print(f"Error fetching user roles: {str(roles_error)}")
+                building_roles = []
 
         # PREPARE RESPONSE
         response_body = {
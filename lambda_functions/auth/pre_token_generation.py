@@ -0,0 +1,49 @@
+import boto3
+import os
+from common.batch_loader import query_all
+from common.cognito_auth import ROLE_CLAIM, encode_role_claim
+
+dynamodb = boto3.resource('dynamodb')
+
+USER_BUILDING_ROLES_TABLE = os.environ.get('TABLE_USER_BUILDING_ROLES', 'UserBuildingRoles-dev')
+
+user_building_roles_table = dynamodb.Table(USER_BUILDING_ROLES_TABLE)
+
+
+def user_id_from_attributes(attributes):
+    """Same user_id scheme as login/register: user_<10-digit mobile>"""
+    phone = attributes.get('phone_number', '')
+    mobile = phone[3:] if phone.startswith('+91') else phone
+    return f"user_{mobile}" if mobile else None
+
+
+def lambda_handler(event, context):
+    """
+    Cognito pre-token-generation trigger. Reads the user's building roles
+    once per token issue (sign-in and refresh) and embeds them in the ID
+    token, so handlers can authorize from claims instead of a
+    UserBuildingRoles lookup per request.
+    """
+    user_id = user_id_from_attributes(event.get('request', {}).get('userAttributes', {}))
+    if not user_id:
+        return event
+
+    try:
+        roles = query_all(
+            user_building_roles_table,
+            IndexName='UserIdIndex',
+            KeyConditionExpression='user_id = :uid',
+            ProjectionExpression='building_id, #role',
+            ExpressionAttributeNames={'#role': 'role'},
+            ExpressionAttributeValues={':uid': user_id}
+        )
+    except Exception as e:
+        # Never block sign-in; handlers fall back to UserBuildingRoles
+        print(f"Error loading roles for {user_id}: {str(e)}")
+        return event
+
+    event.setdefault('response', {})['claimsOverrideDetails'] = {
+        'claimsToAddOrOverride': {ROLE_CLAIM: encode_role_claim(roles)}
+    }
+    print(f"Embedded {len(roles)} building roles for {user_id}")
+    return event
@@ -5,6 +5,7 @@ import uuid
 from datetime import datetime
 from botocore.exceptions import ClientError
 import traceback
+from common.cognito_auth import mark_roles_changed
 
 cognito_client = boto3.client('cognito-idp')
 dynamodb = boto3.resource('dynamodb')
@@ -268,6 +269,9 @@ def lambda_handler(event, context):
                                 ':updated': datetime.now().isoformat()
                             }
                         )
+                        if existing_role['Item'].get('role') != role:
+                            # Tokens issued earlier still carry the old role
+                            mark_roles_changed(user_id, building_id)
                         print(f"Updated existing role to '{role}' for user {user_id} in building {building_id}")
                     else:
                         # Create new role
@@ -296,6 +300,8 @@ def lambda_handler(event, context):
                             'updated_at': datetime.now().isoformat()
                         }
                     )
+                    # May have replaced a role we could not read
+                    mark_roles_changed(user_id, building_id)
                 
                 building_role_assigned = {
                     'building_id': building_id,
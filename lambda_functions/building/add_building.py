@@ -5,8 +5,11 @@ import os
 import traceback
 from datetime import datetime
 from decimal import Decimal
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
 
 TABLE_BUILDINGS = os.environ['TABLE_BUILDINGS']
+TABLE_BUILDING_CODES = os.environ.get('TABLE_BUILDING_CODES', 'BuildingCodes-dev')
 USERS_TABLE = os.environ.get('USERS_TABLE')
 USER_BUILDING_ROLES_TABLE = os.environ.get('TABLE_USER_BUILDING_ROLES') 
 
@@ -15,6 +18,12 @@ buildings_table = dynamodb.Table(TABLE_BUILDINGS)
 users_table = dynamodb.Table(USERS_TABLE) if USERS_TABLE else None
 user_building_roles_table = dynamodb.Table(USER_BUILDING_ROLES_TABLE) if USER_BUILDING_ROLES_TABLE else None  
 
+# Building codes are reserved with an item in the BuildingCodes table keyed
+# by building_code, written in the same transaction as the building. Keeping
+# reservations out of Buildings means scans, get_building and the GSIs only
+# ever see real buildings.
+MAX_BUILDING_CODE_ATTEMPTS = 4
+
 def validate_user(user_id):
     """
     Check if user exists in Users table
@@ -134,16 +143,18 @@ def generate_building_code(building_name, building_id):
 
 def check_building_code_unique(building_code):
     """
-    Check if building_code already exists in the database
+    Check BuildingCodeIndex for an existing building with this code.
+    Covers buildings created before code reservations existed.
     Returns True if unique, False if duplicate
     """
     try:
-        response = buildings_table.scan(
-            FilterExpression='building_code = :code',
-            ExpressionAttributeValues={':code': building_code}
+        response = buildings_table.query(
+            IndexName='BuildingCodeIndex',
+            KeyConditionExpression=Key('building_code').eq(building_code),
+            Limit=1
         )
         
-        if response.get('Items') and len(response['Items']) > 0:
+        if response.get('Items'):
             print(f"Building code {building_code} already exists")
             return False
         
@@ -152,6 +163,80 @@ def check_building_code_unique(building_code):
         print(f"Error checking building code uniqueness: {e}")
         return True
 
+def next_building_code(building_code, building_id, attempt):
+    """Derive the candidate code for a retry after a collision"""
+    if attempt >= MAX_BUILDING_CODE_ATTEMPTS - 1:
+        return f"BLD{uuid.uuid4().hex[:3].upper()}"
+    
+    if building_id and '-' in building_id:
+        suffix_part = building_id.split('-')[-1]
+        new_suffix = (suffix_part[-3:].upper() + str(attempt))[-3:]
+    else:
+        new_suffix = uuid.uuid4().hex[:3].upper()
+    
+    return f"{building_code[:3]}{new_suffix}"
+
+def create_building_with_code(building_item, building_code):
+    """
+    Put the building and its code reservation in one transaction.
+    Returns False if the code is already reserved, raises on other errors.
+    """
+    building_item = {**building_item, 'building_code': building_code}
+    try:
+        dynamodb.meta.client.transact_write_items(
+            TransactItems=[
+                {
+                    'Put': {
+                        'TableName': TABLE_BUILDING_CODES,
+                        'Item': {
+                            'building_code': building_code,
+                            'building_id': building_item['building_id'],
+                            'created_at': building_item['created_at']
+                        },
+                        'ConditionExpression': 'attribute_not_exists(building_code)'
+                    }
+                },
+                {
+                    'Put': {
+                        'TableName': TABLE_BUILDINGS,
+                        'Item': building_item,
+                        'ConditionExpression': 'attribute_not_exists(building_id)'
+                    }
+                }
+            ]
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'TransactionCanceledException':
+            raise
+        reasons = e.response.get('CancellationReasons', [])
+        if reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+            print(f"Building code {building_code} already reserved")
+            return False
+        raise
+
+def save_building(building_item, building_name):
+    """
+    Create the building under a unique building_code. Collisions are
+    detected with a BuildingCodeIndex lookup and the conditional
+    reservation write, never a table scan. Returns the code used.
+    """
+    building_id = building_item['building_id']
+    building_code = generate_building_code(building_name, building_id)
+    
+    for attempt in range(MAX_BUILDING_CODE_ATTEMPTS):
+        if attempt:
+            building_code = next_building_code(building_code, building_id, attempt)
+            print(f"Building code collision, trying {building_code} (attempt {attempt})")
+        
+        if not check_building_code_unique(building_code):
+            continue
+        
+        if create_building_with_code(building_item, building_code):
+            return building_code
+    
+    raise Exception('Could not allocate a unique building code')
+
 def lambda_handler(event, context):
     try:
         print("=== ADD BUILDING ===")
@@ -265,28 +350,6 @@ def lambda_handler(event, context):
         building_id = f"BLD-{uuid.uuid4().hex[:8].upper()}"
         current_time = datetime.utcnow().isoformat()
 
-        building_code = generate_building_code(building_name, building_id)
-        
-        attempts = 0
-        max_attempts = 3
-        while not check_building_code_unique(building_code) and attempts < max_attempts:
-            attempts += 1
-            print(f"Building code {building_code} exists, generating new one (attempt {attempts})")
-            
-            if building_id and '-' in building_id:
-                suffix_part = building_id.split('-')[-1]
-                new_suffix = (suffix_part[-3:].upper() + str(attempts))[:3]
-            else:
-                new_suffix = uuid.uuid4().hex[:3].upper()
-            
-            prefix = building_code[:3]
-            building_code = f"{prefix}{new_suffix}"
-        
-        if attempts >= max_attempts:
-            timestamp = str(int(datetime.utcnow().timestamp()))[-3:]
-            building_code = f"BLD{timestamp}"
-            print(f"Using fallback building code: {building_code}")
-
         total_units_of_building = 0
         processed_wings = {}
 
@@ -377,7 +440,6 @@ def lambda_handler(event, context):
         building_item = {
             'building_id': building_id,
             'building_name': building_name,
-            'building_code': building_code,  
             'user_id': user_id,
             'wings': wings,
             'wing_details': processed_wings,
@@ -389,7 +451,7 @@ def lambda_handler(event, context):
         }
 
         try:
-            buildings_table.put_item(Item=building_item)
+            building_code = save_building(building_item, building_name)
             print(f"Building created: {building_id} with code: {building_code} by user: {user_id}")
             
             role_assigned = assign_admin_role_to_user(user_id, building_id)
@@ -3,6 +3,7 @@ import boto3
 import os
 import traceback
 from datetime import datetime
+from common.batch_loader import load_buildings
 
 dynamodb = boto3.resource('dynamodb')
 TABLE_BUILDINGS = os.environ['TABLE_BUILDINGS']
@@ -78,59 +79,49 @@ def lambda_handler(event, context):
             user_roles = roles_response.get('Items', [])
             print(f"Found {len(user_roles)} role entries for user")
             
-            # Get building details for each role
-            for role_item in user_roles:
+            # Get building details for all roles in one batched lookup
+            owned_ids = {b.get('building_id') for b in owned_buildings}
+            role_items = [r for r in user_roles
+                          if r.get('building_id') and r.get('building_id') not in owned_ids]
+            buildings = load_buildings([r['building_id'] for r in role_items], TABLE_BUILDINGS)
+            
+            for role_item in role_items:
                 building_id = role_item.get('building_id')
-                if not building_id:
-                    continue
-                    
-                # Skip if this building is already in owned_buildings
-                if any(b.get('building_id') == building_id for b in owned_buildings):
+                building = buildings.get(building_id)
+                if not building:
+                    print(f"Building {building_id} not found")
                     continue
                     
-                try:
-                    # Get building details
-                    building_response = table_buildings.get_item(
-                        Key={'building_id': building_id}
-                    )
+                # Prepare building data with role info
+                building_data = {
+                    'building_id': building.get('building_id'),
+                    'building_name': building.get('building_name'),
+                    'name': building.get('building_name'),
+                    'building_code': building.get('building_code', ''),
+                    'address': building.get('address', ''),
+                    'user_id': building.get('user_id'),  # Building owner
+                    'wings': building.get('wings', []),
+                    'wing_details': building.get('wing_details', {}),
+                    'total_wings': building.get('total_wings', 0),
+                    'total_floors': building.get('total_floors', 0),
+                    'total_units': building.get('total_units', building.get('total_units_of_building', 0)),
+                    'created_at': building.get('created_at'),
+                    'updated_at': building.get('updated_at'),
+                    'status': building.get('status', 'active'),
                     
-                    if 'Item' in building_response:
-                        building = building_response['Item']
-                        
-                        # Prepare building data with role info
-                        building_data = {
-                            'building_id': building.get('building_id'),
-                            'building_name': building.get('building_name'),
-                            'name': building.get('building_name'),
-                            'building_code': building.get('building_code', ''),
-                            'address': building.get('address', ''),
-                            'user_id': building.get('user_id'),  # Building owner
-                            'wings': building.get('wings', []),
-                            'wing_details': building.get('wing_details', {}),
-                            'total_wings': building.get('total_wings', 0),
-                            'total_floors': building.get('total_floors', 0),
-                            'total_units': building.get('total_units', building.get('total_units_of_building', 0)),
-                            'created_at': building.get('created_at'),
-                            'updated_at': building.get('updated_at'),
-                            'status': building.get('status', 'active'),
-                            
-                            # Role info
-                            'role': role_item.get('role', 'resident'),
-                            'role_status': role_item.get('status', 'active'),
-                            'approved_at': role_item.get('approved_at', role_item.get('created_at')),
-                            'approved_by': role_item.get('approved_by'),
-                            'wing': role_item.get('wing'),
-                            'floor': role_item.get('floor'),
-                            'unit_number': role_item.get('unit_number'),
-                            'is_owner': False,
-                            'is_connected': True
-                        }
-                        
-                        connected_buildings.append(building_data)
-                        
-                except Exception as e:
-                    print(f"Error getting building {building_id}: {str(e)}")
-                    continue
+                    # Role info
+                    'role': role_item.get('role', 'resident'),
+                    'role_status': role_item.get('status', 'active'),
+                    'approved_at': role_item.get('approved_at', role_item.get('created_at')),
+                    'approved_by': role_item.get('approved_by'),
+                    'wing': role_item.get('wing'),
+                    'floor': role_item.get('floor'),
+                    'unit_number': role_item.get('unit_number'),
+                    'is_owner': False,
+                    'is_connected': True
+                }
+                
+                connected_buildings.append(building_data)
                     
         except Exception as e:
             print(f"Error querying user roles: {str(e)}")
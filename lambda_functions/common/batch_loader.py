@@ -0,0 +1,135 @@
+import boto3
+import os
+import time
+
+dynamodb = boto3.resource('dynamodb')
+
+TABLE_BUILDINGS = os.environ.get('TABLE_BUILDINGS', 'Buildings-dev')
+
+# DynamoDB accepts at most 100 keys per BatchGetItem call
+BATCH_GET_LIMIT = 100
+MAX_UNPROCESSED_RETRIES = 5
+
+
+class UnprocessedKeysError(Exception):
+    """Keys DynamoDB still had not returned after every retry (throttling)"""
+
+    def __init__(self, unprocessed_keys):
+        pending = sum(len(r['Keys']) for r in unprocessed_keys.values())
+        super().__init__(f"{pending} keys still unprocessed after {MAX_UNPROCESSED_RETRIES} retries")
+        self.unprocessed_keys = unprocessed_keys
+
+
+def chunked(items, size):
+    """Yield successive slices of at most `size` items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def batch_get(request_items):
+    """
+    Run one batch_get_item request (which may span several tables),
+    retrying UnprocessedKeys with exponential backoff.
+    Returns {table_name: [items]}. Raises UnprocessedKeysError if keys are
+    still unprocessed after the retries, so a throttled read is never
+    mistaken for a missing item.
+    """
+    responses = {}
+    attempt = 0
+    while request_items:
+        response = dynamodb.batch_get_item(RequestItems=request_items)
+        for table_name, items in response.get('Responses', {}).items():
+            responses.setdefault(table_name, []).extend(items)
+
+        request_items = response.get('UnprocessedKeys') or {}
+        if not request_items:
+            break
+
+        attempt += 1
+        if attempt > MAX_UNPROCESSED_RETRIES:
+            raise UnprocessedKeysError(request_items)
+        time.sleep(min(0.05 * (2 ** attempt), 1.0))
+
+    return responses
+
+
+def batch_get_items(table_name, key_name, ids, projection=None):
+    """
+    Fetch items by a single-attribute primary key with chunked batch_get_item.
+    Duplicate and empty ids are dropped. Returns a dict keyed by id; missing
+    ids are absent.
+    """
+    unique_ids = list(dict.fromkeys(i for i in ids if i))
+    found = {}
+
+    for chunk in chunked(unique_ids, BATCH_GET_LIMIT):
+        request = {'Keys': [{key_name: item_id} for item_id in chunk]}
+        if projection:
+            request['ProjectionExpression'] = ', '.join(f"#p{i}" for i in range(len(projection)))
+            request['ExpressionAttributeNames'] = {f"#p{i}": name for i, name in enumerate(projection)}
+
+        for item in batch_get({table_name: request}).get(table_name, []):
+            found[item[key_name]] = item
+
+    return found
+
+
+def load_buildings(building_ids, table_name=None):
+    """Return {building_id: building_item} for every building that exists"""
+    return batch_get_items(table_name or TABLE_BUILDINGS, 'building_id', building_ids)
+
+
+def query_all(table, **query_kwargs):
+    """Run a query and follow LastEvaluatedKey until every page is read"""
+    items = []
+    response = table.query(**query_kwargs)
+    items.extend(response.get('Items', []))
+
+    while 'LastEvaluatedKey' in response:
+        response = table.query(ExclusiveStartKey=response['LastEvaluatedKey'], **query_kwargs)
+        items.extend(response.get('Items', []))
+
+    return items
+
+
+def scan_all(table, **scan_kwargs):
+    """Run a scan and follow LastEvaluatedKey until every page is read"""
+    items = []
+    response = table.scan(**scan_kwargs)
+    items.extend(response.get('Items', []))
+
+    while 'LastEvaluatedKey' in response:
+        response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_kwargs)
+        items.extend(response.get('Items', []))
+
+    return items
+
+
+# DynamoDB accepts at most 25 put/delete requests per BatchWriteItem call
+BATCH_WRITE_LIMIT = 25
+
+
+def batch_put_items(table_name, items):
+    """
+    Write items with chunked batch_write_item, retrying UnprocessedItems with
+    exponential backoff. Returns the items that could not be written.
+    """
+    failed = []
+
+    for chunk in chunked(list(items), BATCH_WRITE_LIMIT):
+        request_items = {table_name: [{'PutRequest': {'Item': item}} for item in chunk]}
+        attempt = 0
+        while request_items:
+            response = dynamodb.batch_write_item(RequestItems=request_items)
+            request_items = response.get('UnprocessedItems') or {}
+            if not request_items:
+                break
+
+            attempt += 1
+            if attempt > MAX_UNPROCESSED_RETRIES:
+                failed.extend(r['PutRequest']['Item'] for r in request_items.get(table_name, []))
+                print(f"Giving up on {len(request_items.get(table_name, []))} unprocessed writes to {table_name}")
+                break
+            time.sleep(min(0.05 * (2 ** attempt), 1.0))
+
+    return failed
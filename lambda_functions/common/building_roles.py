@@ -0,0 +1,80 @@
+import boto3
+import os
+from common.ttl_cache import TTLCache
+
+dynamodb = boto3.resource('dynamodb')
+
+TABLE_USER_BUILDING_ROLES = os.environ.get('TABLE_USER_BUILDING_ROLES', 'UserBuildingRoles-dev')
+
+# Role items are cached for the lifetime of a warm container, bounded in
+# both size and age. invalidate_user_role only clears the container that
+# made the write, so in every other function a revoked or changed role can
+# still be honoured for up to ROLE_CACHE_TTL_SECONDS. Misses are never
+# cached, so a role granted elsewhere is seen on the next request.
+ROLE_CACHE_TTL_SECONDS = float(os.environ.get('ROLE_CACHE_TTL_SECONDS', '60'))
+ROLE_CACHE_MAX_ENTRIES = int(os.environ.get('ROLE_CACHE_MAX_ENTRIES', '1024'))
+
+_role_cache = TTLCache(ROLE_CACHE_TTL_SECONDS, ROLE_CACHE_MAX_ENTRIES)
+
+
+def composite_key(user_id, building_id):
+    """Build the UserBuildingRoles partition key"""
+    return f"{user_id}#{building_id}"
+
+
+def get_role_item(user_id, building_id):
+    """
+    Return the UserBuildingRoles item for user/building, or None.
+    Found items are cached per container; misses and lookup errors are not.
+    """
+    if not user_id or not building_id:
+        return None
+
+    key = composite_key(user_id, building_id)
+    item = _role_cache.get(key, None)
+    if item is not None:
+        return item
+
+    try:
+        table = dynamodb.Table(TABLE_USER_BUILDING_ROLES)
+        response = table.get_item(Key={'user_building_composite': key})
+    except Exception as e:
+        print(f"Error checking user role: {str(e)}")
+        return None
+
+    item = response.get('Item')
+    if item is not None:
+        _role_cache.set(key, item)
+    return item
+
+
+def get_user_role(user_id, building_id):
+    """Return the user's role name for the building, or None"""
+    item = get_role_item(user_id, building_id)
+    return item.get('role') if item else None
+
+
+def check_user_is_admin(user_id, building_id):
+    """Check if user is admin for the given building"""
+    return get_user_role(user_id, building_id) == 'admin'
+
+
+def check_user_is_member(user_id, building_id):
+    """Check if user is member for the given building"""
+    return get_user_role(user_id, building_id) == 'member'
+
+
+def check_user_has_any_role(user_id, building_id):
+    """Check if user has any role (admin/member) in the building"""
+    return get_role_item(user_id, building_id) is not None
+
+
+def invalidate_user_role(user_id, building_id=None):
+    """
+    Drop cached role entries after a role write. With no building_id every
+    cached building for the user is dropped.
+    """
+    if building_id is not None:
+        _role_cache.pop(composite_key(user_id, building_id))
+    else:
+        _role_cache.pop_prefix(f"{user_id}#")
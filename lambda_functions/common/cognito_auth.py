@@ -0,0 +1,169 @@
+import json
+import boto3
+import os
+import time
+from common.building_roles import get_user_role, invalidate_user_role
+from common.common_utils import get_user_from_token
+from common.ttl_cache import TTLCache
+
+dynamodb = boto3.resource('dynamodb')
+
+TABLE_USERS = os.environ.get('TABLE_USERS', 'Users-dev')
+
+# Only the endpoints that take the caller from the bearer token use these
+# helpers: POST /register/bulk and POST /connection_requests/bulk. The other
+# handlers still take user_id from the request and check it through
+# common.building_roles; moving one over means its clients must send the
+# Authorization header. For these two, the role comes from the token claim
+# with no UserBuildingRoles read; what remains per request is the
+# roles_updated_at stamp, cached per container for
+# ROLE_STAMP_CACHE_TTL_SECONDS, which is what lets a role change revoke
+# older tokens. Every role change or revocation calls mark_roles_changed
+# (register, change_user_role, request processing) or writes the same stamp
+# (bulk_register); a fresh grant (add_building) is only missing from the
+# claim, which denies rather than allows until the client refreshes.
+
+# Claim added by auth.pre_token_generation: {"<building_id>": "a" | "m"}
+ROLE_CLAIM = 'building_roles'
+ROLE_CODES = {'admin': 'a', 'member': 'm'}
+ROLE_NAMES = {code: role for role, code in ROLE_CODES.items()}
+
+# Users.roles_updated_at per user, cached per container. A token issued
+# before the user's last role change must be refreshed before its role
+# claims are trusted again.
+ROLE_STAMP_CACHE_TTL_SECONDS = float(os.environ.get('ROLE_STAMP_CACHE_TTL_SECONDS', '60'))
+_role_stamps = TTLCache(ROLE_STAMP_CACHE_TTL_SECONDS, 1024)
+
+
+def encode_role_claim(role_items):
+    """Compact JSON role map for the token from UserBuildingRoles items"""
+    roles = {
+        item['building_id']: ROLE_CODES.get(item.get('role'), item.get('role'))
+        for item in role_items if item.get('building_id')
+    }
+    return json.dumps(roles, separators=(',', ':'), sort_keys=True)
+
+
+def decode_role_claim(claims):
+    """Return {building_id: role} from verified claims, or None if the token has no role claim"""
+    raw = claims.get(ROLE_CLAIM)
+    if raw is None:
+        return None
+    try:
+        roles = json.loads(raw) if isinstance(raw, str) else raw
+    except ValueError:
+        return None
+    if not isinstance(roles, dict):
+        return None
+    return {building_id: ROLE_NAMES.get(code, code) for building_id, code in roles.items()}
+
+
+def get_roles_updated_at(user_id):
+    """
+    Epoch seconds of the user's last role change (0 if never), or None if
+    it could not be read. None must be treated as "claims not trusted".
+    """
+    stamp = _role_stamps.get(user_id, None)
+    if stamp is not None:
+        return stamp
+
+    try:
+        response = dynamodb.Table(TABLE_USERS).get_item(
+            Key={'user_id': user_id},
+            ProjectionExpression='roles_updated_at'
+        )
+        stamp = int(response.get('Item', {}).get('roles_updated_at', 0))
+    except Exception as e:
+        print(f"Error reading roles_updated_at: {str(e)}")
+        return None
+
+    _role_stamps.set(user_id, stamp)
+    return stamp
+
+
+def forget_cached_roles(user_id, building_id=None):
+    """Drop this container's cached role item and roles_updated_at for the user"""
+    invalidate_user_role(user_id, building_id)
+    _role_stamps.pop(user_id)
+
+
+def mark_roles_changed(user_id, building_id=None):
+    """
+    Record a role change so tokens issued before it stop being trusted and
+    the client has to refresh (which re-runs the pre-token trigger).
+    """
+    forget_cached_roles(user_id, building_id)
+    try:
+        dynamodb.Table(TABLE_USERS).update_item(
+            Key={'user_id': user_id},
+            UpdateExpression='SET roles_updated_at = :now',
+            ExpressionAttributeValues={':now': int(time.time())}
+        )
+    except Exception as e:
+        print(f"Error recording role change for {user_id}: {str(e)}")
+
+
+def refresh_required_response():
+    return {
+        'statusCode': 401,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': json.dumps({
+            'message': 'Your roles have changed, please refresh your session',
+            'code': 'TOKEN_REFRESH_REQUIRED'
+        })
+    }
+
+
+def forbidden_response(message):
+    return {
+        'statusCode': 403,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': json.dumps({'message': message})
+    }
+
+
+def get_caller_roles(event):
+    """
+    Verify the caller's token and return (user, {building_id: role}, error_response).
+    Roles come from the token's role claim; tokens without one (issued
+    before the trigger was enabled, or access tokens) get roles=None and
+    callers fall back to UserBuildingRoles. So does a token whose claim
+    cannot be checked against roles_updated_at.
+    """
+    user, error = get_user_from_token(event)
+    if error:
+        return None, None, error
+
+    roles = decode_role_claim(user['claims'])
+    if roles is not None:
+        roles_updated_at = get_roles_updated_at(user['user_id'])
+        if roles_updated_at is None:
+            roles = None
+        elif user['claims'].get('iat', 0) <= roles_updated_at:
+            # Both are whole seconds, so a token minted in the second of the
+            # change is refused too; the client's refresh a moment later
+            # gets a token that postdates it
+            return None, None, refresh_required_response()
+    return user, roles, None
+
+
+def building_role(user, roles, building_id):
+    """Caller's role in the building from get_caller_roles results, or None"""
+    if roles is not None:
+        return roles.get(building_id)
+    return get_user_role(user['user_id'], building_id)
+
+
+def authorize_building(event, building_id, allowed_roles=('admin', 'member')):
+    """
+    Verify the caller and check their role in the building.
+    Returns (user, role, None) or (None, None, error_response).
+    """
+    user, roles, error = get_caller_roles(event)
+    if error:
+        return None, None, error
+
+    role = building_role(user, roles, building_id)
+    if role not in allowed_roles:
+        return None, None, forbidden_response('You do not have access to this building')
+    return user, role, None
@@ -1,6 +1,18 @@
 import json
 import boto3
+import copy
+import hashlib
 import os
+import sys
+import time
+from common.ttl_cache import TTLCache
+
+# The PyJWT package is vendored under lambda_functions/python
+VENDORED_PACKAGES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python')
+if VENDORED_PACKAGES not in sys.path:
+    sys.path.append(VENDORED_PACKAGES)
+
+import jwt  # noqa: E402
 
 # Initialize DynamoDB with correct table names
 dynamodb = boto3.resource('dynamodb')
@@ -16,19 +28,155 @@ UserUnits = dynamodb.Table(get_table_name('UserUnits'))
 Users = dynamodb.Table(get_table_name('Users'))
 SuperAdmins = dynamodb.Table(get_table_name('SuperAdmins'))
 
-# Simplified token validation
+# Cognito token verification
+USER_POOL_ID = os.environ.get('USER_POOL_ID', '')
+COGNITO_CLIENT_ID = os.environ.get('COGNITO_CLIENT_ID', '')
+COGNITO_REGION = os.environ.get('AWS_REGION') or USER_POOL_ID.split('_')[0]
+COGNITO_ISSUER = f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{USER_POOL_ID}"
+COGNITO_JWKS_URL = f"{COGNITO_ISSUER}/.well-known/jwks.json"
+TOKEN_ALGORITHMS = ['RS256']
+TOKEN_LEEWAY_SECONDS = 30
+
+# Snapshot of the pool's JWKS taken at deploy time (project_utils/snapshot_jwks.py).
+# COGNITO_JWKS_JSON overrides the bundled file.
+COGNITO_JWKS_SEED_PATH = os.environ.get(
+    'COGNITO_JWKS_SEED_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cognito_jwks.json')
+)
+
+# Verified claims keyed by token digest. Each entry lives no longer than the
+# token itself, so a warm container skips the RSA verify for repeat calls
+# from the same session without ever accepting an expired token.
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get('TOKEN_CACHE_MAX_ENTRIES', '512'))
+_verified_tokens = TTLCache(3600, TOKEN_CACHE_MAX_ENTRIES)
+
+_jwks_client = None
+
+
+def load_jwks_seed():
+    """Return the pre-seeded JWKS for this user pool, or None"""
+    try:
+        raw = os.environ.get('COGNITO_JWKS_JSON')
+        if raw:
+            seed = json.loads(raw)
+        elif os.path.exists(COGNITO_JWKS_SEED_PATH):
+            with open(COGNITO_JWKS_SEED_PATH) as f:
+                seed = json.load(f)
+        else:
+            return None
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable JWKS seed: {e}")
+        return None
+
+    if not isinstance(seed, dict) or seed.get('issuer', COGNITO_ISSUER) != COGNITO_ISSUER:
+        print("Ignoring JWKS seed for a different user pool")
+        return None
+    return seed
+
+
+def get_jwks_client():
+    """Return the per-container JWKS client for the user pool"""
+    global _jwks_client
+    if _jwks_client is None:
+        seed = load_jwks_seed()
+        try:
+            _jwks_client = jwt.PyJWKClient(COGNITO_JWKS_URL, seed_jwk_set=seed)
+        except jwt.PyJWKClientError as e:
+            print(f"Ignoring unusable JWKS seed: {e}")
+            _jwks_client = jwt.PyJWKClient(COGNITO_JWKS_URL)
+    return _jwks_client
+
+
+def get_bearer_token(event):
+    """Extract the bearer token from the Authorization header, or None"""
+    headers = event.get('headers') or {}
+    for name, value in headers.items():
+        if name.lower() == 'authorization' and value:
+            scheme, _, token = value.strip().partition(' ')
+            if scheme.lower() == 'bearer' and token:
+                return token.strip()
+            return value.strip()
+    return None
+
+
+def token_digest(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def verify_cognito_token(token):
+    """
+    Verify a Cognito ID or access token against the user pool JWKS and
+    return a fresh deep copy of its claims, so callers cannot alter the
+    cached entry, nested claims included. Raises jwt.InvalidTokenError on any failure.
+    """
+    digest = token_digest(token)
+    claims = _verified_tokens.get(digest, None)
+    if claims is not None:
+        return copy.deepcopy(claims)
+
+    # Parsed once and reused for the kid lookup and the verified decode
+    parsed = jwt.parse(token)
+    signing_key = get_jwks_client().get_signing_key_from_jwt(parsed)
+    decoded = jwt.decode_complete(
+        parsed,
+        key=signing_key.key,
+        algorithms=TOKEN_ALGORITHMS,
+        issuer=COGNITO_ISSUER,
+        leeway=TOKEN_LEEWAY_SECONDS,
+        options={'require': ['exp', 'iat', 'token_use'], 'verify_aud': False}
+    )
+    claims = decoded['payload']
+
+    # ID tokens carry the app client in aud, access tokens in client_id
+    token_use = claims.get('token_use')
+    if token_use == 'id':
+        audience = claims.get('aud')
+    elif token_use == 'access':
+        audience = claims.get('client_id')
+    else:
+        raise jwt.InvalidTokenError(f"Unsupported token_use: {token_use}")
+    if COGNITO_CLIENT_ID and audience != COGNITO_CLIENT_ID:
+        raise jwt.InvalidAudienceError('Token was not issued for this app client')
+
+    remaining = claims['exp'] - time.time()
+    if remaining > 0:
+        _verified_tokens.set(digest, copy.deepcopy(claims), ttl_seconds=remaining)
+    return claims
+
+
+def decode_trusted_token(token):
+    """
+    Read the claims of a token this function just received from Cognito
+    over TLS (e.g. the IdToken in an auth result). The signature is not
+    checked, so never use this for tokens supplied by a caller.
+    """
+    return jwt.decode(token, options={'verify_signature': False})
+
+
+def user_from_claims(claims):
+    """Map verified Cognito claims to the user dict handlers expect"""
+    username = claims.get('cognito:username') or claims.get('username', '')
+    phone = claims.get('phone_number') or username
+    mobile = phone[3:] if phone.startswith('+91') else phone
+    return {
+        'username': username,
+        'user_id': f"user_{mobile}",
+        'sub': claims.get('sub'),
+        'role': claims.get('custom:role'),
+        'claims': claims
+    }
+
+
 def get_user_from_token(event):
     """
-    Simple token validation - for now, accept any request
-    In production, implement proper JWT validation
+    Verify the caller's Cognito bearer token.
+    Returns (user, None) on success or (None, 401 response) on failure.
     """
     try:
-        # For testing, accept all requests
-        return {
-            'username': 'test-user',
-            'user_id': 'test-001',
-            'role': 'admin'
-        }, None
+        token = get_bearer_token(event)
+        if not token:
+            raise jwt.InvalidTokenError('Missing bearer token')
+        return user_from_claims(verify_cognito_token(token)), None
     except Exception as e:
         print(f"Token validation error: {e}")
         return None, {
@@ -0,0 +1,46 @@
+import hashlib
+import os
+import time
+
+# Sparse index over pending requests only: building_id + pending_requested_at.
+# The sort attribute is written when a request is submitted and removed when
+# it is approved or rejected, so each building's partition holds just its
+# inbox. The index stores it oldest first; the inbox reads it backwards
+# (ScanIndexForward=False) to list the newest request first.
+BUILDING_PENDING_INDEX = 'BuildingPendingIndex'
+PENDING_SORT_ATTR = 'pending_requested_at'
+
+# DynamoDB TTL attribute (epoch seconds). Approved requests carry no expiry
+# and leave the table through project_utils/archive_connection_requests.py.
+# Rejected requests expire after REJECTED_REQUEST_TTL_DAYS, longer than the
+# monthly archive cycle, so the archive copies them out first. A rejected
+# request replaced by a resubmission is moved to ConnectionRequestHistory
+# with its expiry, and the archive drains that table as well. Pending
+# requests nobody acted on are never archived; TTL deletes them.
+EXPIRES_AT_ATTR = 'expires_at'
+PENDING_REQUEST_TTL_DAYS = int(os.environ.get('PENDING_REQUEST_TTL_DAYS', '90'))
+REJECTED_REQUEST_TTL_DAYS = int(os.environ.get('REJECTED_REQUEST_TTL_DAYS', '45'))
+
+
+def pending_index_key(item):
+    """ExclusiveStartKey for BuildingPendingIndex positioned at `item`"""
+    return {
+        'request_id': item['request_id'],
+        'building_id': item['building_id'],
+        PENDING_SORT_ATTR: item[PENDING_SORT_ATTR]
+    }
+
+
+def connection_request_id(user_id, building_id, wing, floor, unit_number):
+    """
+    Deterministic request_id for a user asking for one unit, so a repeat
+    submission lands on the same item and a conditional put can refuse it.
+    """
+    parts = [str(part).strip() for part in (user_id, building_id, wing, floor, unit_number)]
+    digest = hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+    return f"REQ-{digest[:16].upper()}"
+
+
+def expires_at(days):
+    """TTL value `days` from now"""
+    return int(time.time()) + days * 86400
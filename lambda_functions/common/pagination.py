@@ -0,0 +1,72 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+from decimal import Decimal
+
+PAGINATION_TOKEN_SECRET = os.environ.get('PAGINATION_TOKEN_SECRET', '')
+
+if not PAGINATION_TOKEN_SECRET:
+    print("ERROR: PAGINATION_TOKEN_SECRET not configured, next_token cursors are disabled")
+
+
+class InvalidPageToken(ValueError):
+    pass
+
+
+class PaginationNotConfigured(RuntimeError):
+    """No signing secret: tokens signed with an empty key could be forged"""
+    pass
+
+
+def _encode_number(obj):
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    raise TypeError(f"Cannot encode {type(obj).__name__} in page token")
+
+
+def _sign(payload):
+    if not PAGINATION_TOKEN_SECRET:
+        raise PaginationNotConfigured('PAGINATION_TOKEN_SECRET is not configured')
+    return hmac.new(PAGINATION_TOKEN_SECRET.encode(), payload, hashlib.sha256).digest()[:16]
+
+
+def encode_next_token(last_evaluated_key):
+    """Wrap a LastEvaluatedKey into an opaque, signed next_token (or None)"""
+    if not last_evaluated_key:
+        return None
+    payload = json.dumps(last_evaluated_key, separators=(',', ':'), sort_keys=True,
+                         default=_encode_number).encode()
+    token = base64.urlsafe_b64encode(_sign(payload) + payload).decode()
+    return token.rstrip('=')
+
+
+def decode_next_token(token):
+    """Return the ExclusiveStartKey inside a next_token; raises InvalidPageToken"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+    except Exception:
+        raise InvalidPageToken('Malformed next_token')
+
+    signature, payload = raw[:16], raw[16:]
+    if not payload or not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidPageToken('Invalid next_token')
+
+    try:
+        key = json.loads(payload, parse_float=Decimal, parse_int=Decimal)
+    except ValueError:
+        raise InvalidPageToken('Malformed next_token')
+    if not isinstance(key, dict):
+        raise InvalidPageToken('Malformed next_token')
+    return key
+
+
+def parse_limit(value, default=50, maximum=200):
+    """Clamp a `limit` query parameter; raises ValueError on non-integers"""
+    if value in (None, ''):
+        return default
+    limit = int(value)
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+    return min(limit, maximum)
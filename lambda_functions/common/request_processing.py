@@ -0,0 +1,160 @@
+import boto3
+import os
+import random
+import time
+from botocore.exceptions import ClientError
+from common.building_roles import composite_key
+from common.cognito_auth import mark_roles_changed
+from common.connection_requests import (
+    EXPIRES_AT_ATTR, PENDING_SORT_ATTR, REJECTED_REQUEST_TTL_DAYS, expires_at
+)
+from common.user_units import unit_location_key
+
+dynamodb = boto3.resource('dynamodb')
+
+TABLE_CONNECTION_REQUESTS = os.environ.get('TABLE_CONNECTION_REQUESTS', 'ConnectionRequests-dev')
+TABLE_USERUNITS = os.environ.get('TABLE_USERUNITS', 'UserUnits-dev')
+MEMBERS_TABLE = os.environ.get('MEMBERS_TABLE', '')
+TABLE_USER_BUILDING_ROLES = os.environ.get('TABLE_USER_BUILDING_ROLES', 'UserBuildingRoles-dev')
+
+# A transaction touching an item another transaction is writing is
+# cancelled with TransactionConflict; it is safe to run again.
+MAX_TRANSACTION_ATTEMPTS = 4
+
+
+class RequestAlreadyProcessed(Exception):
+    pass
+
+
+def mark_processed_update(request_id, status, admin_id, now):
+    """Transaction item closing a request, guarded so it is processed only once"""
+    values = {
+        ':status': status,
+        ':pending': 'pending',
+        ':admin_id': admin_id,
+        ':now': now
+    }
+    update = f'SET #status = :status, {status}_at = :now, {status}_by = :admin_id, updated_at = :now'
+    if status == 'rejected':
+        # Rejections expire; approvals keep the row until it is archived
+        update += f', {EXPIRES_AT_ATTR} = :expires_at REMOVE {PENDING_SORT_ATTR}'
+        values[':expires_at'] = expires_at(REJECTED_REQUEST_TTL_DAYS)
+    else:
+        update += f' REMOVE {PENDING_SORT_ATTR}, {EXPIRES_AT_ATTR}'
+
+    return {
+        'Update': {
+            'TableName': TABLE_CONNECTION_REQUESTS,
+            'Key': {'request_id': request_id},
+            'UpdateExpression': update,
+            'ConditionExpression': '#status = :pending',
+            'ExpressionAttributeNames': {'#status': 'status'},
+            'ExpressionAttributeValues': values
+        }
+    }
+
+
+def approval_transact_items(request, admin_id, now):
+    """Transaction items that approve `request`: close it, add the member, unit and role"""
+    request_id = request['request_id']
+    building_id = request['building_id']
+    unit_id = f"UNIT-{request_id}"
+
+    items = [
+        mark_processed_update(request_id, 'approved', admin_id, now),
+        {
+            'Put': {
+                'TableName': TABLE_USERUNITS,
+                'Item': {
+                    'unit_id': unit_id,
+                    'user_id': request['user_id'],
+                    'building_id': building_id,
+                    'unit_number': request['unit_number'],
+                    'floor': int(request['floor']),
+                    'wings': request['wing'],
+                    'unit_location': unit_location_key(
+                        building_id, request['wing'], request['floor'], request['unit_number']
+                    ),
+                    'assigned_at': now,
+                    'status': 'active'
+                }
+            }
+        },
+        {
+            'Put': {
+                'TableName': TABLE_USER_BUILDING_ROLES,
+                'Item': {
+                    'user_building_composite': composite_key(request['user_id'], building_id),
+                    'user_id': request['user_id'],
+                    'building_id': building_id,
+                    'role': 'member',
+                    'created_at': now,
+                    'updated_at': now
+                }
+            }
+        }
+    ]
+    if MEMBERS_TABLE:
+        items.append({
+            'Put': {
+                'TableName': MEMBERS_TABLE,
+                'Item': {
+                    'user_id': request['user_id'],
+                    'building_id': building_id,
+                    'name': request['user_name'],
+                    'mobile_no': request['user_mobile'],
+                    'wings': request['wing'],
+                    'floor': request['floor'],
+                    'unit_number': request['unit_number'],
+                    'member_type': 'resident',
+                    'approved_by': admin_id,
+                    'approved_at': now,
+                    'created_at': now,
+                    'updated_at': now
+                }
+            }
+        })
+    return items
+
+
+def is_transaction_conflict(error):
+    reasons = error.response.get('CancellationReasons', [])
+    return any(reason.get('Code') == 'TransactionConflict' for reason in reasons)
+
+
+def process_request(request, action, admin_id, now):
+    """
+    Approve or reject a pending request in one transaction. Returns the
+    new status. Raises RequestAlreadyProcessed if it was processed
+    concurrently. An approval cancelled by a conflicting transaction is
+    retried with backoff.
+    """
+    for attempt in range(MAX_TRANSACTION_ATTEMPTS):
+        try:
+            if action == 'approve':
+                dynamodb.meta.client.transact_write_items(
+                    TransactItems=approval_transact_items(request, admin_id, now)
+                )
+            else:
+                dynamodb.meta.client.update_item(**mark_processed_update(
+                    request['request_id'], 'rejected', admin_id, now
+                )['Update'])
+            break
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code == 'ConditionalCheckFailedException':
+                raise RequestAlreadyProcessed(request['request_id'])
+            if code == 'TransactionCanceledException':
+                reasons = e.response.get('CancellationReasons', [])
+                # The request update is always the first transaction item
+                if reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+                    raise RequestAlreadyProcessed(request['request_id'])
+                if is_transaction_conflict(e) and attempt < MAX_TRANSACTION_ATTEMPTS - 1:
+                    time.sleep(random.uniform(0, 0.05 * (2 ** attempt)))
+                    continue
+            raise
+
+    if action == 'approve':
+        mark_roles_changed(request['user_id'], request['building_id'])
+        return 'approved'
+    return 'rejected'
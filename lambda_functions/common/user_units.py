@@ -0,0 +1,98 @@
+import os
+from boto3.dynamodb.conditions import Attr, Key
+from common.batch_loader import query_all, scan_all
+
+# GSIs on UserUnits (see template.yaml)
+USER_ID_INDEX = 'UserIdIndex'
+BUILDING_ID_INDEX = 'BuildingIdIndex'
+UNIT_LOCATION_INDEX = 'UnitLocationIndex'
+
+# The indexes are rolled out one per deploy (UserUnitsIndexStage in
+# template.yaml); each is read only from the stage after the one that
+# created it, and until then the lookup falls back to a filtered scan.
+INDEX_STAGE = int(os.environ.get('USER_UNITS_INDEX_STAGE', '1'))
+INDEX_READ_STAGES = {
+    USER_ID_INDEX: 2,
+    BUILDING_ID_INDEX: 3,
+    UNIT_LOCATION_INDEX: 4
+}
+
+
+def index_readable(index_name):
+    return INDEX_STAGE >= INDEX_READ_STAGES[index_name]
+
+
+def unit_location_key(building_id, wing, floor, unit_number):
+    """Composite building#wing#floor#unit key used by UnitLocationIndex"""
+    try:
+        floor = int(floor)
+    except (TypeError, ValueError):
+        pass
+    return f"{building_id}#{wing}#{floor}#{unit_number}"
+
+
+def scan_matching(user_units_table, attr, value, **query_kwargs):
+    """Scan fallback for a key lookup; extra filters are ANDed onto it"""
+    extra_filter = query_kwargs.pop('FilterExpression', None)
+    if extra_filter is None:
+        return scan_all(user_units_table, FilterExpression=Attr(attr).eq(value), **query_kwargs)
+    if not isinstance(extra_filter, str):
+        return scan_all(user_units_table, FilterExpression=Attr(attr).eq(value) & extra_filter, **query_kwargs)
+    
+    values = dict(query_kwargs.pop('ExpressionAttributeValues', {}))
+    names = dict(query_kwargs.pop('ExpressionAttributeNames', {}))
+    values[':scan_key'] = value
+    names['#scan_key'] = attr
+    return scan_all(
+        user_units_table,
+        FilterExpression=f"#scan_key = :scan_key AND ({extra_filter})",
+        ExpressionAttributeValues=values,
+        ExpressionAttributeNames=names,
+        **query_kwargs
+    )
+
+
+def get_units_for_user(user_units_table, user_id, **query_kwargs):
+    """All UserUnits rows assigned to a user"""
+    if not index_readable(USER_ID_INDEX):
+        return scan_matching(user_units_table, 'user_id', user_id, **query_kwargs)
+    return query_all(
+        user_units_table,
+        IndexName=USER_ID_INDEX,
+        KeyConditionExpression=Key('user_id').eq(user_id),
+        **query_kwargs
+    )
+
+
+def get_units_for_building(user_units_table, building_id, **query_kwargs):
+    """All UserUnits rows in a building"""
+    if not index_readable(BUILDING_ID_INDEX):
+        return scan_matching(user_units_table, 'building_id', building_id, **query_kwargs)
+    return query_all(
+        user_units_table,
+        IndexName=BUILDING_ID_INDEX,
+        KeyConditionExpression=Key('building_id').eq(building_id),
+        **query_kwargs
+    )
+
+
+def get_units_at_location(user_units_table, building_id, wing, floor, unit_number):
+    """UserUnits rows already holding a specific building/wing/floor/unit"""
+    if not index_readable(UNIT_LOCATION_INDEX):
+        # Rows written before unit_location existed only match on their parts
+        try:
+            floor = int(floor)
+        except (TypeError, ValueError):
+            pass
+        return scan_all(
+            user_units_table,
+            FilterExpression=(Attr('building_id').eq(building_id) & Attr('wings').eq(wing)
+                              & Attr('floor').eq(floor) & Attr('unit_number').eq(unit_number))
+        )
+    return query_all(
+        user_units_table,
+        IndexName=UNIT_LOCATION_INDEX,
+        KeyConditionExpression=Key('unit_location').eq(
+            unit_location_key(building_id, wing, floor, unit_number)
+        )
+    )
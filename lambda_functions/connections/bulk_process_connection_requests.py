@@ -0,0 +1,131 @@
+import json
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from common.batch_loader import BATCH_GET_LIMIT, batch_get_items
+from common.cognito_auth import building_role, get_caller_roles
+from common.request_processing import RequestAlreadyProcessed, process_request
+
+TABLE_CONNECTION_REQUESTS = os.environ.get('TABLE_CONNECTION_REQUESTS', 'ConnectionRequests-dev')
+
+# Each approval is its own transaction, so they can run side by side; the
+# pool keeps the write burst against the shared tables bounded. Requests
+# from one user in one building write the same role and member items, so
+# they run one after another rather than conflicting.
+BULK_PROCESS_WORKERS = int(os.environ.get('BULK_PROCESS_WORKERS', '8'))
+MAX_REQUESTS_PER_CALL = BATCH_GET_LIMIT
+
+process_executor = ThreadPoolExecutor(max_workers=BULK_PROCESS_WORKERS)
+
+
+def response(status, body):
+    return {
+        'statusCode': status,
+        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+        'body': json.dumps(body)
+    }
+
+
+def safe_process_request(request, action, admin_id, now):
+    """Process one request; returns its outcome row instead of raising"""
+    request_id = request['request_id']
+    try:
+        status = process_request(request, action, admin_id, now)
+        return {'request_id': request_id, 'status': status}
+    except RequestAlreadyProcessed:
+        return {'request_id': request_id, 'status': 'skipped', 'error': 'Request is already processed'}
+    except Exception as e:
+        print(f"Error processing {request_id}: {str(e)}")
+        return {'request_id': request_id, 'status': 'failed', 'error': str(e)}
+
+
+def process_group(requests, action, admin_id, now):
+    """Process requests that share a user and building, one at a time"""
+    return [safe_process_request(request, action, admin_id, now) for request in requests]
+
+
+def lambda_handler(event, context):
+    """
+    POST /connection_requests/bulk
+    Body: {request_ids: [...], action: "approve" | "reject"}
+    Every request is reported individually; one failing does not stop the others.
+    """
+    try:
+        print("=== BULK PROCESS CONNECTION REQUESTS ===")
+
+        if isinstance(event.get('body'), str):
+            body = json.loads(event.get('body') or '{}')
+        else:
+            body = event.get('body') or {}
+
+        action = body.get('action')
+        request_ids = body.get('request_ids')
+
+        if action not in ('approve', 'reject'):
+            return response(400, {'message': 'action must be "approve" or "reject"', 'success': False})
+        if not isinstance(request_ids, list) or not request_ids:
+            return response(400, {'message': 'request_ids must be a non-empty list', 'success': False})
+
+        request_ids = list(dict.fromkeys(str(r) for r in request_ids))
+        if len(request_ids) > MAX_REQUESTS_PER_CALL:
+            return response(400, {'message': f'At most {MAX_REQUESTS_PER_CALL} requests per call',
+                                  'success': False})
+
+        user, roles, error = get_caller_roles(event)
+        if error:
+            return error
+
+        requests = batch_get_items(TABLE_CONNECTION_REQUESTS, 'request_id', request_ids)
+
+        # Admin rights are checked once per building, not once per request
+        is_admin = {}
+        results = {}
+        to_process = []
+        for request_id in request_ids:
+            request = requests.get(request_id)
+            if not request:
+                results[request_id] = {'request_id': request_id, 'status': 'failed', 'error': 'Request not found'}
+                continue
+
+            building_id = request.get('building_id')
+            if building_id not in is_admin:
+                is_admin[building_id] = building_role(user, roles, building_id) == 'admin'
+            if not is_admin[building_id]:
+                results[request_id] = {'request_id': request_id, 'status': 'forbidden',
+                                       'error': 'Only building admin can process connection requests'}
+            elif request.get('status') != 'pending':
+                results[request_id] = {'request_id': request_id, 'status': 'skipped',
+                                       'error': 'Request is already processed'}
+            else:
+                to_process.append(request)
+
+        groups = {}
+        for request in to_process:
+            groups.setdefault((request.get('user_id'), request.get('building_id')), []).append(request)
+
+        now = datetime.utcnow().isoformat()
+        group_outcomes = process_executor.map(
+            lambda group: process_group(group, action, user['user_id'], now), groups.values()
+        )
+        for outcomes in group_outcomes:
+            for outcome in outcomes:
+                results[outcome['request_id']] = outcome
+
+        ordered = [results[request_id] for request_id in request_ids]
+        summary = {}
+        for r in ordered:
+            summary[r['status']] = summary.get(r['status'], 0) + 1
+
+        print(f"Bulk {action} of {len(request_ids)} requests: {summary}")
+        return response(200, {
+            'success': True,
+            'action': action,
+            'summary': summary,
+            'results': ordered
+        })
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        traceback.print_exc()
+        return response(500, {'message': 'Internal server error', 'success': False, 'error': str(e)})
@@ -1,6 +1,13 @@
 import json
 import boto3
+import heapq
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from common.batch_loader import query_all
+from common.connection_requests import BUILDING_PENDING_INDEX, PENDING_SORT_ATTR, pending_index_key
+from common.pagination import InvalidPageToken, decode_next_token, encode_next_token, parse_limit
 
 dynamodb = boto3.resource('dynamodb')
 
@@ -8,14 +15,124 @@ TABLE_CONNECTION_REQUESTS = os.environ['TABLE_CONNECTION_REQUESTS']
 TABLE_BUILDINGS = os.environ['TABLE_BUILDINGS']
 TABLE_USERS = os.environ['TABLE_USERS']
 
+# First page of every building's inbox is read side by side
+INBOX_QUERY_WORKERS = int(os.environ.get('INBOX_QUERY_WORKERS', '8'))
+inbox_executor = ThreadPoolExecutor(max_workers=INBOX_QUERY_WORKERS)
+
+
+class BuildingInbox:
+    """One building's pending requests, newest first, read a page at a time"""
+
+    def __init__(self, table, building_id, start_key, page_size):
+        self.table = table
+        self.building_id = building_id
+        self.next_key = start_key
+        self.page_size = page_size
+        self.items = deque()
+        self.pulled = 0
+
+    def fetch(self):
+        query_kwargs = {
+            'IndexName': BUILDING_PENDING_INDEX,
+            'KeyConditionExpression': 'building_id = :bid',
+            'ExpressionAttributeValues': {':bid': self.building_id},
+            'ScanIndexForward': False,
+            'Limit': self.page_size
+        }
+        if self.next_key:
+            query_kwargs['ExclusiveStartKey'] = self.next_key
+        response = self.table.query(**query_kwargs)
+        self.items.extend(response.get('Items', []))
+        self.next_key = response.get('LastEvaluatedKey')
+        return self
+
+    def has_more(self, returned):
+        """True if anything is left after the first `returned` items pulled from this inbox"""
+        return self.pulled > returned or bool(self.items) or self.next_key is not None
+
+    def __iter__(self):
+        while True:
+            while self.items:
+                self.pulled += 1
+                yield self.items.popleft()
+            if not self.next_key:
+                return
+            self.fetch()
+
+
+def get_admin_building_ids(buildings_table, admin_id):
+    items = query_all(
+        buildings_table,
+        IndexName='UserIDIndex',
+        KeyConditionExpression='user_id = :uid',
+        ExpressionAttributeValues={':uid': admin_id},
+        ProjectionExpression='building_id'
+    )
+    return [item['building_id'] for item in items]
+
+
+def decode_positions(next_token, scope):
+    """Return {building_id: ExclusiveStartKey or None} from a next_token"""
+    cursor = decode_next_token(next_token)
+    if cursor.get('scope') != scope or not isinstance(cursor.get('positions'), dict):
+        raise InvalidPageToken('next_token does not match this listing')
+
+    positions = {}
+    for bld_id, position in cursor['positions'].items():
+        if position is None:
+            positions[bld_id] = None
+        else:
+            request_id, sort_value = position
+            positions[bld_id] = pending_index_key({
+                'request_id': request_id, 'building_id': bld_id, PENDING_SORT_ATTR: sort_value
+            })
+    return positions
+
+
+def read_inbox(connection_requests_table, positions, limit):
+    """
+    Merge the buildings' inboxes newest first and take one page.
+    Returns (requests, next_positions); next_positions is empty when every
+    inbox has been read to the end.
+    """
+    inboxes = [
+        BuildingInbox(connection_requests_table, bld_id, start_key, limit)
+        for bld_id, start_key in positions.items()
+    ]
+    list(inbox_executor.map(BuildingInbox.fetch, inboxes))
+
+    merged = heapq.merge(*inboxes, key=lambda item: item[PENDING_SORT_ATTR], reverse=True)
+    page = list(islice(merged, limit))
+
+    last_returned = {}
+    returned = {}
+    for item in page:
+        last_returned[item['building_id']] = item
+        returned[item['building_id']] = returned.get(item['building_id'], 0) + 1
+
+    next_positions = {}
+    for inbox in inboxes:
+        if not inbox.has_more(returned.get(inbox.building_id, 0)):
+            continue
+        last = last_returned.get(inbox.building_id)
+        if last:
+            next_positions[inbox.building_id] = [last['request_id'], last[PENDING_SORT_ATTR]]
+        else:
+            start_key = positions[inbox.building_id]
+            next_positions[inbox.building_id] = (
+                [start_key['request_id'], start_key[PENDING_SORT_ATTR]] if start_key else None
+            )
+    return page, next_positions
+
+
 def lambda_handler(event, context):
     try:
         print("=== GET PENDING CONNECTION REQUESTS ===")
-        
+
         query_params = event.get('queryStringParameters') or {}
         admin_id = query_params.get('admin_id')
         building_id = query_params.get('building_id')
-        
+
         if not admin_id and not building_id:
             return {
                 'statusCode': 400,
@@ -25,57 +142,47 @@ def lambda_handler(event, context):
                     'success': False
                 })
             }
-        
+
         connection_requests_table = dynamodb.Table(TABLE_CONNECTION_REQUESTS)
         buildings_table = dynamodb.Table(TABLE_BUILDINGS)
-        
-        pending_requests = []
-        
-        if building_id:
-            response = connection_requests_table.query(
-                IndexName='BuildingIdStatusIndex',
-                KeyConditionExpression='building_id = :bid AND #status = :status',
-                ExpressionAttributeValues={
-                    ':bid': building_id,
-                    ':status': 'pending'
-                },
-                ExpressionAttributeNames={'#status': 'status'}
-            )
-            pending_requests = response.get('Items', [])
-            
-        elif admin_id:
-            buildings_response = buildings_table.scan(
-                FilterExpression='user_id = :uid',
-                ExpressionAttributeValues={':uid': admin_id}
-            )
-            
-            admin_buildings = buildings_response.get('Items', [])
-            building_ids = [building['building_id'] for building in admin_buildings]
-            
-            for bld_id in building_ids:
-                response = connection_requests_table.query(
-                    IndexName='BuildingIdStatusIndex',
-                    KeyConditionExpression='building_id = :bid AND #status = :status',
-                    ExpressionAttributeValues={
-                        ':bid': bld_id,
-                        ':status': 'pending'
-                    },
-                    ExpressionAttributeNames={'#status': 'status'}
-                )
-                pending_requests.extend(response.get('Items', []))
-        
-        pending_requests.sort(key=lambda x: x.get('requested_at', ''), reverse=True)
-        
+
+        scope = f"building#{building_id}" if building_id else f"admin#{admin_id}"
+        try:
+            limit = parse_limit(query_params.get('limit'))
+            positions = None
+            if query_params.get('next_token'):
+                positions = decode_positions(query_params['next_token'], scope)
+        except (ValueError, InvalidPageToken) as e:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({
+                    'message': str(e),
+                    'success': False
+                })
+            }
+
+        if positions is None:
+            if building_id:
+                building_ids = [building_id]
+            else:
+                building_ids = get_admin_building_ids(buildings_table, admin_id)
+            positions = {bld_id: None for bld_id in building_ids}
+
+        pending_requests, next_positions = read_inbox(connection_requests_table, positions, limit)
+        next_token = encode_next_token({'scope': scope, 'positions': next_positions}) if next_positions else None
+
         return {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
             'body': json.dumps({
                 'success': True,
                 'count': len(pending_requests),
-                'requests': pending_requests
+                'requests': pending_requests,
+                'next_token': next_token
             }, default=str)
         }
-        
+
     except Exception as e:
         print(f"Error: {str(e)}")
         import traceback
@@ -87,4 +194,4 @@ def lambda_handler(event, context):
                 'message': 'Internal server error',
                 'success': False
             })
-        }
\ No newline at end of file
+        }
@@ -1,6 +1,9 @@
 import json
 import boto3
 import os
+from concurrent.futures import ThreadPoolExecutor
+from common.batch_loader import load_buildings, query_all
+from common.user_units import get_units_for_user
 
 dynamodb = boto3.resource('dynamodb')
 
@@ -9,6 +12,99 @@ TABLE_BUILDINGS = os.environ['TABLE_BUILDINGS']
 TABLE_USERUNITS = os.environ['TABLE_USERUNITS']
 MEMBERS_TABLE = os.environ['MEMBERS_TABLE']
 
+# The four source reads are independent and run side by side
+sources_executor = ThreadPoolExecutor(max_workers=4)
+
+
+def load_active_units(user_id):
+    return get_units_for_user(
+        dynamodb.Table(TABLE_USERUNITS),
+        user_id,
+        FilterExpression='#stat = :statval',
+        ExpressionAttributeValues={':statval': 'active'},
+        ExpressionAttributeNames={'#stat': 'status'}
+    )
+
+
+def load_requests(user_id, status):
+    return query_all(
+        dynamodb.Table(TABLE_CONNECTION_REQUESTS),
+        IndexName='UserIdStatusIndex',
+        KeyConditionExpression='user_id = :uid AND #stat = :statval',
+        ExpressionAttributeValues={
+            ':uid': user_id,
+            ':statval': status
+        },
+        ExpressionAttributeNames={'#stat': 'status'}
+    )
+
+
+def load_members(user_id):
+    """MembersTable is keyed by user_id, so a user has at most one row"""
+    if not MEMBERS_TABLE:
+        return []
+    item = dynamodb.Table(MEMBERS_TABLE).get_item(Key={'user_id': user_id}).get('Item')
+    return [item] if item else []
+
+
+def unit_connection(unit, building):
+    return {
+        'building_id': unit['building_id'],
+        'building_name': building.get('building_name'),
+        'building_code': building.get('building_code'),
+        'wing': unit.get('wings'),
+        'floor': unit.get('floor'),
+        'unit_number': unit.get('unit_number'),
+        'connection_type': 'unit_assignment',
+        'connected_at': unit.get('assigned_at'),
+        'status': 'active'
+    }
+
+
+def member_connection(member, building):
+    return {
+        'building_id': member['building_id'],
+        'building_name': building.get('building_name'),
+        'building_code': building.get('building_code'),
+        'wing': member.get('wings'),
+        'floor': member.get('floor'),
+        'unit_number': member.get('unit_number'),
+        'connection_type': 'member',
+        'member_since': member.get('approved_at'),
+        'member_type': member.get('member_type', 'resident'),
+        'status': 'active'
+    }
+
+
+def pending_request(request, building):
+    return {
+        'request_id': request['request_id'],
+        'building_id': request['building_id'],
+        'building_name': building.get('building_name'),
+        'building_code': building.get('building_code'),
+        'wing': request['wing'],
+        'floor': request['floor'],
+        'unit_number': request['unit_number'],
+        'status': 'pending',
+        'requested_at': request['requested_at']
+    }
+
+
+def rejected_request(request, building):
+    return {
+        'request_id': request['request_id'],
+        'building_id': request['building_id'],
+        'building_name': building.get('building_name'),
+        'building_code': building.get('building_code'),
+        'wing': request['wing'],
+        'floor': request['floor'],
+        'unit_number': request['unit_number'],
+        'status': 'rejected',
+        'rejected_at': request.get('rejected_at'),
+        'rejected_by': request.get('rejected_by')
+    }
+
+
 def lambda_handler(event, context):
     try:
         query_params = event.get('queryStringParameters') or {}
@@ -24,10 +120,21 @@ def lambda_handler(event, context):
                 })
             }
         
-        connection_requests_table = dynamodb.Table(TABLE_CONNECTION_REQUESTS)
-        buildings_table = dynamodb.Table(TABLE_BUILDINGS)
-        user_units_table = dynamodb.Table(TABLE_USERUNITS)
-        members_table = dynamodb.Table(MEMBERS_TABLE) if MEMBERS_TABLE else None
+        units_future = sources_executor.submit(load_active_units, user_id)
+        pending_future = sources_executor.submit(load_requests, user_id, 'pending')
+        rejected_future = sources_executor.submit(load_requests, user_id, 'rejected')
+        members_future = sources_executor.submit(load_members, user_id)
+        
+        units = units_future.result()
+        pending_items = pending_future.result()
+        rejected_items = rejected_future.result()
+        members = members_future.result()
+        
+        # Resolve every referenced building in one batched step
+        buildings = load_buildings(
+            [item['building_id'] for item in units + pending_items + rejected_items + members],
+            TABLE_BUILDINGS
+        )
         
         result = {
             'connected_buildings': [],
@@ -35,128 +142,26 @@ def lambda_handler(event, context):
             'rejected_requests': []
         }
         
-        user_units_response = user_units_table.scan(
-            FilterExpression='user_id = :uid AND #stat = :statval',
-            ExpressionAttributeValues={
-                ':uid': user_id,
-                ':statval': 'active'
-            },
-            ExpressionAttributeNames={'#stat': 'status'}
-        )
-        
-        for unit in user_units_response.get('Items', []):
-            building_response = buildings_table.get_item(
-                Key={'building_id': unit['building_id']}
-            )
-            
-            if 'Item' in building_response:
-                building = building_response['Item']
-                result['connected_buildings'].append({
-                    'building_id': unit['building_id'],
-                    'building_name': building.get('building_name'),
-                    'building_code': building.get('building_code'),
-                    'wing': unit.get('wings'),
-                    'floor': unit.get('floor'),
-                    'unit_number': unit.get('unit_number'),
-                    'connection_type': 'unit_assignment',
-                    'connected_at': unit.get('assigned_at'),
-                    'status': 'active'
-                })
-        
-        pending_response = connection_requests_table.query(
-            IndexName='UserIdStatusIndex',
-            KeyConditionExpression='user_id = :uid AND #stat = :statval',
-            ExpressionAttributeValues={
-                ':uid': user_id,
-                ':statval': 'pending'
-            },
-            ExpressionAttributeNames={'#stat': 'status'}
-        )
-        
-        for request in pending_response.get('Items', []):
-            building_response = buildings_table.get_item(
-                Key={'building_id': request['building_id']}
-            )
-            
-            if 'Item' in building_response:
-                building = building_response['Item']
-                result['pending_requests'].append({
-                    'request_id': request['request_id'],
-                    'building_id': request['building_id'],
-                    'building_name': building.get('building_name'),
-                    'building_code': building.get('building_code'),
-                    'wing': request['wing'],
-                    'floor': request['floor'],
-                    'unit_number': request['unit_number'],
-                    'status': 'pending',
-                    'requested_at': request['requested_at']
-                })
-        
-        rejected_response = connection_requests_table.query(
-            IndexName='UserIdStatusIndex',
-            KeyConditionExpression='user_id = :uid AND #stat = :statval',
-            ExpressionAttributeValues={
-                ':uid': user_id,
-                ':statval': 'rejected'
-            },
-            ExpressionAttributeNames={'#stat': 'status'}
-        )
-        
-        for request in rejected_response.get('Items', []):
-            building_response = buildings_table.get_item(
-                Key={'building_id': request['building_id']}
-            )
-            
-            if 'Item' in building_response:
-                building = building_response['Item']
-                result['rejected_requests'].append({
-                    'request_id': request['request_id'],
-                    'building_id': request['building_id'],
-                    'building_name': building.get('building_name'),
-                    'building_code': building.get('building_code'),
-                    'wing': request['wing'],
-                    'floor': request['floor'],
-                    'unit_number': request['unit_number'],
-                    'status': 'rejected',
-                    'rejected_at': request.get('rejected_at'),
-                    'rejected_by': request.get('rejected_by')
-                })
-        
-        if members_table:
-            member_response = members_table.scan(
-                FilterExpression='user_id = :uid',
-                ExpressionAttributeValues={':uid': user_id}
-            )
-            
-            for member in member_response.get('Items', []):
-                building_response = buildings_table.get_item(
-                    Key={'building_id': member['building_id']}
-                )
-                
-                if 'Item' in building_response:
-                    building = building_response['Item']
-                    result['connected_buildings'].append({
-                        'building_id': member['building_id'],
-                        'building_name': building.get('building_name'),
-                        'building_code': building.get('building_code'),
-                        'wing': member.get('wings'),
-                        'floor': member.get('floor'),
-                        'unit_number': member.get('unit_number'),
-                        'connection_type': 'member',
-                        'member_since': member.get('approved_at'),
-                        'member_type': member.get('member_type', 'resident'),
-                        'status': 'active'
-                    })
-        
+        # Unit assignments win over member rows for the same unit
         seen = set()
-        unique_buildings = []
-        for building in result['connected_buildings']:
-            key = (building['building_id'], building.get('wing'), building.get('floor'), building.get('unit_number'))
+        connections = [(unit, unit_connection) for unit in units]
+        connections += [(member, member_connection) for member in members]
+        for item, build in connections:
+            building = buildings.get(item['building_id'])
+            if not building:
+                continue
+            entry = build(item, building)
+            key = (entry['building_id'], entry.get('wing'), entry.get('floor'), entry.get('unit_number'))
             if key not in seen:
                 seen.add(key)
-                unique_buildings.append(building)
+                result['connected_buildings'].append(entry)
         
-        result['connected_buildings'] = unique_buildings
+        for section, items, build in (('pending_requests', pending_items, pending_request),
+                                      ('rejected_requests', rejected_items, rejected_request)):
+            for request in items:
+                building = buildings.get(request['building_id'])
+                if building:
+                    result[section].append(build(request, building))
         
         return {
             'statusCode': 200,
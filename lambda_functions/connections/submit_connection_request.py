@@ -1,8 +1,11 @@
 import json
 import boto3
-import uuid
 import os
 from datetime import datetime
+from botocore.exceptions import ClientError
+from common.connection_requests import (
+    EXPIRES_AT_ATTR, PENDING_REQUEST_TTL_DAYS, PENDING_SORT_ATTR, connection_request_id, expires_at
+)
 
 dynamodb = boto3.resource('dynamodb')
 
@@ -11,6 +14,78 @@ TABLE_BUILDINGS = os.environ['TABLE_BUILDINGS']
 TABLE_USERUNITS = os.environ['TABLE_USERUNITS']
 MEMBERS_TABLE = os.environ['MEMBERS_TABLE']
 TABLE_USERS = os.environ['TABLE_USERS']
+TABLE_CONNECTION_REQUEST_HISTORY = os.environ.get('TABLE_CONNECTION_REQUEST_HISTORY', 'ConnectionRequestHistory-dev')
+
+class RequestConflict(Exception):
+    def __init__(self, message, request_id):
+        super().__init__(message)
+        self.message = message
+        self.request_id = request_id
+
+def save_request(connection_requests_table, request_item):
+    """
+    Store a new request on the user's per-unit item. A fresh item is a
+    conditional put. A rejected request is copied to the history table
+    and replaced in one transaction, conditioned on the version read, so
+    the archive still gets the rejection. Pending and approved requests
+    are never replaced.
+    """
+    request_id = request_item['request_id']
+    existing = connection_requests_table.get_item(
+        Key={'request_id': request_id}, ConsistentRead=True
+    ).get('Item')
+    
+    if existing is None:
+        try:
+            connection_requests_table.put_item(
+                Item=request_item,
+                ConditionExpression='attribute_not_exists(request_id)'
+            )
+            return
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            raise RequestConflict('Your request for this unit was just submitted', request_id)
+    
+    status = existing.get('status')
+    if status == 'pending':
+        raise RequestConflict('You already have a pending request for this unit', request_id)
+    if status == 'approved':
+        raise RequestConflict('Your request for this unit has already been approved', request_id)
+    
+    try:
+        dynamodb.meta.client.transact_write_items(
+            TransactItems=[
+                {
+                    'Put': {
+                        'TableName': TABLE_CONNECTION_REQUEST_HISTORY,
+                        'Item': {
+                            **existing,
+                            'history_id': f"{request_id}#{existing.get('updated_at', '')}",
+                            'superseded_at': request_item['requested_at']
+                        },
+                        'ConditionExpression': 'attribute_not_exists(history_id)'
+                    }
+                },
+                {
+                    'Put': {
+                        'TableName': TABLE_CONNECTION_REQUESTS,
+                        'Item': request_item,
+                        'ConditionExpression': '#status = :status AND updated_at = :updated_at',
+                        'ExpressionAttributeNames': {'#status': 'status'},
+                        'ExpressionAttributeValues': {
+                            ':status': status,
+                            ':updated_at': existing.get('updated_at')
+                        }
+                    }
+                }
+            ]
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'TransactionCanceledException':
+            raise
+        raise RequestConflict('Your request for this unit was just updated, please try again', request_id)
+
 
 def lambda_handler(event, context):
     try:
@@ -34,8 +109,6 @@ def lambda_handler(event, context):
         
         connection_requests_table = dynamodb.Table(TABLE_CONNECTION_REQUESTS)
         buildings_table = dynamodb.Table(TABLE_BUILDINGS)
-        user_units_table = dynamodb.Table(TABLE_USERUNITS)
-        members_table = dynamodb.Table(MEMBERS_TABLE) if MEMBERS_TABLE else None
         
         building_response = buildings_table.get_item(
             Key={'building_id': body['building_id']}
@@ -63,36 +136,10 @@ def lambda_handler(event, context):
                 })
             }
         
-        # ✅ FIX: Use ExpressionAttributeNames for reserved keyword 'status'
-        existing_request = connection_requests_table.scan(
-            FilterExpression=(
-                'user_id = :uid AND building_id = :bid AND wing = :wing AND '
-                'floor = :floor AND unit_number = :unit AND #status = :status_val'
-            ),
-            ExpressionAttributeValues={
-                ':uid': body['user_id'],
-                ':bid': body['building_id'],
-                ':wing': body['wing'],
-                ':floor': body['floor'],
-                ':unit': body['unit_number'],
-                ':status_val': 'pending'
-            },
-            ExpressionAttributeNames={
-                '#status': 'status'
-            }
+        request_id = connection_request_id(
+            body['user_id'], body['building_id'], body['wing'],
+            body['floor'], body['unit_number']
         )
-        
-        if existing_request.get('Count', 0) > 0:
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                'body': json.dumps({
-                    'message': 'You already have a pending request for this unit',
-                    'success': False
-                })
-            }
-        
-        request_id = f"REQ-{uuid.uuid4().hex[:8].upper()}"
         now = datetime.utcnow().isoformat()
         
         request_item = {
@@ -108,10 +155,25 @@ def lambda_handler(event, context):
             'unit_number': body['unit_number'],
             'status': 'pending',
             'requested_at': now,
+            PENDING_SORT_ATTR: now,
+            EXPIRES_AT_ATTR: expires_at(PENDING_REQUEST_TTL_DAYS),
             'updated_at': now
         }
         
-        connection_requests_table.put_item(Item=request_item)
+        # One item per user and unit, so only one request for it can be
+        # open at a time
+        try:
+            save_request(connection_requests_table, request_item)
+        except RequestConflict as e:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({
+                    'message': e.message,
+                    'success': False,
+                    'request_id': e.request_id
+                })
+            }
         
         print(f"Connection request created: {request_id}")
         
@@ -1,35 +1,11 @@
 import json
 import boto3
 import os
+from common.building_roles import check_user_is_admin
 
 dynamodb = boto3.resource('dynamodb')
 MAINTENANCE_TABLE = os.environ.get('TABLE_MAINTENANCE', 'MaintenanceRecords-dev')
 PAYMENT_TABLE = os.environ.get('TABLE_PAYMENT', 'PaymentRecords-dev')
-USER_BUILDING_ROLES_TABLE = os.environ.get('TABLE_USER_BUILDING_ROLES', 'UserBuildingRoles-dev')  # ADD THIS
-
-def check_user_is_admin(user_id, building_id):
-    """Check if user is admin for the given building"""
-    try:
-        if not USER_BUILDING_ROLES_TABLE:
-            print("WARNING: USER_BUILDING_ROLES_TABLE not configured, skipping admin check")
-            return False
-            
-        table = dynamodb.Table(USER_BUILDING_ROLES_TABLE)
-        composite_key = f"{user_id}#{building_id}"
-        
-        response = table.get_item(Key={'user_building_composite': composite_key})
-        
-        if 'Item' in response:
-            user_role = response['Item'].get('role')
-            print(f"User role for building {building_id}: {user_role}")
-            return user_role == 'admin'
-        
-        print(f"No role found for user {user_id} in building {building_id}")
-        return False
-        
-    except Exception as e:
-        print(f"Error checking user role: {str(e)}")
-        return False
 
 def check_payments_exist(maintenance_id):
     """Check if any payments exist for this maintenance bill"""
@@ -3,34 +3,10 @@ import boto3
 import os
 import traceback
 from datetime import datetime
+from common.building_roles import check_user_has_any_role
 
 dynamodb = boto3.resource('dynamodb')
 MAINTENANCE_TABLE = os.environ.get('TABLE_MAINTENANCE', 'MaintenanceRecords-dev')
-USER_BUILDING_ROLES_TABLE = os.environ.get('TABLE_USER_BUILDING_ROLES', 'UserBuildingRoles-dev')  
-
-def check_user_access(user_id, building_id):
-    """Check if user has access to this building (admin or member)"""
-    try:
-        if not USER_BUILDING_ROLES_TABLE:
-            print("WARNING: USER_BUILDING_ROLES_TABLE not configured, skipping access check")
-            return True
-            
-        table = dynamodb.Table(USER_BUILDING_ROLES_TABLE)
-        composite_key = f"{user_id}#{building_id}"
-        
-        response = table.get_item(Key={'user_building_composite': composite_key})
-        
-        if 'Item' in response:
-            user_role = response['Item'].get('role')
-            print(f"User has role '{user_role}' for building {building_id}")
-            return True  
-        
-        print(f"No access found for user {user_id} in building {building_id}")
-        return False
-        
-    except Exception as e:
-        print(f"Error checking user access: {str(e)}")
-        return False
 
 def get_month_name(month_num):
     """Convert month number to month name"""
@@ -93,7 +69,7 @@ def lambda_handler(event, context):
 
                 building_id = item.get('building_id')
                 
-                if not check_user_access(user_id, building_id):
+                if not check_user_has_any_role(user_id, building_id):
                     return build_response(403, {
                         "success": False,
                         "message": "You don't have access to view this maintenance record",
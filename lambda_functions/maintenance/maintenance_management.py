@@ -5,36 +5,12 @@ import os
 from datetime import datetime
 import traceback
 from boto3.dynamodb.conditions import Key
+from common.building_roles import check_user_is_admin
 
 dynamodb = boto3.resource('dynamodb')
 MAINTENANCE_TABLE = os.environ.get('TABLE_MAINTENANCE', 'MaintenanceRecords-dev')
 USERS_TABLE = os.environ.get('TABLE_USERS', 'Users-dev')
 BUILDINGS_TABLE = os.environ.get('TABLE_BUILDINGS', 'Buildings-dev')
-USER_BUILDING_ROLES_TABLE = os.environ.get('TABLE_USER_BUILDING_ROLES', 'UserBuildingRoles-dev') 
-
-def check_user_is_admin(user_id, building_id):
-    """Check if user is admin for the given building"""
-    try:
-        if not USER_BUILDING_ROLES_TABLE:
-            print("WARNING: USER_BUILDING_ROLES_TABLE not configured, skipping admin check")
-            return False
-            
-        table = dynamodb.Table(USER_BUILDING_ROLES_TABLE)
-        composite_key = f"{user_id}#{building_id}"
-        
-        response = table.get_item(Key={'user_building_composite': composite_key})
-        
-        if 'Item' in response:
-            user_role = response['Item'].get('role')
-            print(f"User role for building {building_id}: {user_role}")
-            return user_role == 'admin'
-        
-        print(f"No role found for user {user_id} in building {building_id}")
-        return False
-        
-    except Exception as e:
-        print(f"Error checking user role: {str(e)}")
-        return False
 
 def extract_month_year(due_date):
     """Extract month and year from due_date string"""
@@ -4,6 +4,16 @@ import uuid
 import os
 from datetime import datetime
 from decimal import Decimal
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+from common.batch_loader import UnprocessedKeysError, batch_get
+
+dynamodb = boto3.resource('dynamodb')
+USERS_TABLE = os.environ.get('USERS_TABLE', 'UsersTable-dev')
+MEMBERS_TABLE = os.environ.get('MEMBERS_TABLE', 'MembersTable-dev')
+MAINTENANCE_TABLE = os.environ.get('TABLE_MAINTENANCE', 'MaintenanceRecords-dev')
+UNIT_MAINTENANCE_TABLE = os.environ.get('TABLE_UNIT_MAINTENANCE', 'UnitMaintenanceRecords-dev')
+PAYMENT_TABLE = os.environ.get('TABLE_PAYMENT', 'PaymentRecords-dev')
 
 class DecimalEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -33,6 +43,13 @@ def lambda_handler(event, context):
                 'body': json.dumps({'message': 'Endpoint not found'})
             }
 
+    except UnprocessedKeysError as e:
+        print(f"Throttled: {str(e)}")
+        return {
+            'statusCode': 503,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'message': 'Service busy, please retry'})
+        }
     except Exception as e:
         print(f"Error: {str(e)}")
         import traceback
@@ -43,82 +60,148 @@ def lambda_handler(event, context):
             'body': json.dumps({'message': 'Internal server error', 'error': str(e)})
         }
 
+def validation_failure(reason, message):
+    return False, {'reason': reason, 'message': message}
+
 def validate_ids(user_id, building_id, maintenance_id, unit_maintenance_id):
-    dynamodb = boto3.resource('dynamodb')
-    
-    users_table_name = os.environ.get('USERS_TABLE', 'UsersTable-dev')
-    members_table_name = os.environ.get('MEMBERS_TABLE', 'MembersTable-dev')
-    maintenance_table_name = os.environ.get('TABLE_MAINTENANCE', 'MaintenanceRecords-dev')
-    unit_maintenance_table_name = os.environ.get('TABLE_UNIT_MAINTENANCE', 'UnitMaintenanceRecords-dev')
-    
-    users_table = dynamodb.Table(users_table_name)
-    members_table = dynamodb.Table(members_table_name)
-    maintenance_table = dynamodb.Table(maintenance_table_name)
-    unit_maintenance_table = dynamodb.Table(unit_maintenance_table_name)
-    
-    try:
-        user_response = users_table.get_item(Key={'user_id': user_id})
-        if 'Item' not in user_response:
-            return False, "User not found"
-    except:
-        return False, "Error validating user"
+    """
+    Fetch the user, their membership and the bill in a single batch_get_item
+    and check they line up. Returns (True, None) or
+    (False, {'reason': ..., 'message': ...}).
+    Whether the bill is already paid is enforced by the payment transaction.
+    """
+    if unit_maintenance_id:
+        bill_table = UNIT_MAINTENANCE_TABLE
+        bill_key = {'unit_maintenance_id': unit_maintenance_id}
+        bill_label, bill_reason = "Unit maintenance", 'UNIT_MAINTENANCE'
+    else:
+        bill_table = MAINTENANCE_TABLE
+        bill_key = {'maintenance_id': maintenance_id}
+        bill_label, bill_reason = "Maintenance", 'MAINTENANCE'
     
     try:
-        response = members_table.query(
-            IndexName='building-index',
-            KeyConditionExpression='building_id = :b AND user_id = :u',
-            ExpressionAttributeValues={
-                ':b': building_id,
-                ':u': user_id
+        responses = batch_get({
+            USERS_TABLE: {
+                'Keys': [{'user_id': user_id}],
+                'ProjectionExpression': 'user_id'
+            },
+            MEMBERS_TABLE: {
+                'Keys': [{'user_id': user_id}],
+                'ProjectionExpression': 'user_id, building_id'
+            },
+            bill_table: {
+                'Keys': [bill_key],
+                'ProjectionExpression': 'building_id'
             }
-        )
-        if response.get('Count', 0) == 0:
-            return False, "User is not a member of this building"
+        })
+    except UnprocessedKeysError:
+        raise
     except Exception as e:
-        print(f"Building validation error: {str(e)}")
-        return False, "Error validating building membership"
+        print(f"Payment validation error: {str(e)}")
+        return validation_failure('VALIDATION_ERROR', "Error validating payment details")
     
-    is_unit_maintenance = bool(unit_maintenance_id)
+    if not responses.get(USERS_TABLE):
+        return validation_failure('USER_NOT_FOUND', "User not found")
     
-    if is_unit_maintenance:
-        try:
-            unit_maintenance_response = unit_maintenance_table.get_item(
-                Key={'unit_maintenance_id': unit_maintenance_id}
-            )
-            if 'Item' not in unit_maintenance_response:
-                return False, "Unit maintenance record not found"
-            
-            maintenance_record = unit_maintenance_response['Item']
-            if maintenance_record.get('building_id') != building_id:
-                return False, "Unit maintenance does not belong to this building"
-                
-            if maintenance_record.get('status') == 'paid':
-                return False, "Unit maintenance is already paid"
-                
-        except Exception as e:
-            print(f"Unit maintenance validation error: {str(e)}")
-            return False, "Error validating unit maintenance"
-    else:
-        try:
-            maintenance_response = maintenance_table.get_item(
-                Key={'maintenance_id': maintenance_id}
-            )
-            
-            if 'Item' not in maintenance_response:
-                return False, "Maintenance record not found"
-            
-            maintenance_record = maintenance_response['Item']
-            if maintenance_record.get('building_id') != building_id:
-                return False, "Maintenance does not belong to this building"
-                
-            if maintenance_record.get('status') == 'paid':
-                return False, "Maintenance is already paid"
-                
-        except Exception as e:
-            print(f"Maintenance validation error: {str(e)}")
-            return False, "Error validating maintenance"
+    members = responses.get(MEMBERS_TABLE, [])
+    if not any(m.get('building_id') == building_id for m in members):
+        return validation_failure('NOT_A_MEMBER', "User is not a member of this building")
+    
+    bills = responses.get(bill_table, [])
+    if not bills:
+        return validation_failure(f'{bill_reason}_NOT_FOUND', f"{bill_label} record not found")
+    
+    if bills[0].get('building_id') != building_id:
+        return validation_failure(
+            f'{bill_reason}_BUILDING_MISMATCH',
+            f"{bill_label} does not belong to this building"
+        )
+    
+    return True, None
+
+class BillNotPayable(Exception):
+    """The bill being paid is missing, belongs elsewhere or is already paid"""
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+        self.message = message
+
+class BillAlreadyPaid(BillNotPayable):
+    pass
+
+deserializer = TypeDeserializer()
+
+def bill_to_pay(payment_record):
+    """
+    Table, key and label of the bill a payment settles: the unit bill when
+    unit_maintenance_id is given, otherwise the maintenance record.
+    """
+    if payment_record.get('unit_maintenance_id'):
+        return (UNIT_MAINTENANCE_TABLE, {'unit_maintenance_id': payment_record['unit_maintenance_id']},
+                'Unit maintenance', 'UNIT_MAINTENANCE')
+    return (MAINTENANCE_TABLE, {'maintenance_id': payment_record['maintenance_id']},
+            'Maintenance', 'MAINTENANCE')
+
+def mark_paid_update(table_name, key, building_id, current_time):
+    """Transaction item flipping a bill to paid, guarded against double payment"""
+    key_name = next(iter(key))
+    return {
+        'Update': {
+            'TableName': table_name,
+            'Key': key,
+            'UpdateExpression': 'SET #status = :paid, updated_at = :updated_at REMOVE unpaid_building_id',
+            'ConditionExpression': (
+                f'attribute_exists({key_name}) AND building_id = :building_id '
+                'AND (attribute_not_exists(#status) OR #status <> :paid)'
+            ),
+            'ExpressionAttributeNames': {'#status': 'status'},
+            'ExpressionAttributeValues': {
+                ':paid': 'paid',
+                ':building_id': building_id,
+                ':updated_at': current_time
+            },
+            'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+        }
+    }
+
+def bill_not_payable(old_item, building_id, label, reason):
+    """Explain a failed mark_paid_update from the bill as it was"""
+    bill = {name: deserializer.deserialize(value) for name, value in (old_item or {}).items()}
+    if not bill:
+        return BillNotPayable(f'{reason}_NOT_FOUND', f"{label} record not found")
+    if bill.get('building_id') != building_id:
+        return BillNotPayable(f'{reason}_BUILDING_MISMATCH', f"{label} does not belong to this building")
+    return BillAlreadyPaid(f'{reason}_ALREADY_PAID', f"{label} is already paid")
+
+def record_payment(payment_record, current_time):
+    """
+    Write the payment and mark its bill paid in a single
+    transact_write_items call. Raises BillAlreadyPaid if the bill was paid
+    concurrently, BillNotPayable if it vanished or moved building since
+    validation.
+    """
+    building_id = payment_record['building_id']
+    table_name, key, label, reason = bill_to_pay(payment_record)
+    transact_items = [
+        {
+            'Put': {
+                'TableName': PAYMENT_TABLE,
+                'Item': payment_record,
+                'ConditionExpression': 'attribute_not_exists(payment_id)'
+            }
+        },
+        mark_paid_update(table_name, key, building_id, current_time)
+    ]
     
-    return True, "All validations passed"
+    try:
+        dynamodb.meta.client.transact_write_items(TransactItems=transact_items)
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'TransactionCanceledException':
+            raise
+        reasons = e.response.get('CancellationReasons', [])
+        if len(reasons) > 1 and reasons[1].get('Code') == 'ConditionalCheckFailed':
+            raise bill_not_payable(reasons[1].get('Item'), building_id, label, reason)
+        raise
 
 def process_payment(event):
     if 'body' not in event or not event['body']:
@@ -173,12 +256,12 @@ def process_cash_payment(body):
     user_id = body['user_id']
     building_id = body['building_id']
     
-    is_valid, message = validate_ids(user_id, building_id, maintenance_id, unit_maintenance_id)
+    is_valid, failure = validate_ids(user_id, building_id, maintenance_id, unit_maintenance_id)
     if not is_valid:
         return {
             'statusCode': 400,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'message': message})
+            'body': json.dumps(failure)
         }
 
     payment_id = f"PAY-{uuid.uuid4().hex[:8].upper()}"
@@ -203,39 +286,20 @@ def process_cash_payment(body):
     if unit_maintenance_id:
         payment_record['unit_maintenance_id'] = unit_maintenance_id
 
-    dynamodb = boto3.resource('dynamodb')
-    payment_table_name = os.environ.get('TABLE_PAYMENT', 'PaymentRecords-dev')
-    maintenance_table_name = os.environ.get('TABLE_MAINTENANCE', 'MaintenanceRecords-dev')
-    unit_maintenance_table_name = os.environ.get('TABLE_UNIT_MAINTENANCE', 'UnitMaintenanceRecords-dev')
-    
-    payment_table = dynamodb.Table(payment_table_name)
-    maintenance_table = dynamodb.Table(maintenance_table_name)
-    unit_maintenance_table = dynamodb.Table(unit_maintenance_table_name)
-    
     try:
-        payment_table.put_item(Item=payment_record)
-        
-        if maintenance_id:
-            maintenance_table.update_item(
-                Key={'maintenance_id': maintenance_id},
-                UpdateExpression='SET #status = :status, updated_at = :updated_at',
-                ExpressionAttributeNames={'#status': 'status'},
-                ExpressionAttributeValues={
-                    ':status': 'paid',
-                    ':updated_at': current_time
-                }
-            )
-        
-        if unit_maintenance_id:
-            unit_maintenance_table.update_item(
-                Key={'unit_maintenance_id': unit_maintenance_id},
-                UpdateExpression='SET #status = :status, updated_at = :updated_at',
-                ExpressionAttributeNames={'#status': 'status'},
-                ExpressionAttributeValues={
-                    ':status': 'paid',
-                    ':updated_at': current_time
-                }
-            )
+        record_payment(payment_record, current_time)
+    except BillAlreadyPaid as e:
+        return {
+            'statusCode': 409,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'reason': e.reason, 'message': e.message})
+        }
+    except BillNotPayable as e:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'reason': e.reason, 'message': e.message})
+        }
     except Exception as e:
         print(f"DynamoDB write error: {str(e)}")
         return {
@@ -295,12 +359,12 @@ def process_online_payment(body):
     user_id = body['user_id']
     building_id = body['building_id']
     
-    is_valid, message = validate_ids(user_id, building_id, maintenance_id, unit_maintenance_id)
+    is_valid, failure = validate_ids(user_id, building_id, maintenance_id, unit_maintenance_id)
     if not is_valid:
         return {
             'statusCode': 400,
             'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'message': message})
+            'body': json.dumps(failure)
         }
 
     card_number = str(body['card_number']).replace(' ', '').replace('-', '')
@@ -342,39 +406,20 @@ def process_online_payment(body):
     if unit_maintenance_id:
         payment_record['unit_maintenance_id'] = unit_maintenance_id
 
-    dynamodb = boto3.resource('dynamodb')
-    payment_table_name = os.environ.get('TABLE_PAYMENT', 'PaymentRecords-dev')
-    maintenance_table_name = os.environ.get('TABLE_MAINTENANCE', 'MaintenanceRecords-dev')
-    unit_maintenance_table_name = os.environ.get('TABLE_UNIT_MAINTENANCE', 'UnitMaintenanceRecords-dev')
-    
-    payment_table = dynamodb.Table(payment_table_name)
-    maintenance_table = dynamodb.Table(maintenance_table_name)
-    unit_maintenance_table = dynamodb.Table(unit_maintenance_table_name)
-    
     try:
-        payment_table.put_item(Item=payment_record)
-        
-        if maintenance_id:
-            maintenance_table.update_item(
-                Key={'maintenance_id': maintenance_id},
-                UpdateExpression='SET #status = :status, updated_at = :updated_at',
-                ExpressionAttributeNames={'#status': 'status'},
-                ExpressionAttributeValues={
-                    ':status': 'paid',
-                    ':updated_at': current_time
-                }
-            )
-        
-        if unit_maintenance_id:
-            unit_maintenance_table.update_item(
-                Key={'unit_maintenance_id': unit_maintenance_id},
-                UpdateExpression='SET #status = :status, updated_at = :updated_at',
-                ExpressionAttributeNames={'#status': 'status'},
-                ExpressionAttributeValues={
-                    ':status': 'paid',
-                    ':updated_at': current_time
-                }
-            )
+        record_payment(payment_record, current_time)
+    except BillAlreadyPaid as e:
+        return {
+            'statusCode': 409,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'reason': e.reason, 'message': e.message})
+        }
+    except BillNotPayable as e:
+        return {
+            'statusCode': 400,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({'reason': e.reason, 'message': e.message})
+        }
     except Exception as e:
         print(f"DynamoDB write error: {str(e)}")
         return {
@@ -423,9 +468,7 @@ def get_payments_by_maintenance(event):
             'body': json.dumps({'message': 'Either maintenance_id or unit_maintenance_id query parameter is required'})
         }
 
-    dynamodb = boto3.resource('dynamodb')
-    payment_table_name = os.environ.get('TABLE_PAYMENT', 'PaymentRecords-dev')
-    table = dynamodb.Table(payment_table_name)
+    table = dynamodb.Table(PAYMENT_TABLE)
 
     try:
         if maintenance_id:
@@ -505,9 +548,7 @@ def get_payment_by_id(event):
             'body': json.dumps({'message': 'payment_id query parameter is required'})
         }
 
-    dynamodb = boto3.resource('dynamodb')
-    payment_table_name = os.environ.get('TABLE_PAYMENT', 'PaymentRecords-dev')
-    table = dynamodb.Table(payment_table_name)
+    table = dynamodb.Table(PAYMENT_TABLE)
 
     try:
         response = table.get_item(Key={'payment_id': payment_id})
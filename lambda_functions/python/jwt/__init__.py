@@ -1,12 +1,14 @@
 from .api_jwk import PyJWK, PyJWKSet
 from .api_jws import (
+    ParsedToken,
     PyJWS,
     get_algorithm_by_name,
     get_unverified_header,
+    parse,
     register_algorithm,
     unregister_algorithm,
 )
-from .api_jwt import PyJWT, decode, decode_complete, encode
+from .api_jwt import PyJWT, decode, decode_complete, decode_many, encode
 from .exceptions import (
     DecodeError,
     ExpiredSignatureError,
@@ -43,6 +45,7 @@ __copyright__ = "Copyright 2015-2022 José Padilla"
 
 
 __all__ = [
+    "ParsedToken",
     "PyJWS",
     "PyJWT",
     "PyJWKClient",
@@ -50,7 +53,9 @@ __all__ = [
     "PyJWKSet",
     "decode",
     "decode_complete",
+    "decode_many",
     "encode",
+    "parse",
     "get_unverified_header",
     "register_algorithm",
     "unregister_algorithm",
@@ -10,6 +10,7 @@ from .algorithms import (
     Algorithm,
     get_default_algorithms,
     has_crypto,
+    prepare_key_cached,
     requires_cryptography,
 )
 from .api_jwk import PyJWK
@@ -26,6 +27,37 @@ if TYPE_CHECKING:
     from .algorithms import AllowedPrivateKeys, AllowedPublicKeys
 
 
+class ParsedToken:
+    """
+    A compact JWS split and base64url-decoded once. Pass it wherever a raw
+    token is accepted (decode, decode_complete, PyJWKClient) to avoid
+    parsing the same token again for kid lookup, signature verification
+    and claim validation.
+
+    Nothing here is verified until the token goes through decode().
+    """
+
+    __slots__ = ("payload", "signing_input", "header", "signature", "claims")
+
+    def __init__(
+        self,
+        payload: bytes,
+        signing_input: bytes,
+        header: dict[str, Any],
+        signature: bytes,
+    ) -> None:
+        self.payload = payload
+        self.signing_input = signing_input
+        self.header = header
+        self.signature = signature
+        # JSON-decoded payload, filled in by PyJWT on first decode
+        self.claims: Any = None
+
+    @property
+    def kid(self) -> Any:
+        return self.header.get("kid")
+
+
 class PyJWS:
     header_typ = "JWT"
 
@@ -181,7 +213,7 @@ class PyJWS:
 
     def decode_complete(
         self,
-        jwt: str | bytes,
+        jwt: str | bytes | ParsedToken,
         key: AllowedPublicKeys | PyJWK | str | bytes = "",
         algorithms: Sequence[str] | None = None,
         options: dict[str, Any] | None = None,
@@ -206,7 +238,11 @@ class PyJWS:
                 'It is required that you pass in a value for the "algorithms" argument when calling decode().'
             )
 
-        payload, signing_input, header, signature = self._load(jwt)
+        parsed = self.parse(jwt)
+        payload = parsed.payload
+        signing_input = parsed.signing_input
+        header = parsed.header
+        signature = parsed.signature
 
         if header.get("b64", True) is False:
             if detached_payload is None:
@@ -227,7 +263,7 @@ class PyJWS:
 
     def decode(
         self,
-        jwt: str | bytes,
+        jwt: str | bytes | ParsedToken,
         key: AllowedPublicKeys | PyJWK | str | bytes = "",
         algorithms: Sequence[str] | None = None,
         options: dict[str, Any] | None = None,
@@ -247,17 +283,27 @@ class PyJWS:
         )
         return decoded["payload"]
 
-    def get_unverified_header(self, jwt: str | bytes) -> dict[str, Any]:
+    def get_unverified_header(self, jwt: str | bytes | ParsedToken) -> dict[str, Any]:
         """Returns back the JWT header parameters as a dict()
 
         Note: The signature is not verified so the header parameters
         should not be fully trusted until signature verification is complete
         """
-        headers = self._load(jwt)[2]
+        headers = self.parse(jwt).header
         self._validate_headers(headers)
 
         return headers
 
+    def parse(self, jwt: str | bytes | ParsedToken) -> ParsedToken:
+        """
+        Splits and base64url-decodes a token without verifying it. Already
+        parsed tokens are returned as-is.
+        """
+        if isinstance(jwt, ParsedToken):
+            return jwt
+
+        return ParsedToken(*self._load(jwt))
+
     def _load(self, jwt: str | bytes) -> tuple[bytes, bytes, dict[str, Any], bytes]:
         if isinstance(jwt, str):
             jwt = jwt.encode("utf-8")
@@ -322,7 +368,8 @@ class PyJWS:
                 alg_obj = self.get_algorithm_by_name(alg)
             except NotImplementedError as e:
                 raise InvalidAlgorithmError("Algorithm not supported") from e
-            prepared_key = alg_obj.prepare_key(key)
+            # PEM material is parsed once and reused across decodes
+            prepared_key = prepare_key_cached(alg_obj, key)
 
         if not alg_obj.verify(signing_input, prepared_key, signature):
             raise InvalidSignatureError("Signature verification failed")
@@ -344,3 +391,4 @@ register_algorithm = _jws_global_obj.register_algorithm
 unregister_algorithm = _jws_global_obj.unregister_algorithm
 get_algorithm_by_name = _jws_global_obj.get_algorithm_by_name
 get_unverified_header = _jws_global_obj.get_unverified_header
+parse = _jws_global_obj.parse
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import json
 import warnings
 from calendar import timegm
@@ -8,6 +9,8 @@ from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Any
 
 from . import api_jws
+from .api_jwk import PyJWKSet
+from .api_jws import ParsedToken
 from .exceptions import (
     DecodeError,
     ExpiredSignatureError,
@@ -18,6 +21,7 @@ from .exceptions import (
     InvalidJTIError,
     InvalidSubjectError,
     MissingRequiredClaimError,
+    PyJWTError,
 )
 from .warnings import RemovedInPyjwt3Warning
 
@@ -104,7 +108,7 @@ class PyJWT:
 
     def decode_complete(
         self,
-        jwt: str | bytes,
+        jwt: str | bytes | ParsedToken,
         key: AllowedPublicKeys | PyJWK | str | bytes = "",
         algorithms: Sequence[str] | None = None,
         options: dict[str, Any] | None = None,
@@ -153,15 +157,25 @@ class PyJWT:
             options.setdefault("verify_sub", False)
             options.setdefault("verify_jti", False)
 
+        parsed = api_jws.parse(jwt)
         decoded = api_jws.decode_complete(
-            jwt,
+            parsed,
             key=key,
             algorithms=algorithms,
             options=options,
             detached_payload=detached_payload,
         )
 
-        payload = self._decode_payload(decoded)
+        # The parsed token keeps its own deep copy of the claims, so a
+        # caller editing the returned payload, nested lists and objects
+        # included, cannot change what the next decode of the same
+        # ParsedToken validates and returns.
+        if parsed.claims is not None and detached_payload is None:
+            payload = copy.deepcopy(parsed.claims)
+        else:
+            payload = self._decode_payload(decoded)
+            if detached_payload is None:
+                parsed.claims = copy.deepcopy(payload)
 
         merged_options = {**self.options, **options}
         self._validate_claims(
@@ -194,7 +208,7 @@ class PyJWT:
 
     def decode(
         self,
-        jwt: str | bytes,
+        jwt: str | bytes | ParsedToken,
         key: AllowedPublicKeys | PyJWK | str | bytes = "",
         algorithms: Sequence[str] | None = None,
         options: dict[str, Any] | None = None,
@@ -233,6 +247,68 @@ class PyJWT:
         )
         return decoded["payload"]
 
+    def decode_many(
+        self,
+        jwts: Iterable[str | bytes | ParsedToken],
+        key: Any = "",
+        algorithms: Sequence[str] | None = None,
+        options: dict[str, Any] | None = None,
+        audience: str | Iterable[str] | None = None,
+        subject: str | None = None,
+        issuer: str | Sequence[str] | None = None,
+        leeway: float | timedelta = 0,
+    ) -> list[dict[str, Any] | PyJWTError]:
+        """
+        Verifies a batch of tokens, returning one result per token in input
+        order: the decode_complete() dict, or the PyJWTError it raised.
+
+        `key` may be a single key, a PyJWKSet, or a PyJWKClient. For the
+        last two each token's key is looked up by the kid in its header.
+        Every token is parsed exactly once.
+        """
+        resolve_key = self._key_resolver(key)
+        results: list[dict[str, Any] | PyJWTError] = []
+
+        for jwt in jwts:
+            try:
+                parsed = api_jws.parse(jwt)
+                results.append(
+                    self.decode_complete(
+                        parsed,
+                        resolve_key(parsed),
+                        algorithms,
+                        options,
+                        audience=audience,
+                        subject=subject,
+                        issuer=issuer,
+                        leeway=leeway,
+                    )
+                )
+            except PyJWTError as e:
+                results.append(e)
+
+        return results
+
+    @staticmethod
+    def _key_resolver(key: Any) -> Any:
+        if isinstance(key, PyJWKSet):
+            keys_by_kid = {k.key_id: k for k in key.keys if k.key_id}
+
+            def from_set(parsed: ParsedToken) -> Any:
+                try:
+                    return keys_by_kid[parsed.kid]
+                except KeyError:
+                    raise DecodeError(
+                        f"keyset has no key for kid: {parsed.kid}"
+                    ) from None
+
+            return from_set
+
+        if hasattr(key, "get_signing_key_from_jwt"):
+            return key.get_signing_key_from_jwt
+
+        return lambda parsed: key
+
     def _validate_claims(
         self,
         payload: dict[str, Any],
@@ -431,3 +507,4 @@ _jwt_global_obj = PyJWT()
 encode = _jwt_global_obj.encode
 decode_complete = _jwt_global_obj.decode_complete
 decode = _jwt_global_obj.decode
+decode_many = _jwt_global_obj.decode_many
@@ -16,12 +16,25 @@ class JWKSetCache:
             # clear cache
             self.jwk_set_with_timestamp = None
 
+    def put_stale(self, jwk_set: PyJWKSet) -> None:
+        """Store a set that is served stale until the first refresh replaces it."""
+        self.put(jwk_set)
+        if self.jwk_set_with_timestamp is not None:
+            self.jwk_set_with_timestamp.timestamp -= self.lifespan + 1
+
     def get(self) -> Optional[PyJWKSet]:
         if self.jwk_set_with_timestamp is None or self.is_expired():
             return None
 
         return self.jwk_set_with_timestamp.get_jwk_set()
 
+    def get_stale(self) -> Optional[PyJWKSet]:
+        """Return the cached set even if it has outlived its lifespan."""
+        if self.jwk_set_with_timestamp is None:
+            return None
+
+        return self.jwk_set_with_timestamp.get_jwk_set()
+
     def is_expired(self) -> bool:
         return (
             self.jwk_set_with_timestamp is not None
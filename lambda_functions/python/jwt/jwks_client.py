@@ -1,15 +1,17 @@
 import json
-import urllib.request
+import threading
+import time
 from functools import lru_cache
-from ssl import SSLContext
-from typing import Any, Dict, List, Optional
-from urllib.error import URLError
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
 from .api_jwk import PyJWK, PyJWKSet
-from .api_jwt import decode_complete as decode_token
+from .api_jws import ParsedToken, parse
 from .exceptions import PyJWKClientConnectionError, PyJWKClientError
 from .jwk_set_cache import JWKSetCache
 
+if TYPE_CHECKING:
+    from ssl import SSLContext
+
 
 class PyJWKClient:
     def __init__(
@@ -21,7 +23,11 @@ class PyJWKClient:
         lifespan: int = 300,
         headers: Optional[Dict[str, Any]] = None,
         timeout: int = 30,
-        ssl_context: Optional[SSLContext] = None,
+        ssl_context: Optional["SSLContext"] = None,
+        stale_while_revalidate: bool = True,
+        min_refresh_interval: float = 30,
+        seed_jwk_set: Optional[Dict[str, Any]] = None,
+        refresh_wait: float = 1.0,
     ):
         if headers is None:
             headers = {}
@@ -30,6 +36,23 @@ class PyJWKClient:
         self.headers = headers
         self.timeout = timeout
         self.ssl_context = ssl_context
+        self.stale_while_revalidate = stale_while_revalidate
+        self.min_refresh_interval = min_refresh_interval
+        # How long a kid miss waits on another thread's refresh before
+        # fetching for itself
+        self.refresh_wait = min(refresh_wait, timeout)
+
+        # Parsed signing keys indexed by kid, rebuilt only when the cached
+        # JWK Set changes. _last_fetch is when the last fetch finished
+        # (successfully or not), so a fetch that is stuck in flight never
+        # counts against the rate limit.
+        self._signing_keys: Optional[Dict[str, PyJWK]] = None
+        self._signing_keys_source: Any = None
+        self._last_fetch: Optional[float] = None
+        self._refreshing = False
+        self._refresh_done: Optional[threading.Event] = None
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
 
         if cache_jwk_set:
             # Init jwt set cache with default or given lifespan.
@@ -39,6 +62,12 @@ class PyJWKClient:
                     f'Lifespan must be greater than 0, the input is "{lifespan}"'
                 )
             self.jwk_set_cache = JWKSetCache(lifespan)
+            if seed_jwk_set is not None:
+                # A bundled snapshot lets the first request verify tokens
+                # without a network round trip. It is treated as already
+                # stale so the live set replaces it in the background.
+                self._index_signing_keys(seed_jwk_set)
+                self.jwk_set_cache.put_stale(seed_jwk_set)
         else:
             self.jwk_set_cache = None
 
@@ -50,6 +79,10 @@ class PyJWKClient:
             )  # type: ignore
 
     def fetch_data(self) -> Any:
+        # urllib.request is slow to import and only needed when fetching
+        import urllib.request
+        from urllib.error import URLError
+
         jwk_set: Any = None
         try:
             r = urllib.request.Request(url=self.uri, headers=self.headers)
@@ -62,10 +95,13 @@ class PyJWKClient:
                 f'Fail to fetch data from the url, err: "{e}"'
             ) from e
         else:
-            return jwk_set
-        finally:
+            # A failed fetch keeps the previous set so it can still be
+            # served stale.
             if self.jwk_set_cache is not None:
                 self.jwk_set_cache.put(jwk_set)
+            return jwk_set
+        finally:
+            self._last_fetch = time.monotonic()
 
     def get_jwk_set(self, refresh: bool = False) -> PyJWKSet:
         data = None
@@ -81,38 +117,32 @@ class PyJWKClient:
         return PyJWKSet.from_dict(data)
 
     def get_signing_keys(self, refresh: bool = False) -> List[PyJWK]:
-        jwk_set = self.get_jwk_set(refresh)
-        signing_keys = [
-            jwk_set_key
-            for jwk_set_key in jwk_set.keys
-            if jwk_set_key.public_key_use in ["sig", None] and jwk_set_key.key_id
-        ]
+        return list(self._get_signing_key_index(refresh).values())
 
-        if not signing_keys:
-            raise PyJWKClientError("The JWKS endpoint did not contain any signing keys")
+    def get_signing_key(self, kid: str) -> PyJWK:
+        signing_key = self._get_signing_key_index().get(kid)
 
-        return signing_keys
+        if not signing_key and self._wait_for_background_refresh():
+            # The refresh in flight may already be fetching the set with
+            # this kid, and it counts against the rate limit below.
+            signing_key = self._get_signing_key_index().get(kid)
 
-    def get_signing_key(self, kid: str) -> PyJWK:
-        signing_keys = self.get_signing_keys()
-        signing_key = self.match_kid(signing_keys, kid)
+        if not signing_key and self._may_force_refresh():
+            # If no matching signing key from the jwk set, refresh the jwk set
+            # synchronously and try again. Forced refreshes are rate limited
+            # so tokens with made-up kids cannot turn into a stream of JWKS
+            # fetches.
+            signing_key = self._get_signing_key_index(refresh=True).get(kid)
 
         if not signing_key:
-            # If no matching signing key from the jwk set, refresh the jwk set and try again.
-            signing_keys = self.get_signing_keys(refresh=True)
-            signing_key = self.match_kid(signing_keys, kid)
-
-            if not signing_key:
-                raise PyJWKClientError(
-                    f'Unable to find a signing key that matches: "{kid}"'
-                )
+            raise PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
 
         return signing_key
 
-    def get_signing_key_from_jwt(self, token: str) -> PyJWK:
-        unverified = decode_token(token, options={"verify_signature": False})
-        header = unverified["header"]
-        return self.get_signing_key(header.get("kid"))
+    def get_signing_key_from_jwt(self, token: Union[str, ParsedToken]) -> PyJWK:
+        # Only the header is needed here; a ParsedToken is reused as-is so
+        # the following decode does not parse the token again.
+        return self.get_signing_key(parse(token).kid)
 
     @staticmethod
     def match_kid(signing_keys: List[PyJWK], kid: str) -> Optional[PyJWK]:
@@ -124,3 +154,105 @@ class PyJWKClient:
                 break
 
         return signing_key
+
+    def _get_signing_key_index(self, refresh: bool = False) -> Dict[str, PyJWK]:
+        if self.jwk_set_cache is None:
+            return self._index_signing_keys(self.fetch_data())
+
+        data = self.jwk_set_cache.get_stale()
+        if refresh:
+            data = self._refresh(lock_timeout=self.refresh_wait)
+        elif data is None:
+            data = self._refresh()
+        elif self.jwk_set_cache.is_expired():
+            if self.stale_while_revalidate:
+                self._refresh_in_background()
+            else:
+                data = self._refresh()
+
+        with self._lock:
+            if self._signing_keys is None or self._signing_keys_source is not data:
+                self._signing_keys = self._index_signing_keys(data)
+                self._signing_keys_source = data
+            return self._signing_keys
+
+    def _refresh(self, lock_timeout: float = -1) -> Any:
+        """
+        Fetch the JWK Set once, even when several threads ask at the same
+        time. With a lock_timeout, a fetch that holds the lock for longer
+        (such as a background refresh frozen with the Lambda sandbox) is
+        not waited on; this thread fetches on its own.
+        """
+        requested_at = time.monotonic()
+        if not self._fetch_lock.acquire(timeout=lock_timeout):
+            return self.fetch_data()
+        try:
+            data = self.jwk_set_cache.get_stale() if self.jwk_set_cache else None
+            if (
+                data is not None
+                and self._last_fetch is not None
+                and self._last_fetch >= requested_at
+            ):
+                # Another thread fetched while this one was waiting
+                return data
+            return self.fetch_data()
+        finally:
+            self._fetch_lock.release()
+
+    def _refresh_in_background(self) -> None:
+        """
+        Best effort only. In Lambda the daemon thread is frozen with the
+        sandbox between invocations, so the refresh can stall until a later
+        invocation thaws it. Nothing depends on it finishing: known kids are
+        served from the stale set, and a kid miss waits at most
+        refresh_wait for it before refreshing synchronously.
+        """
+        with self._lock:
+            if self._refreshing or not self._may_force_refresh():
+                return
+            self._refreshing = True
+            done = self._refresh_done = threading.Event()
+
+        def run() -> None:
+            try:
+                self._refresh()
+            except PyJWKClientError:
+                # Keep serving the stale set; the next request retries
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing = False
+                done.set()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _wait_for_background_refresh(self) -> bool:
+        """Wait up to refresh_wait for the background refresh in flight (if any)."""
+        with self._lock:
+            done = self._refresh_done if self._refreshing else None
+        if done is None:
+            return False
+        done.wait(self.refresh_wait)
+        return True
+
+    def _may_force_refresh(self) -> bool:
+        return (
+            self._last_fetch is None
+            or time.monotonic() - self._last_fetch >= self.min_refresh_interval
+        )
+
+    @staticmethod
+    def _index_signing_keys(data: Any) -> Dict[str, PyJWK]:
+        if not isinstance(data, dict):
+            raise PyJWKClientError("The JWKS endpoint did not return a JSON object")
+
+        signing_keys = {
+            jwk_set_key.key_id: jwk_set_key
+            for jwk_set_key in PyJWKSet.from_dict(data).keys
+            if jwk_set_key.public_key_use in ["sig", None] and jwk_set_key.key_id
+        }
+
+        if not signing_keys:
+            raise PyJWKClientError("The JWKS endpoint did not contain any signing keys")
+
+        return signing_keys
@@ -2,6 +2,7 @@ import json
 import boto3
 import os
 from datetime import datetime
+from common.cognito_auth import mark_roles_changed
 
 def lambda_handler(event, context):
     body = json.loads(event.get('body', '{}'))
@@ -42,6 +43,7 @@ def lambda_handler(event, context):
             ':changed': admin_id
         }
     )
+    mark_roles_changed(target_user_id, building_id)
     
     return {
         'statusCode': 200,
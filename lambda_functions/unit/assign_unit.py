@@ -4,49 +4,16 @@ import uuid
 import os
 from datetime import datetime
 import traceback
+from common.user_units import get_units_at_location, unit_location_key
+from common.building_roles import get_user_role
 
 # Environment variables
-USER_BUILDING_ROLES_TABLE = os.environ.get('TABLE_USER_BUILDING_ROLES', 'UserBuildingRoles-dev')
 USER_UNITS_TABLE = os.environ.get('TABLE_USERUNITS', 'UserUnits-dev')
 USERS_TABLE = os.environ.get('USERS_TABLE', 'Users-dev')
 BUILDINGS_TABLE = os.environ.get('TABLE_BUILDINGS', 'Buildings-dev')
 
 dynamodb = boto3.resource('dynamodb')
 
-def get_user_role_for_building(user_id, building_id):
-    """Get user's role for a specific building"""
-    try:
-        if not USER_BUILDING_ROLES_TABLE:
-            print("WARNING: USER_BUILDING_ROLES_TABLE not configured")
-            return None
-            
-        table = dynamodb.Table(USER_BUILDING_ROLES_TABLE)
-        composite_key = f"{user_id}#{building_id}"
-        
-        response = table.get_item(Key={'user_building_composite': composite_key})
-        
-        if 'Item' in response:
-            user_role = response['Item'].get('role')
-            print(f"User role for building {building_id}: {user_role}")
-            return user_role
-        
-        print(f"No role found for user {user_id} in building {building_id}")
-        return None
-        
-    except Exception as e:
-        print(f"Error checking user role: {str(e)}")
-        return None
-
-def check_user_is_admin(user_id, building_id):
-    """Check if user is admin for the given building"""
-    user_role = get_user_role_for_building(user_id, building_id)
-    return user_role == 'admin'
-
-def check_user_is_member(user_id, building_id):
-    """Check if user is member for the given building"""
-    user_role = get_user_role_for_building(user_id, building_id)
-    return user_role == 'member'
-
 def lambda_handler(event, context):
     try:
         print("=== ASSIGN UNIT FUNCTION STARTED ===")
@@ -83,7 +50,7 @@ def lambda_handler(event, context):
             }
 
         # ===== Check user's role for this building =====
-        user_role = get_user_role_for_building(user_id, building_id)
+        user_role = get_user_role(user_id, building_id)
         
         if user_role is None:
             # User has no role in this building
@@ -164,17 +131,9 @@ def lambda_handler(event, context):
            }
 
         # Check if unit is already assigned
-        existing_units_response = user_units_table.scan(
-            FilterExpression='building_id = :bid AND wings = :wing AND floor = :floor AND unit_number = :unit',
-            ExpressionAttributeValues={
-                ':bid': building_id,
-                ':wing': wings,
-                ':floor': int(floor),
-                ':unit': unit_number
-            }
-        )
+        existing_units = get_units_at_location(user_units_table, building_id, wings, floor, unit_number)
         
-        if existing_units_response.get('Items') and len(existing_units_response['Items']) > 0:
+        if existing_units:
             return {
                 'statusCode': 400,
                 'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
@@ -194,6 +153,7 @@ def lambda_handler(event, context):
             'unit_number': unit_number,
             'floor': int(floor),  
             'wings': wings,          
+            'unit_location': unit_location_key(building_id, wings, floor, unit_number),
             'unit_type': unit_type,
             'area_sqft': area_sqft,
             'rent_amount': rent_amount,
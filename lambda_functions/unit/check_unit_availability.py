@@ -2,37 +2,13 @@ import json
 import boto3
 import os
 from decimal import Decimal
+from common.building_roles import check_user_has_any_role
 
 dynamodb = boto3.resource('dynamodb')
 
 TABLE_USERUNITS = os.environ.get('TABLE_USERUNITS', 'UserUnits-dev')
 MEMBERS_TABLE = os.environ.get('MEMBERS_TABLE', 'Members-dev')
 TABLE_BUILDINGS = os.environ.get('TABLE_BUILDINGS', 'Buildings-dev')
-USER_BUILDING_ROLES_TABLE = os.environ.get('TABLE_USER_BUILDING_ROLES', 'UserBuildingRoles-dev')  
-
-def check_user_has_any_role(user_id, building_id):
-    """Check if user has any role (admin/member) in the building"""
-    try:
-        if not USER_BUILDING_ROLES_TABLE:
-            print("WARNING: USER_BUILDING_ROLES_TABLE not configured, skipping role check")
-            return True
-            
-        table = dynamodb.Table(USER_BUILDING_ROLES_TABLE)
-        composite_key = f"{user_id}#{building_id}"
-        
-        response = table.get_item(Key={'user_building_composite': composite_key})
-        
-        if 'Item' in response:
-            user_role = response['Item'].get('role')
-            print(f"User has role '{user_role}' for building {building_id}")
-            return True
-        
-        print(f"No role found for user {user_id} in building {building_id}")
-        return False
-        
-    except Exception as e:
-        print(f"Error checking user role: {str(e)}")
-        return False
 
 def convert_decimal(obj):
     """Convert Decimal objects to float/int for JSON serialization"""
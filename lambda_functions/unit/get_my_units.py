@@ -2,37 +2,14 @@ import json
 import boto3
 import os
 from decimal import Decimal
-from boto3.dynamodb.conditions import Attr
+from common.batch_loader import load_buildings
+from common.user_units import get_units_for_user
+from common.building_roles import check_user_has_any_role
 
 dynamodb = boto3.resource('dynamodb')
 
 TABLE_USERUNITS = os.environ.get('TABLE_USERUNITS', 'UserUnits-dev')
 TABLE_BUILDINGS = os.environ.get('TABLE_BUILDINGS', 'Buildings-dev')
-USER_BUILDING_ROLES_TABLE = os.environ.get('TABLE_USER_BUILDING_ROLES', 'UserBuildingRoles-dev')
-
-def check_user_has_any_role(user_id, building_id):
-    """Check if user has any role (admin/member) in the building"""
-    try:
-        if not USER_BUILDING_ROLES_TABLE:
-            print("WARNING: USER_BUILDING_ROLES_TABLE not configured, skipping role check")
-            return True
-            
-        table = dynamodb.Table(USER_BUILDING_ROLES_TABLE)
-        composite_key = f"{user_id}#{building_id}"
-        
-        response = table.get_item(Key={'user_building_composite': composite_key})
-        
-        if 'Item' in response:
-            user_role = response['Item'].get('role')
-            print(f"User has role '{user_role}' for building {building_id}")
-            return True
-        
-        print(f"No role found for user {user_id} in building {building_id}")
-        return False
-        
-    except Exception as e:
-        print(f"Error checking user role: {str(e)}")
-        return False
 
 def convert_decimal(obj):
     if isinstance(obj, list):
@@ -50,7 +27,6 @@ def lambda_handler(event, context):
         
         # ✅ FIX: Initialize tables here
         user_units_table = dynamodb.Table(TABLE_USERUNITS)
-        buildings_table = dynamodb.Table(TABLE_BUILDINGS)
         
         query_params = event.get('queryStringParameters', {}) or {}
         user_id = query_params.get('user_id')
@@ -65,30 +41,18 @@ def lambda_handler(event, context):
                 })
             }
         
-        units = []
-        response = user_units_table.scan(
-            FilterExpression=Attr('user_id').eq(user_id)
-        )
-        units.extend(response.get('Items', []))
+        units = get_units_for_user(user_units_table, user_id)
         
-        while 'LastEvaluatedKey' in response:
-            response = user_units_table.scan(
-                FilterExpression=Attr('user_id').eq(user_id),
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            units.extend(response.get('Items', []))
+        units = [unit for unit in units
+                 if unit.get('building_id') and check_user_has_any_role(user_id, unit['building_id'])]
+        buildings = load_buildings([unit['building_id'] for unit in units], TABLE_BUILDINGS)
         
         filtered_units = []
         for unit in units:
-            building_id = unit.get('building_id')
-            if building_id and check_user_has_any_role(user_id, building_id):
-                try:
-                    building_response = buildings_table.get_item(Key={'building_id': building_id})
-                    if 'Item' in building_response:
-                        unit['building_details'] = building_response['Item']
-                        filtered_units.append(unit)
-                except Exception as e:
-                    print(f"Error fetching building {building_id}: {e}")
+            building = buildings.get(unit['building_id'])
+            if building:
+                unit['building_details'] = building
+                filtered_units.append(unit)
         
         filtered_units = convert_decimal(filtered_units)
         
@@ -2,63 +2,69 @@ import json
 import boto3
 import uuid
 import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from decimal import Decimal
 from boto3.dynamodb.conditions import Key, Attr
+from botocore.exceptions import ClientError
+from common.building_roles import check_user_is_admin, get_user_role
+from common.batch_loader import batch_get_items, query_all
+from common.user_units import get_units_for_building, unit_location_key
+from common.ttl_cache import TTLCache
+from common.pagination import (
+    InvalidPageToken, PaginationNotConfigured, decode_next_token, encode_next_token, parse_limit
+)
 
 TABLE_UNIT_MAINTENANCE = os.environ["TABLE_UNIT_MAINTENANCE"]
-TABLE_USER_BUILDING_ROLES = os.environ.get("TABLE_USER_BUILDING_ROLES", "UserBuildingRoles-dev")
 TABLE_MAINTENANCE = os.environ.get("TABLE_MAINTENANCE", "MaintenanceRecords-dev")
+TABLE_USERUNITS = os.environ.get("TABLE_USERUNITS", "UserUnits-dev")
 
 dynamodb = boto3.resource("dynamodb")
 unit_maintenance_table = dynamodb.Table(TABLE_UNIT_MAINTENANCE)
-user_building_roles_table = dynamodb.Table(TABLE_USER_BUILDING_ROLES) if TABLE_USER_BUILDING_ROLES else None
 maintenance_table = dynamodb.Table(TABLE_MAINTENANCE) if TABLE_MAINTENANCE else None
+user_units_table = dynamodb.Table(TABLE_USERUNITS)
 
-def check_user_is_admin(user_id, building_id):
-    """Check if user is admin for the given building"""
-    try:
-        if not TABLE_USER_BUILDING_ROLES or not user_building_roles_table:
-            print("WARNING: TABLE_USER_BUILDING_ROLES not configured, skipping admin check")
-            return True
-            
-        composite_key = f"{user_id}#{building_id}"
-        
-        response = user_building_roles_table.get_item(
-            Key={'user_building_composite': composite_key}
-        )
-        
-        if 'Item' in response:
-            user_role = response['Item'].get('role')
-            return user_role == 'admin'
-        
-        return False
-        
-    except Exception as e:
-        print(f"Error checking user role: {str(e)}")
-        return False
+# Maintenance summaries attached to bills, memoised per container. Keep the
+# TTL short: admins can still edit a cycle's name or due date.
+MAINTENANCE_CACHE_TTL_SECONDS = float(os.environ.get("MAINTENANCE_CACHE_TTL_SECONDS", "30"))
+maintenance_details_cache = TTLCache(MAINTENANCE_CACHE_TTL_SECONDS, 256)
 
-def check_user_has_any_role(user_id, building_id):
-    """Check if user has any role (admin/member) in the building"""
-    try:
-        if not TABLE_USER_BUILDING_ROLES or not user_building_roles_table:
-            print("WARNING: TABLE_USER_BUILDING_ROLES not configured, skipping role check")
-            return True
-            
-        composite_key = f"{user_id}#{building_id}"
-        
-        response = user_building_roles_table.get_item(
-            Key={'user_building_composite': composite_key}
-        )
-        
-        if 'Item' in response:
-            return True
-        
-        return False
-        
-    except Exception as e:
-        print(f"Error checking user role: {str(e)}")
-        return False
+# Bulk generation writes each bill with its own conditional put; the pool
+# keeps the write burst bounded.
+BULK_BILL_WRITE_WORKERS = int(os.environ.get("BULK_BILL_WRITE_WORKERS", "8"))
+bill_write_executor = ThreadPoolExecutor(max_workers=BULK_BILL_WRITE_WORKERS)
+
+# Query calls one bill listing may make before returning a short page
+BILL_LIST_MAX_PAGES = int(os.environ.get("BILL_LIST_MAX_PAGES", "3"))
+
+# UnitMaintenanceBills indexes (see template.yaml):
+#   BuildingIndex        building_id / sk
+#   UnitLocationIndex    unit_location (building#wing#floor#unit) / sk
+#   UnpaidBuildingIndex  unpaid_building_id / sk, sparse: only unpaid bills
+# sk is MAINT#<maintenance_id>#WING#<wing>#FLOOR#<floor>#UNIT#<unit>, so a
+# cycle, or a cycle within one wing/floor, is a begins_with range. Prefixes
+# always end in "#" so MAINT#1 does not also match MAINT#12.
+#
+# Bills written before this layout (sk = MAINT#<maintenance_id>, no
+# unit_location or unpaid_building_id) only show up in building-wide
+# listings; cycle, unit and unpaid listings miss them until
+# project_utils/backfill_bill_keys.py rewrites them. With maintenance_id, a
+# wing filter is an exact match on the wing in sk rather than the
+# contains(wings, ...) substring match used without one.
+#
+# UnitLocationIndex and UnpaidBuildingIndex are created one per deploy
+# (UnitBillIndexStage in template.yaml). Each is queried only from the stage
+# after the one that created it; until then those listings read
+# BuildingIndex and filter.
+BILL_INDEX_STAGE = int(os.environ.get("UNIT_BILL_INDEX_STAGE", "1"))
+BILL_INDEX_READ_STAGES = {
+    "UnitLocationIndex": 2,
+    "UnpaidBuildingIndex": 3
+}
+
+def bill_index_readable(index_name):
+    return BILL_INDEX_STAGE >= BILL_INDEX_READ_STAGES[index_name]
 
 class DecimalEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -120,30 +126,281 @@ def calculate_bill_items(items):
 
     return updated_items, total
 
+def summarize_maintenance(item):
+    """Subset of a MaintenanceRecords item included in unit bills"""
+    maintenance_id = item.get("maintenance_id")
+    return {
+        "maintenance_name": item.get("name", f"Maintenance-{maintenance_id}"),
+        "description": item.get("description", ""),
+        "due_date": item.get("due_date"),
+        "month": item.get("month"),
+        "year": item.get("year"),
+        "status": item.get("status", "pending")
+    }
+
+def get_maintenance_details_many(maintenance_ids):
+    """
+    Return {maintenance_id: details} for the distinct ids given. Cached
+    entries are reused; the rest are fetched with one batch_get_item per
+    100 ids. Missing records are cached as None.
+    """
+    if not TABLE_MAINTENANCE or not maintenance_table:
+        return {}
+    
+    details = {}
+    missing = []
+    for maintenance_id in dict.fromkeys(i for i in maintenance_ids if i):
+        cached = maintenance_details_cache.get(maintenance_id, False)
+        if cached is False:
+            missing.append(maintenance_id)
+        else:
+            details[maintenance_id] = cached
+    
+    if missing:
+        try:
+            found = batch_get_items(TABLE_MAINTENANCE, "maintenance_id", missing)
+        except Exception as e:
+            print(f"Error fetching maintenance details: {str(e)}")
+            return details
+        
+        for maintenance_id in missing:
+            item = found.get(maintenance_id)
+            details[maintenance_id] = summarize_maintenance(item) if item else None
+            maintenance_details_cache.set(maintenance_id, details[maintenance_id])
+    
+    return details
+
 def get_maintenance_details(maintenance_id):
     """Get maintenance details to include in unit bill"""
-    if not TABLE_MAINTENANCE or not maintenance_table:
-        return None
+    return get_maintenance_details_many([maintenance_id]).get(maintenance_id)
+
+def attach_maintenance_details(items):
+    """Add maintenance_details to each bill, fetching each cycle once"""
+    details = get_maintenance_details_many(item.get("maintenance_id") for item in items)
+    for item in items:
+        maintenance_details = details.get(item.get("maintenance_id"))
+        if maintenance_details:
+            item["maintenance_details"] = maintenance_details
+
+def normalize_floor(floor):
+    try:
+        return int(floor)
+    except (TypeError, ValueError):
+        return floor
+
+def bill_sort_key(maintenance_id, wings, floor, unit_no):
+    """Sort key shared by every UnitMaintenanceBills index"""
+    return f"MAINT#{maintenance_id}#WING#{wings}#FLOOR#{normalize_floor(floor)}#UNIT#{unit_no}"
+
+def is_bill_unpaid(bill):
+    """Whether a bill belongs in the sparse UnpaidBuildingIndex"""
+    return bill.get("payment_status") != "paid" and bill.get("status") != "paid"
+
+def choose_bill_index(building_id, params):
+    """
+    Pick the narrowest index for a listing request. Returns the query
+    params, the partition (attribute, value) a next_token must match, and
+    the request filters already enforced by the key condition.
+    """
+    maintenance_id = params.get("maintenance_id")
+    wing = params.get("wing")
+    floor = params.get("floor")
+    unit_no = params.get("unit_no")
+    
+    if wing and floor and unit_no and bill_index_readable("UnitLocationIndex"):
+        index_name, hash_attr = "UnitLocationIndex", "unit_location"
+        hash_value = unit_location_key(building_id, wing, floor, unit_no)
+        consumed = {"wing", "floor", "unit_no"}
+        sk_prefix = f"MAINT#{maintenance_id}#" if maintenance_id else None
+    else:
+        if params.get("payment_status") == "unpaid" and bill_index_readable("UnpaidBuildingIndex"):
+            index_name, hash_attr = "UnpaidBuildingIndex", "unpaid_building_id"
+        else:
+            index_name, hash_attr = "BuildingIndex", "building_id"
+        hash_value = building_id
+        consumed = set()
+        sk_prefix = None
+        if maintenance_id:
+            sk_prefix = f"MAINT#{maintenance_id}#"
+            if wing:
+                sk_prefix += f"WING#{wing}#"
+                consumed.add("wing")
+                if floor:
+                    sk_prefix += f"FLOOR#{normalize_floor(floor)}#"
+                    consumed.add("floor")
+    
+    key_expr = Key(hash_attr).eq(hash_value)
+    if sk_prefix:
+        key_expr &= Key("sk").begins_with(sk_prefix)
+    
+    query_params = {
+        "IndexName": index_name,
+        "KeyConditionExpression": key_expr
+    }
+    return query_params, (hash_attr, hash_value), consumed
+
+def build_unit_bill(unit_id, building_id, maintenance_id, user_id, wings, floor, unit_no,
+                    bill_items, total_amount, maintenance_details):
+    """Assemble a UnitMaintenanceBills item"""
+    now = datetime.utcnow().isoformat()
+    
+    item = {
+        "unit_maintenance_id": unit_id,
+        "building_id": building_id,
+        "sk": bill_sort_key(maintenance_id, wings, floor, unit_no),
+        "unit_location": unit_location_key(building_id, wings, floor, unit_no),
+        "unpaid_building_id": building_id,
+        "maintenance_id": maintenance_id,
+        "user_id": user_id, 
+        "wings": wings,
+        "floor": str(floor),
+        "unit_no": unit_no,
+        "bill_items": bill_items,
+        "total_amount": float(total_amount) if total_amount % 1 != 0 else int(total_amount),
+        "status": "pending",
+        "payment_status": "unpaid",
+        "created_at": now,
+        "updated_at": now
+    }
     
+    if maintenance_details:
+        item["maintenance_details"] = maintenance_details
+    
+    return item
+
+def unit_key(wings, floor, unit_no):
+    """Normalised wing#floor#unit key for matching units and overrides"""
     try:
-        response = maintenance_table.get_item(
-            Key={"maintenance_id": maintenance_id}
+        floor = int(floor)
+    except (TypeError, ValueError):
+        pass
+    return f"{wings}#{floor}#{unit_no}"
+
+def bulk_bill_id(maintenance_id, key):
+    """Deterministic bill id so re-running a bulk generation is idempotent"""
+    digest = hashlib.sha1(f"{maintenance_id}#{key}".encode()).hexdigest()[:10].upper()
+    return f"UNIT-BILL-{digest}"
+
+def billed_unit_keys(building_id, maintenance_id):
+    """
+    unit_key of every unit that already has a bill for this cycle, however
+    it was created: bulk bills have deterministic ids but single POSTs use
+    random ones, so existence is decided by location, not id.
+    """
+    bills = query_all(
+        unit_maintenance_table,
+        IndexName="BuildingIndex",
+        KeyConditionExpression=Key("building_id").eq(building_id) & Key("sk").begins_with(f"MAINT#{maintenance_id}"),
+        ProjectionExpression="maintenance_id, wings, floor, unit_no"
+    )
+    # The prefix also matches longer ids (MAINT#12 for MAINT#1) and bills
+    # still carrying the pre-location sk, so compare the id itself
+    return {
+        unit_key(bill.get("wings"), bill.get("floor"), bill.get("unit_no"))
+        for bill in bills
+        if bill.get("maintenance_id") == maintenance_id
+    }
+
+def put_new_bill(item):
+    """Write a bill unless one with its id exists; returns 'created', 'exists' or 'failed'"""
+    try:
+        unit_maintenance_table.put_item(
+            Item=item,
+            ConditionExpression="attribute_not_exists(unit_maintenance_id)"
         )
+        return "created"
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return "exists"
+        print(f"Error writing bill {item['unit_maintenance_id']}: {str(e)}")
+        return "failed"
+
+def generate_bulk_bills(body):
+    """
+    Expand one maintenance cycle into a bill for every active unit in the
+    building. bill_items is the default template; overrides is a list of
+    {wings, floor, unit_no, bill_items} for units that differ. Bills that
+    already exist for a unit/cycle are left untouched.
+    """
+    building_id = body["building_id"]
+    maintenance_id = body["maintenance_id"]
+    
+    # Price each distinct template once
+    default_items, default_total = calculate_bill_items(body["bill_items"])
+    overrides = {}
+    for override in body.get("overrides") or []:
+        key = unit_key(override.get("wings"), override.get("floor"), override.get("unit_no"))
+        overrides[key] = calculate_bill_items(override.get("bill_items") or [])
+    
+    maintenance_details = get_maintenance_details(maintenance_id)
+    
+    units = get_units_for_building(
+        user_units_table,
+        building_id,
+        FilterExpression="#status = :active",
+        ExpressionAttributeNames={"#status": "status"},
+        ExpressionAttributeValues={":active": "active"}
+    )
+    
+    results = []
+    candidates = {}
+    for unit in units:
+        key = unit_key(unit.get("wings"), unit.get("floor"), unit.get("unit_number"))
+        result = {
+            "wings": unit.get("wings"),
+            "floor": str(unit.get("floor")),
+            "unit_no": unit.get("unit_number"),
+            "user_id": unit.get("user_id")
+        }
+        results.append(result)
         
-        if 'Item' in response:
-            item = response['Item']
-            return {
-                "maintenance_name": item.get("name", f"Maintenance-{maintenance_id}"),
-                "description": item.get("description", ""),
-                "due_date": item.get("due_date"),
-                "month": item.get("month"),
-                "year": item.get("year"),
-                "status": item.get("status", "pending")
-            }
-    except Exception as e:
-        print(f"Error fetching maintenance details: {str(e)}")
+        if key in candidates:
+            result.update(status="skipped", message="Duplicate unit assignment")
+            continue
+        
+        bill_items, total_amount = overrides.get(key, (default_items, default_total))
+        if total_amount <= 0:
+            result.update(status="failed", message="Total amount must be greater than 0")
+            continue
+        
+        unit_id = bulk_bill_id(maintenance_id, key)
+        result["unit_maintenance_id"] = unit_id
+        candidates[key] = (result, build_unit_bill(
+            unit_id, building_id, maintenance_id, unit.get("user_id"),
+            unit.get("wings"), unit.get("floor"), unit.get("unit_number"),
+            bill_items, total_amount, maintenance_details
+        ))
+    
+    existing = billed_unit_keys(building_id, maintenance_id) if candidates else set()
     
-    return None
+    to_write = []
+    for key, (result, item) in candidates.items():
+        if key in existing:
+            result.update(status="exists")
+        else:
+            to_write.append(item)
+    
+    # The existence check above reads an index that can lag, so the write
+    # itself refuses to replace a bill (which may already be paid) that a
+    # rerun or a concurrent run got to first
+    outcomes = dict(zip(
+        (item["unit_maintenance_id"] for item in to_write),
+        bill_write_executor.map(put_new_bill, to_write)
+    ))
+    for result, item in candidates.values():
+        if "status" in result:
+            continue
+        outcome = outcomes[item["unit_maintenance_id"]]
+        if outcome == "failed":
+            result.update(status="failed", message="Write was not processed, retry the request")
+        else:
+            result.update(status=outcome)
+    
+    summary = {}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    
+    return results, summary
 
 def lambda_handler(event, context):
     print("=== UNIT MAINTENANCE BILL HANDLER ===")
@@ -175,13 +432,14 @@ def lambda_handler(event, context):
                 user_id = params.get('user_id')
                 
                 if user_id:
-                    if not check_user_has_any_role(user_id, building_id):
+                    user_role = get_user_role(user_id, building_id)
+                    if user_role is None:
                         return response(403, {
                             "success": False,
                             "message": "You do not have access to view this bill"
                         })
                     
-                    if not check_user_is_admin(user_id, building_id) and item.get('user_id') != user_id:
+                    if user_role != 'admin' and item.get('user_id') != user_id:
                         return response(403, {
                             "success": False,
                             "message": "You can only view your own bills"
@@ -214,22 +472,33 @@ def lambda_handler(event, context):
                 "message": "building_id is required for listing bills"
             })
         
+        query_params, (hash_attr, hash_value), consumed = choose_bill_index(building_id, params)
+        
+        try:
+            limit = parse_limit(params.get("limit"))
+            exclusive_start_key = None
+            if params.get("next_token"):
+                exclusive_start_key = decode_next_token(params["next_token"])
+                if exclusive_start_key.get(hash_attr) != hash_value:
+                    raise InvalidPageToken("next_token does not match this listing")
+        except (ValueError, InvalidPageToken) as e:
+            return response(400, {
+                "success": False,
+                "message": str(e)
+            })
+        except PaginationNotConfigured as e:
+            print(f"Error: {str(e)}")
+            return response(500, {
+                "success": False,
+                "message": "Failed to fetch unit maintenance bills",
+                "error": str(e)
+            })
         
         try:
-            key_expr = Key("building_id").eq(building_id)
-            
             filter_expressions = []
             expression_values = {}
             expression_names = {}
             
-            if params.get("maintenance_id"):
-                key_expr &= Key("sk").begins_with(f"MAINT#{params['maintenance_id']}")
-            
-            query_params = {
-                "IndexName": "BuildingIndex",
-                "KeyConditionExpression": key_expr
-            }
-            
             filter_user_id = params.get("filter_user_id")
             if filter_user_id:
                 filter_expressions.append("user_id = :filter_user_id")
@@ -247,17 +516,17 @@ def lambda_handler(event, context):
                 expression_values[":payment_status"] = payment_status
             
             wing = params.get("wing")
-            if wing:
+            if wing and "wing" not in consumed:
                 filter_expressions.append("contains(wings, :wing)")
                 expression_values[":wing"] = wing
             
             floor = params.get("floor")
-            if floor:
+            if floor and "floor" not in consumed:
                 filter_expressions.append("floor = :floor")
                 expression_values[":floor"] = str(floor)
             
             unit_no = params.get("unit_no")
-            if unit_no:
+            if unit_no and "unit_no" not in consumed:
                 filter_expressions.append("unit_no = :unit_no")
                 expression_values[":unit_no"] = unit_no
             
@@ -270,28 +539,30 @@ def lambda_handler(event, context):
             
             print(f"Query params: {json.dumps(query_params, default=str)}")
             
-            res = unit_maintenance_table.query(**query_params)
-            items = res.get("Items", [])
-            
-            
-            while 'LastEvaluatedKey' in res:
-                query_params['ExclusiveStartKey'] = res['LastEvaluatedKey']
+            # One Query reads `limit` index entries. A FilterExpression can
+            # leave that page short or empty; only an empty one is retried,
+            # and at most BILL_LIST_MAX_PAGES times, so a selective filter
+            # returns a short page and a next_token instead of scanning on.
+            query_params["Limit"] = limit
+            items = []
+            last_key = exclusive_start_key
+            for _ in range(BILL_LIST_MAX_PAGES):
+                if last_key:
+                    query_params["ExclusiveStartKey"] = last_key
                 res = unit_maintenance_table.query(**query_params)
-                items.extend(res.get('Items', []))
+                items = res.get("Items", [])
+                last_key = res.get("LastEvaluatedKey")
+                if items or not last_key:
+                    break
             
-            
-            for item in items:
-                maintenance_id = item.get("maintenance_id")
-                if maintenance_id:
-                    maintenance_details = get_maintenance_details(maintenance_id)
-                    if maintenance_details:
-                        item["maintenance_details"] = maintenance_details
+            attach_maintenance_details(items)
             
             return response(200, {
                 "success": True,
                 "count": len(items),
                 "building_id": building_id,
-                "data": items
+                "data": items,
+                "next_token": encode_next_token(last_key)
             })
             
         except Exception as e:
@@ -304,6 +575,65 @@ def lambda_handler(event, context):
                 "error": str(e)
             })
 
+    if method == "POST" and path == "/unit_maintenance_bill/bulk":
+        try:
+            body = json.loads(event.get("body") or "{}")
+            
+            required = ["building_id", "maintenance_id", "user_id", "bill_items"]
+            missing = [f for f in required if f not in body]
+            if missing:
+                return response(400, {
+                    "success": False,
+                    "message": "Missing required fields",
+                    "missing_fields": missing
+                })
+            
+            if not check_user_is_admin(body["user_id"], body["building_id"]):
+                return response(403, {
+                    "success": False,
+                    "message": "Only building admin can create unit maintenance bills",
+                    "user_id": body["user_id"],
+                    "building_id": body["building_id"]
+                })
+            
+            if not isinstance(body["bill_items"], list) or len(body["bill_items"]) == 0:
+                return response(400, {
+                    "success": False,
+                    "message": "bill_items must be a non-empty array"
+                })
+            
+            if not isinstance(body.get("overrides") or [], list):
+                return response(400, {
+                    "success": False,
+                    "message": "overrides must be an array"
+                })
+            
+            results, summary = generate_bulk_bills(body)
+            
+            return response(200, {
+                "success": True,
+                "message": "Bulk unit maintenance bill generation complete",
+                "building_id": body["building_id"],
+                "maintenance_id": body["maintenance_id"],
+                "summary": summary,
+                "results": results
+            })
+            
+        except json.JSONDecodeError:
+            return response(400, {
+                "success": False,
+                "message": "Invalid JSON in request body"
+            })
+        except Exception as e:
+            print(f"Error generating bulk unit maintenance bills: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return response(500, {
+                "success": False,
+                "message": "Failed to generate unit maintenance bills",
+                "error": str(e)
+            })
+
     if method == "POST" and path == "/unit_maintenance_bill":
         try:
             body = json.loads(event.get("body") or "{}")
@@ -356,27 +686,12 @@ def lambda_handler(event, context):
             maintenance_details = get_maintenance_details(body["maintenance_id"])
             
             unit_id = f"UNIT-BILL-{uuid.uuid4().hex[:8].upper()}"
-            now = datetime.utcnow().isoformat()
             
-            item = {
-                "unit_maintenance_id": unit_id,
-                "building_id": building_id,
-                "sk": f"MAINT#{body['maintenance_id']}",
-                "maintenance_id": body["maintenance_id"],
-                "user_id": body["user_id"], 
-                "wings": body["wings"],
-                "floor": str(body["floor"]),
-                "unit_no": body["unit_no"],
-                "bill_items": bill_items,
-                "total_amount": float(total_amount) if total_amount % 1 != 0 else int(total_amount),
-                "status": "pending",
-                "payment_status": "unpaid",
-                "created_at": now,
-                "updated_at": now
-            }
-            
-            if maintenance_details:
-                item["maintenance_details"] = maintenance_details
+            item = build_unit_bill(
+                unit_id, building_id, body["maintenance_id"], body["user_id"],
+                body["wings"], body["floor"], body["unit_no"],
+                bill_items, total_amount, maintenance_details
+            )
             
             unit_maintenance_table.put_item(Item=item)
             
@@ -472,6 +787,24 @@ def lambda_handler(event, context):
                update_expr.append("payment_date = :payment_date")
                values[":payment_date"] = datetime.utcnow().isoformat()            
             
+            # Keep index keys in step with the bill's unit and payment state
+            merged = {**existing_bill['Item'], **{f: body[f] for f in allowed_fields if f in body}}
+            remove_expr = []
+            if any(f in body for f in ("wings", "floor", "unit_no")):
+                update_expr.append("sk = :sk")
+                update_expr.append("unit_location = :unit_location")
+                values[":sk"] = bill_sort_key(
+                    merged.get("maintenance_id"), merged.get("wings"), merged.get("floor"), merged.get("unit_no")
+                )
+                values[":unit_location"] = unit_location_key(
+                    building_id, merged.get("wings"), merged.get("floor"), merged.get("unit_no")
+                )
+            if is_bill_unpaid(merged):
+                update_expr.append("unpaid_building_id = :unpaid_building_id")
+                values[":unpaid_building_id"] = building_id
+            else:
+                remove_expr.append("unpaid_building_id")
+            
             update_expr.append("updated_at = :updated_at")
             values[":updated_at"] = datetime.utcnow().isoformat()
             
@@ -483,7 +816,9 @@ def lambda_handler(event, context):
             
             unit_maintenance_table.update_item(
                 Key={"unit_maintenance_id": unit_id},
-                UpdateExpression="SET " + ", ".join(update_expr),
+                UpdateExpression="SET " + ", ".join(update_expr) + (
+                    " REMOVE " + ", ".join(remove_expr) if remove_expr else ""
+                ),
                 ExpressionAttributeValues=values,
                 ReturnValues="ALL_NEW"
             )
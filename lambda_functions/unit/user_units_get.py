@@ -2,34 +2,13 @@ import json
 import boto3
 import os
 from decimal import Decimal
+from common.user_units import get_units_for_building
+from common.building_roles import check_user_is_admin
 
 dynamodb = boto3.resource('dynamodb')
 
 TABLE_USERUNITS = os.environ.get('TABLE_USERUNITS', 'UserUnits-dev')
 USERS_TABLE = os.environ.get('USERS_TABLE', 'Users-dev')
-USER_BUILDING_ROLES_TABLE = os.environ.get('TABLE_USER_BUILDING_ROLES', 'UserBuildingRoles-dev')
-
-def check_user_is_admin(user_id, building_id):
-    """Check if user is admin for the given building"""
-    try:
-        if not USER_BUILDING_ROLES_TABLE:
-            print("WARNING: USER_BUILDING_ROLES_TABLE not configured, skipping admin check")
-            return True
-            
-        table = dynamodb.Table(USER_BUILDING_ROLES_TABLE)
-        composite_key = f"{user_id}#{building_id}"
-        
-        response = table.get_item(Key={'user_building_composite': composite_key})
-        
-        if 'Item' in response:
-            user_role = response['Item'].get('role')
-            return user_role == 'admin'
-        
-        return False
-        
-    except Exception as e:
-        print(f"Error checking user role: {str(e)}")
-        return False
 
 def convert_decimal(obj):
     if isinstance(obj, list):
@@ -75,22 +54,8 @@ def lambda_handler(event, context):
         user_units_table = dynamodb.Table(TABLE_USERUNITS)
         users_table = dynamodb.Table(USERS_TABLE)
         
-        # Fetch units filtered by building_id
-        units = []
-        response = user_units_table.scan(
-            FilterExpression='building_id = :bid',
-            ExpressionAttributeValues={':bid': building_id}
-        )
-        units.extend(response.get('Items', []))
-        
-        # Handle pagination
-        while 'LastEvaluatedKey' in response:
-            response = user_units_table.scan(
-                FilterExpression='building_id = :bid',
-                ExpressionAttributeValues={':bid': building_id},
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            units.extend(response.get('Items', []))
+        # Fetch units for this building from BuildingIdIndex
+        units = get_units_for_building(user_units_table, building_id)
         
         final_units = []
         
@@ -0,0 +1,195 @@
+"""
+Monthly archival of processed ConnectionRequests.
+
+`archive` moves approved and rejected requests processed before the current
+month (or --before YYYY-MM) out of the table and into one gzipped JSON-lines
+file per processing month, e.g. connection_requests-2026-09.jsonl.gz. The
+archive directory stands in for an S3 prefix. Rows are written to the
+archive before they are deleted, and each delete is conditional on the row
+being unchanged, so a request resubmitted since the scan is left alone.
+Rejected versions that a resubmission replaced are drained the same way
+from ConnectionRequestHistory. Run it early each month, before
+REJECTED_REQUEST_TTL_DAYS lets TTL remove rejected requests. Pending
+requests are not archived.
+
+`query` reads the archive back for audit, filtered by building, user,
+request or status.
+
+Usage:
+  python project_utils/archive_connection_requests.py archive [environment] [--before YYYY-MM] [--archive-dir DIR]
+  python project_utils/archive_connection_requests.py query [--month YYYY-MM] [--building-id ID]
+         [--user-id ID] [--request-id ID] [--status STATUS] [--archive-dir DIR]
+"""
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+from datetime import datetime
+from decimal import Decimal
+
+import boto3
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+from common.connection_requests import EXPIRES_AT_ATTR, PENDING_SORT_ATTR  # noqa: E402
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), 'connection_request_archive')
+PROCESSED_STATUSES = ('approved', 'rejected')
+# Index and TTL bookkeeping is meaningless once a request is archived
+DROPPED_ATTRS = {PENDING_SORT_ATTR, EXPIRES_AT_ATTR, 'building_name', 'history_id'}
+
+
+def archive_path(archive_dir, month):
+    return os.path.join(archive_dir, f"connection_requests-{month}.jsonl.gz")
+
+
+def processed_month(request):
+    """YYYY-MM the request was approved or rejected in"""
+    processed_at = request.get(f"{request['status']}_at") or request.get('updated_at') or request.get('requested_at', '')
+    return processed_at[:7]
+
+
+def compact(request):
+    row = {}
+    for name, value in request.items():
+        if name in DROPPED_ATTRS or value in (None, ''):
+            continue
+        if isinstance(value, Decimal):
+            value = int(value) if value % 1 == 0 else float(value)
+        row[name] = value
+    return row
+
+
+def scan_processed(table, before_month):
+    """Processed requests grouped by processing month, for months before `before_month`"""
+    scan_kwargs = {
+        'FilterExpression': '#status IN (:approved, :rejected)',
+        'ExpressionAttributeNames': {'#status': 'status'},
+        'ExpressionAttributeValues': {':approved': 'approved', ':rejected': 'rejected'}
+    }
+    by_month = {}
+    while True:
+        response = table.scan(**scan_kwargs)
+        for request in response.get('Items', []):
+            month = processed_month(request)
+            if month and month < before_month:
+                by_month.setdefault(month, []).append(request)
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return by_month
+
+
+def delete_archived(table, request, key_name='request_id'):
+    """Delete the row only if it still is the version that was archived"""
+    try:
+        table.delete_item(
+            Key={key_name: request[key_name]},
+            ConditionExpression='#status = :status AND updated_at = :updated_at',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={':status': request['status'], ':updated_at': request.get('updated_at')}
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        return False
+
+
+def archive_table(table, key_name, before_month, archive_dir):
+    """Archive and delete one table's processed rows; returns (archived, deleted)"""
+    by_month = scan_processed(table, before_month)
+    archived = deleted = 0
+    for month in sorted(by_month):
+        requests = by_month[month]
+        # Appending adds a new gzip member; readers see one continuous stream
+        with gzip.open(archive_path(archive_dir, month), 'at', encoding='utf-8') as f:
+            for request in requests:
+                f.write(json.dumps(compact(request), separators=(',', ':'), sort_keys=True) + '\n')
+        archived += len(requests)
+
+        for request in requests:
+            if delete_archived(table, request, key_name):
+                deleted += 1
+        print(f"{month}: archived {len(requests)} requests from {table.name}")
+    return archived, deleted
+
+
+def archive(args):
+    dynamodb = boto3.resource('dynamodb')
+    before_month = args.before or datetime.utcnow().strftime('%Y-%m')
+    os.makedirs(args.archive_dir, exist_ok=True)
+
+    archived = deleted = 0
+    for table_name, key_name in (
+        (f"ConnectionRequests-{args.environment}", 'request_id'),
+        (f"ConnectionRequestHistory-{args.environment}", 'history_id'),
+    ):
+        table_archived, table_deleted = archive_table(dynamodb.Table(table_name), key_name, before_month, args.archive_dir)
+        archived += table_archived
+        deleted += table_deleted
+
+    print(f"Archived {archived} requests processed before {before_month}, removed {deleted} from the tables")
+
+
+def read_archive(archive_dir, month=None):
+    """Yield archived rows, each request version once"""
+    paths = [archive_path(archive_dir, month)] if month else sorted(
+        glob.glob(os.path.join(archive_dir, 'connection_requests-*.jsonl.gz'))
+    )
+    seen = set()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                row = json.loads(line)
+                # A rerun after an interrupted delete can archive a row twice
+                version = (row['request_id'], row.get('updated_at'))
+                if version not in seen:
+                    seen.add(version)
+                    yield row
+
+
+def query(args):
+    filters = {
+        'building_id': args.building_id,
+        'user_id': args.user_id,
+        'request_id': args.request_id,
+        'status': args.status
+    }
+    matched = 0
+    for row in read_archive(args.archive_dir, args.month):
+        if all(value is None or row.get(name) == value for name, value in filters.items()):
+            print(json.dumps(row, sort_keys=True))
+            matched += 1
+    print(f"{matched} archived requests", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Archive and audit processed connection requests')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    archive_parser = subparsers.add_parser('archive')
+    archive_parser.add_argument('environment', nargs='?', default='dev')
+    archive_parser.add_argument('--before', help='archive requests processed before this month (YYYY-MM)')
+    archive_parser.add_argument('--archive-dir', default=DEFAULT_ARCHIVE_DIR)
+    archive_parser.set_defaults(handler=archive)
+
+    query_parser = subparsers.add_parser('query')
+    query_parser.add_argument('--month', help='only read this month (YYYY-MM)')
+    query_parser.add_argument('--building-id')
+    query_parser.add_argument('--user-id')
+    query_parser.add_argument('--request-id')
+    query_parser.add_argument('--status', choices=PROCESSED_STATUSES)
+    query_parser.add_argument('--archive-dir', default=DEFAULT_ARCHIVE_DIR)
+    query_parser.set_defaults(handler=query)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
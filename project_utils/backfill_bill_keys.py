@@ -0,0 +1,65 @@
+"""
+One-off backfill of the UnitMaintenanceBills index attributes (sk,
+unit_location, unpaid_building_id) on bills written before the
+wing/floor/unit sort key. Safe to re-run. Run it once UnitBillIndexStage 1
+is deployed and before raising the stage to 2, which is when unit listings
+start reading UnitLocationIndex.
+
+Usage: python project_utils/backfill_bill_keys.py [environment]
+"""
+import os
+import sys
+
+import boto3
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+from common.user_units import unit_location_key  # noqa: E402
+
+
+def bill_sort_key(bill):
+    floor = bill.get('floor')
+    try:
+        floor = int(floor)
+    except (TypeError, ValueError):
+        pass
+    return (f"MAINT#{bill.get('maintenance_id')}#WING#{bill.get('wings')}"
+            f"#FLOOR#{floor}#UNIT#{bill.get('unit_no')}")
+
+
+def main():
+    env = sys.argv[1] if len(sys.argv) > 1 else 'dev'
+    table = boto3.resource('dynamodb').Table(f"UnitMaintenanceBills-{env}")
+
+    scan_kwargs = {}
+    updated = 0
+    while True:
+        response = table.scan(**scan_kwargs)
+        for bill in response.get('Items', []):
+            if bill.get('unit_location'):
+                continue
+            unpaid = bill.get('payment_status') != 'paid' and bill.get('status') != 'paid'
+            update_expr = 'SET sk = :sk, unit_location = :loc'
+            values = {
+                ':sk': bill_sort_key(bill),
+                ':loc': unit_location_key(
+                    bill['building_id'], bill.get('wings'), bill.get('floor'), bill.get('unit_no')
+                )
+            }
+            if unpaid:
+                update_expr += ', unpaid_building_id = :bid'
+                values[':bid'] = bill['building_id']
+            table.update_item(
+                Key={'unit_maintenance_id': bill['unit_maintenance_id']},
+                UpdateExpression=update_expr,
+                ExpressionAttributeValues=values
+            )
+            updated += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    print(f"Backfilled index keys on {updated} bills")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+One-off backfill of the pending_requested_at attribute on existing pending
+ConnectionRequests rows so they show up in BuildingPendingIndex. Safe to re-run.
+
+Usage: python project_utils/backfill_pending_requested_at.py [environment]
+"""
+import os
+import sys
+
+import boto3
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+from common.connection_requests import PENDING_SORT_ATTR  # noqa: E402
+
+
+def main():
+    env = sys.argv[1] if len(sys.argv) > 1 else 'dev'
+    table = boto3.resource('dynamodb').Table(f"ConnectionRequests-{env}")
+
+    scan_kwargs = {
+        'FilterExpression': '#status = :pending AND attribute_not_exists(#sort)',
+        'ExpressionAttributeNames': {'#status': 'status', '#sort': PENDING_SORT_ATTR},
+        'ExpressionAttributeValues': {':pending': 'pending'}
+    }
+    updated = 0
+    while True:
+        response = table.scan(**scan_kwargs)
+        for request in response.get('Items', []):
+            table.update_item(
+                Key={'request_id': request['request_id']},
+                UpdateExpression='SET #sort = :requested_at',
+                ConditionExpression='#status = :pending',
+                ExpressionAttributeNames={'#status': 'status', '#sort': PENDING_SORT_ATTR},
+                ExpressionAttributeValues={
+                    ':pending': 'pending',
+                    ':requested_at': request.get('requested_at') or request.get('updated_at', '')
+                }
+            )
+            updated += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    print(f"Backfilled {PENDING_SORT_ATTR} on {updated} pending requests")
+
+
+if __name__ == '__main__':
+    main()
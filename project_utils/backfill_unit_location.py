@@ -0,0 +1,48 @@
+"""
+One-off backfill of the unit_location attribute on existing UserUnits rows so
+they show up in UnitLocationIndex. Safe to re-run. Run it once
+UnitLocationIndex exists (UserUnitsIndexStage 3) and before raising the stage
+to 4, which is when assign_unit starts trusting the index.
+
+Usage: python project_utils/backfill_unit_location.py [environment]
+"""
+import os
+import sys
+
+import boto3
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+from common.user_units import unit_location_key  # noqa: E402
+
+
+def main():
+    env = sys.argv[1] if len(sys.argv) > 1 else 'dev'
+    table = boto3.resource('dynamodb').Table(f"UserUnits-{env}")
+
+    scan_kwargs = {}
+    updated = 0
+    while True:
+        response = table.scan(**scan_kwargs)
+        for unit in response.get('Items', []):
+            if unit.get('unit_location') or not unit.get('building_id'):
+                continue
+            table.update_item(
+                Key={'unit_id': unit['unit_id']},
+                UpdateExpression='SET unit_location = :loc',
+                ExpressionAttributeValues={
+                    ':loc': unit_location_key(
+                        unit['building_id'], unit.get('wings'),
+                        unit.get('floor'), unit.get('unit_number')
+                    )
+                }
+            )
+            updated += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    print(f"Backfilled unit_location on {updated} units")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""
+Show that building.add_building latency does not grow with the Buildings
+table. Seeds an in-memory stand-in for DynamoDB with 10k and 100k buildings
+(each with a building_code and a reservation), then times add_building and
+counts the DynamoDB calls and items read per creation. Every call sleeps for
+a fixed latency so the numbers resemble a real round trip.
+
+Usage: python project_utils/bench_add_building.py [latency_ms] [iterations]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-south-1')
+os.environ.setdefault('TABLE_BUILDINGS', 'Buildings-bench')
+os.environ.setdefault('TABLE_BUILDING_CODES', 'BuildingCodes-bench')
+os.environ.setdefault('USERS_TABLE', 'Users-bench')
+os.environ.setdefault('TABLE_USER_BUILDING_ROLES', 'UserBuildingRoles-bench')
+
+from botocore.exceptions import ClientError  # noqa: E402
+
+from building import add_building  # noqa: E402
+
+USER_ID = 'user_9999999999'
+
+
+class Stats:
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.items_read = 0
+
+    def call(self, items_read=0):
+        time.sleep(self.latency)
+        self.calls += 1
+        self.items_read += items_read
+
+
+class FakeTable:
+    """Hash-keyed items plus hash-only GSIs, like DynamoDB partitions"""
+
+    def __init__(self, key, stats, indexes=None):
+        self.key = key
+        self.stats = stats
+        self.items = {}
+        self.indexes = {name: {} for name in (indexes or {})}
+        self.index_keys = indexes or {}
+
+    def put(self, item):
+        self.items[item[self.key]] = item
+        for name, attr in self.index_keys.items():
+            if attr in item:
+                self.indexes[name].setdefault(item[attr], []).append(item)
+
+    def get_item(self, Key):
+        item = self.items.get(Key[self.key])
+        self.stats.call(1 if item else 0)
+        return {'Item': item} if item else {}
+
+    def put_item(self, Item, **kwargs):
+        self.stats.call()
+        self.put(Item)
+        return {}
+
+    def update_item(self, **kwargs):
+        self.stats.call()
+        return {}
+
+    def query(self, IndexName, KeyConditionExpression, Limit=None, **kwargs):
+        value = KeyConditionExpression.get_expression()['values'][1]
+        items = self.indexes[IndexName].get(value, [])[:Limit]
+        self.stats.call(len(items))
+        return {'Items': items, 'Count': len(items)}
+
+
+class FakeClient:
+    def __init__(self, tables, stats):
+        self.tables = tables
+        self.stats = stats
+
+    def transact_write_items(self, TransactItems):
+        self.stats.call()
+        puts = [entry['Put'] for entry in TransactItems]
+        reasons = []
+        for put in puts:
+            table = self.tables[put['TableName']]
+            exists = put['Item'][table.key] in table.items
+            reasons.append({'Code': 'ConditionalCheckFailed' if exists else 'None'})
+        if any(r['Code'] != 'None' for r in reasons):
+            raise ClientError({'Error': {'Code': 'TransactionCanceledException'},
+                               'CancellationReasons': reasons}, 'TransactWriteItems')
+        for put in puts:
+            self.tables[put['TableName']].put(put['Item'])
+
+
+def seed(building_count, latency):
+    stats = Stats(latency)
+    buildings = FakeTable('building_id', stats, {'BuildingCodeIndex': 'building_code', 'UserIDIndex': 'user_id'})
+    codes = FakeTable('building_code', stats)
+    users = FakeTable('user_id', stats)
+    roles = FakeTable('user_building_composite', stats)
+    users.put({'user_id': USER_ID, 'name': 'Bench Admin'})
+    for i in range(building_count):
+        code = f"S{i:07d}"
+        buildings.put({'building_id': f"BLD-{i:08X}", 'building_code': code, 'user_id': f"user_{i}"})
+        codes.put({'building_code': code, 'building_id': f"BLD-{i:08X}"})
+
+    add_building.buildings_table = buildings
+    add_building.users_table = users
+    add_building.user_building_roles_table = roles
+    add_building.dynamodb = type('FakeResource', (), {})()
+    add_building.dynamodb.meta = type('Meta', (), {})()
+    add_building.dynamodb.meta.client = FakeClient({
+        add_building.TABLE_BUILDINGS: buildings,
+        add_building.TABLE_BUILDING_CODES: codes
+    }, stats)
+    return stats
+
+
+def event(i):
+    return {'body': json.dumps({
+        'name': f"Sunrise Heights {i}",
+        'user_id': USER_ID,
+        'wings': ['A', 'B'],
+        'wing_details': {
+            'A': {'total_floors': 10, 'units_per_floor': 4},
+            'B': {'total_floors': 12, 'units_per_floor': 4}
+        }
+    })}
+
+
+def main():
+    latency = (float(sys.argv[1]) if len(sys.argv) > 1 else 5.0) / 1000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    # Handler logging is noise here
+    real_stdout = sys.stdout
+    for building_count in (0, 10_000, 100_000):
+        stats = seed(building_count, latency)
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            start = time.perf_counter()
+            for i in range(iterations):
+                response = add_building.lambda_handler(event(i), None)
+                assert response['statusCode'] == 200, response
+            elapsed = (time.perf_counter() - start) / iterations
+        finally:
+            sys.stdout.close()
+            sys.stdout = real_stdout
+        print(f"{building_count:>7} buildings: {elapsed * 1000:6.1f} ms/creation, "
+              f"{stats.calls / iterations:4.1f} DynamoDB calls, "
+              f"{stats.items_read / iterations:4.1f} items read")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Time connections.get_user_connected_buildings for a user connected to many
+buildings, with the four source reads run serially and concurrently.
+DynamoDB is replaced by in-memory tables that sleep for a fixed latency
+per call, so no AWS access is needed.
+
+Usage: python project_utils/bench_connected_buildings.py [buildings] [latency_ms] [iterations]
+"""
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-south-1')
+os.environ.setdefault('TABLE_CONNECTION_REQUESTS', 'ConnectionRequests-bench')
+os.environ.setdefault('TABLE_BUILDINGS', 'Buildings-bench')
+os.environ.setdefault('TABLE_USERUNITS', 'UserUnits-bench')
+os.environ.setdefault('MEMBERS_TABLE', 'MembersTable-bench')
+
+from common import batch_loader  # noqa: E402
+from connections import get_user_connected_buildings as handler  # noqa: E402
+
+USER_ID = 'user_9999999999'
+
+
+class FakeTable:
+    """Answers the handler's queries from a list of items after `latency` seconds"""
+
+    def __init__(self, items, latency):
+        self.items = items
+        self.latency = latency
+
+    def query(self, **kwargs):
+        time.sleep(self.latency)
+        values = kwargs['ExpressionAttributeValues']
+        status = values.get(':statval')
+        items = [
+            item for item in self.items
+            if item.get('user_id') == USER_ID and (status is None or item.get('status') == status)
+        ]
+        return {'Items': items, 'Count': len(items)}
+
+    def get_item(self, Key):
+        time.sleep(self.latency)
+        for item in self.items:
+            if all(item.get(k) == v for k, v in Key.items()):
+                return {'Item': item}
+        return {}
+
+
+class FakeDynamoDB:
+    def __init__(self, tables, latency):
+        self.tables = tables
+        self.latency = latency
+
+    def Table(self, name):
+        return self.tables[name]
+
+    def batch_get_item(self, RequestItems):
+        time.sleep(self.latency)
+        responses = {}
+        for table_name, request in RequestItems.items():
+            wanted = {key['building_id'] for key in request['Keys']}
+            responses[table_name] = [b for b in self.tables[table_name].items if b['building_id'] in wanted]
+        return {'Responses': responses}
+
+
+def make_fixture(building_count, latency):
+    """A user with units in most buildings, plus pending and rejected requests elsewhere"""
+    buildings = [
+        {'building_id': f"BLD-{i:03d}", 'building_name': f"Tower {i}", 'building_code': f"TWR{i:03d}"}
+        for i in range(building_count)
+    ]
+    units, requests = [], []
+    for i, building in enumerate(buildings):
+        if i % 4 == 3:
+            requests.append({
+                'request_id': f"REQ-{i:03d}", 'user_id': USER_ID, 'building_id': building['building_id'],
+                'wing': 'A', 'floor': '2', 'unit_number': '201',
+                'status': 'pending' if i % 8 == 3 else 'rejected',
+                'requested_at': '2026-01-01T00:00:00', 'rejected_at': '2026-01-02T00:00:00'
+            })
+        else:
+            units.append({
+                'unit_id': f"UNIT-{i:03d}", 'user_id': USER_ID, 'building_id': building['building_id'],
+                'wings': 'A', 'floor': 1, 'unit_number': '101', 'status': 'active',
+                'assigned_at': '2026-01-01T00:00:00'
+            })
+    members = [{
+        'user_id': USER_ID, 'building_id': buildings[0]['building_id'], 'wings': 'A',
+        'floor': 1, 'unit_number': '101', 'member_type': 'resident'
+    }]
+
+    return FakeDynamoDB({
+        os.environ['TABLE_BUILDINGS']: FakeTable(buildings, latency),
+        os.environ['TABLE_USERUNITS']: FakeTable(units, latency),
+        os.environ['TABLE_CONNECTION_REQUESTS']: FakeTable(requests, latency),
+        os.environ['MEMBERS_TABLE']: FakeTable(members, latency)
+    }, latency)
+
+
+def run(iterations):
+    event = {'queryStringParameters': {'user_id': USER_ID}}
+    start = time.perf_counter()
+    for _ in range(iterations):
+        response = handler.lambda_handler(event, None)
+    elapsed = (time.perf_counter() - start) / iterations
+    return elapsed, json.loads(response['body'])
+
+
+def main():
+    building_count = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 10.0) / 1000
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    fake = make_fixture(building_count, latency)
+    handler.dynamodb = fake
+    batch_loader.dynamodb = fake
+
+    concurrent_executor = handler.sources_executor
+    handler.sources_executor = ThreadPoolExecutor(max_workers=1)
+    serial_s, serial_body = run(iterations)
+    handler.sources_executor = concurrent_executor
+    concurrent_s, body = run(iterations)
+
+    assert body == serial_body
+    print(f"{building_count} buildings: {len(body['connected_buildings'])} connected, "
+          f"{len(body['pending_requests'])} pending, {len(body['rejected_requests'])} rejected")
+    print(f"serial sources:     {serial_s * 1000:7.1f} ms/call")
+    print(f"concurrent sources: {concurrent_s * 1000:7.1f} ms/call  ({serial_s / concurrent_s:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare cold (full RS256 verify) and warm (verified-token cache hit) cost of
+common_utils.get_user_from_token. Signs tokens with a throwaway RSA key and
+serves it in place of the Cognito JWKS, so no network access is needed.
+Requires the `cryptography` package pinned in lambda_functions/requirements.txt.
+
+Usage: python project_utils/bench_token_verification.py [iterations]
+"""
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-south-1')
+os.environ.setdefault('USER_POOL_ID', 'ap-south-1_bench')
+os.environ.setdefault('COGNITO_CLIENT_ID', 'bench-client')
+
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+
+from common import common_utils  # noqa: E402
+import jwt  # noqa: E402
+
+
+class LocalJWKSClient:
+    """Stands in for PyJWKClient with an in-memory signing key"""
+
+    def __init__(self, public_key):
+        self.signing_key = jwt.PyJWK.from_dict(
+            {**jwt.algorithms.RSAAlgorithm.to_jwk(public_key, as_dict=True), 'kid': 'bench', 'alg': 'RS256'}
+        )
+
+    def get_signing_key_from_jwt(self, token):
+        return self.signing_key
+
+
+def make_token(private_key):
+    now = int(time.time())
+    claims = {
+        'sub': 'bench-sub',
+        'iss': common_utils.COGNITO_ISSUER,
+        'aud': common_utils.COGNITO_CLIENT_ID,
+        'token_use': 'id',
+        'cognito:username': '+919999999999',
+        'phone_number': '+919999999999',
+        'iat': now,
+        'exp': now + 3600
+    }
+    return jwt.encode(claims, private_key, algorithm='RS256', headers={'kid': 'bench'})
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    common_utils._jwks_client = LocalJWKSClient(private_key.public_key())
+
+    event = {'headers': {'Authorization': f"Bearer {make_token(private_key)}"}}
+    user, error = common_utils.get_user_from_token(event)
+    assert error is None and user['user_id'] == 'user_9999999999'
+
+    def cold():
+        common_utils._verified_tokens.clear()
+        common_utils.get_user_from_token(event)
+
+    def warm():
+        common_utils.get_user_from_token(event)
+
+    cold_s = timeit.timeit(cold, number=iterations) / iterations
+    warm_s = timeit.timeit(warm, number=iterations) / iterations
+    print(f"cold verify: {cold_s * 1e6:9.1f} us/call")
+    print(f"warm cache:  {warm_s * 1e6:9.1f} us/call  ({cold_s / warm_s:.0f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
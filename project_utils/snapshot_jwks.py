@@ -0,0 +1,41 @@
+"""
+Snapshot the Cognito user pool JWKS into lambda_functions/common/cognito_jwks.json
+so cold starts can verify tokens before the first JWKS fetch. Run before
+`sam build`; the snapshot is only a bootstrap and is replaced by the live set
+on the first background refresh.
+
+Usage: python project_utils/snapshot_jwks.py <user_pool_id> [output_path]
+"""
+import json
+import os
+import sys
+import urllib.request
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), '..', 'lambda_functions', 'common', 'cognito_jwks.json')
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    user_pool_id = sys.argv[1]
+    output_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_OUTPUT
+    region = user_pool_id.split('_')[0]
+    issuer = f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}"
+
+    with urllib.request.urlopen(f"{issuer}/.well-known/jwks.json", timeout=10) as response:
+        jwks = json.load(response)
+
+    if not jwks.get('keys'):
+        print("JWKS endpoint returned no keys; snapshot not written")
+        sys.exit(1)
+
+    with open(output_path, 'w') as f:
+        json.dump({'issuer': issuer, 'keys': jwks['keys']}, f, indent=2)
+
+    print(f"Wrote {len(jwks['keys'])} keys for {user_pool_id} to {output_path}")
+
+
+if __name__ == '__main__':
+    main()
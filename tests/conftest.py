@@ -0,0 +1,216 @@
+"""
+Shared fixtures. DynamoDB (and Cognito where needed) is served by moto,
+started before any handler module is imported so the module-level boto3
+resources talk to it. Tables are created from template.yaml.
+"""
+import os
+import sys
+
+import pytest
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda_functions'))
+# Vendored PyJWT, appended the same way common_utils does it
+sys.path.append(os.path.join(ROOT, 'lambda_functions', 'python'))
+
+TEST_ENV = {
+    'AWS_DEFAULT_REGION': 'ap-south-1',
+    'AWS_REGION': 'ap-south-1',
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'ENVIRONMENT': 'dev',
+    'USER_POOL_ID': 'ap-south-1_test',
+    'COGNITO_CLIENT_ID': 'test-client',
+    'PAGINATION_TOKEN_SECRET': 'test-pagination-secret',
+    'TABLE_BUILDINGS': 'Buildings-dev',
+    'TABLE_BUILDING_CODES': 'BuildingCodes-dev',
+    'TABLE_USERUNITS': 'UserUnits-dev',
+    'TABLE_USERS': 'Users-dev',
+    'USERS_TABLE': 'Users-dev',
+    'MEMBERS_TABLE': 'MembersTable-dev',
+    'BUILDING_MEMBERS_TABLE': 'BuildingMembers-dev',
+    'TABLE_CONNECTION_REQUESTS': 'ConnectionRequests-dev',
+    'TABLE_CONNECTION_REQUEST_HISTORY': 'ConnectionRequestHistory-dev',
+    'TABLE_USER_BUILDING_ROLES': 'UserBuildingRoles-dev',
+    'TABLE_MAINTENANCE': 'MaintenanceRecords-dev',
+    'TABLE_PAYMENT': 'PaymentRecords-dev',
+    'TABLE_UNIT_MAINTENANCE': 'UnitMaintenanceBills-dev',
+    'USER_UNITS_INDEX_STAGE': '4',
+    'UNIT_BILL_INDEX_STAGE': '3',
+}
+os.environ.update(TEST_ENV)
+
+from moto import mock_aws  # noqa: E402
+
+_aws = mock_aws()
+_aws.start()
+
+import boto3  # noqa: E402
+
+
+class TemplateLoader(yaml.SafeLoader):
+    pass
+
+
+class TemplateIf(list):
+    """!If [condition, when_true, when_false]"""
+
+
+def _intrinsic(loader, tag_suffix, node):
+    if isinstance(node, yaml.ScalarNode):
+        value = loader.construct_scalar(node)
+        return value.replace('${Environment}', 'dev') if tag_suffix == 'Sub' else value
+    if isinstance(node, yaml.SequenceNode):
+        values = loader.construct_sequence(node, deep=True)
+        return TemplateIf(values) if tag_suffix == 'If' else values
+    return loader.construct_mapping(node)
+
+
+TemplateLoader.add_multi_constructor('!', _intrinsic)
+
+
+def resolve_conditions(value):
+    """Tables as deployed at the final rollout stage: every condition holds"""
+    if isinstance(value, TemplateIf):
+        return resolve_conditions(value[1])
+    if isinstance(value, list):
+        resolved = [resolve_conditions(v) for v in value]
+        return [v for v in resolved if v != 'AWS::NoValue']
+    if isinstance(value, dict):
+        return {k: resolve_conditions(v) for k, v in value.items()}
+    return value
+
+
+def template_tables():
+    with open(os.path.join(ROOT, 'template.yaml')) as f:
+        template = yaml.load(f, Loader=TemplateLoader)
+    return {
+        name: resolve_conditions(resource['Properties'])
+        for name, resource in template['Resources'].items()
+        if resource['Type'] == 'AWS::DynamoDB::Table'
+    }
+
+
+TABLE_DEFINITIONS = template_tables()
+
+
+def create_table(properties):
+    kwargs = {
+        'TableName': properties['TableName'],
+        'AttributeDefinitions': properties['AttributeDefinitions'],
+        'KeySchema': properties['KeySchema'],
+        'BillingMode': 'PAY_PER_REQUEST',
+    }
+    if properties.get('GlobalSecondaryIndexes'):
+        kwargs['GlobalSecondaryIndexes'] = properties['GlobalSecondaryIndexes']
+    return boto3.resource('dynamodb').create_table(**kwargs)
+
+
+@pytest.fixture
+def tables():
+    """Every table in template.yaml, empty, keyed by its TableName"""
+    created = {props['TableName']: create_table(props) for props in TABLE_DEFINITIONS.values()}
+    yield created
+    for table in created.values():
+        table.delete()
+
+
+@pytest.fixture(autouse=True)
+def clear_container_caches():
+    """Each test starts like a cold container"""
+    yield
+    for module_name, cache_names in (
+        ('common.building_roles', ('_role_cache',)),
+        ('common.cognito_auth', ('_role_stamps',)),
+        ('common.common_utils', ('_verified_tokens',)),
+    ):
+        module = sys.modules.get(module_name)
+        for cache_name in cache_names:
+            if module is not None and hasattr(module, cache_name):
+                getattr(module, cache_name).clear()
+
+
+class CallCounter:
+    """Counts DynamoDB operations made through the given boto3 resources/clients"""
+
+    def __init__(self, *resources):
+        self.calls = []
+        self.clients = [r.meta.client if hasattr(r.meta, 'client') else r for r in resources]
+
+    def _record(self, model, params, **kwargs):
+        tables = [params['TableName']] if 'TableName' in params else list(params.get('RequestItems', {}))
+        self.calls.append((model.name, tables))
+
+    def __enter__(self):
+        for client in dict.fromkeys(self.clients):
+            client.meta.events.register('provide-client-params.dynamodb', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        for client in dict.fromkeys(self.clients):
+            client.meta.events.unregister('provide-client-params.dynamodb', self._record)
+
+    def count(self, operation, table_name=None):
+        return sum(
+            1 for name, tables in self.calls
+            if name == operation and (table_name is None or table_name in tables)
+        )
+
+
+@pytest.fixture
+def count_calls():
+    return CallCounter
+
+
+class TokenSigner:
+    """A throwaway RSA key standing in for one of the user pool's signing keys"""
+
+    def __init__(self, kid):
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        import jwt
+
+        self.kid = kid
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.jwk = {
+            **jwt.algorithms.RSAAlgorithm.to_jwk(self.private_key.public_key(), as_dict=True),
+            'kid': kid, 'alg': 'RS256', 'use': 'sig'
+        }
+
+    def token(self, **claims):
+        import time
+
+        import jwt
+        from common import common_utils
+
+        now = int(time.time())
+        payload = {
+            'sub': 'sub-1',
+            'iss': common_utils.COGNITO_ISSUER,
+            'aud': common_utils.COGNITO_CLIENT_ID,
+            'token_use': 'id',
+            'cognito:username': '+919999999999',
+            'phone_number': '+919999999999',
+            'iat': now,
+            'exp': now + 3600,
+            **claims
+        }
+        return jwt.encode(payload, self.private_key, algorithm='RS256', headers={'kid': self.kid})
+
+
+@pytest.fixture
+def token_signer():
+    return TokenSigner('test-key-1')
+
+
+@pytest.fixture
+def jwks_client(monkeypatch):
+    """Install a fresh per-container JWKS client; returns a factory taking the client"""
+    from common import common_utils
+
+    def install(client):
+        monkeypatch.setattr(common_utils, '_jwks_client', client)
+        return client
+
+    monkeypatch.setattr(common_utils, '_jwks_client', None)
+    return install
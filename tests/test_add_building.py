@@ -0,0 +1,36 @@
+import json
+
+from building import add_building
+
+
+def create(tables, name='Sunrise Heights'):
+    tables['Users-dev'].put_item(Item={'user_id': 'user_9876543210', 'name': 'Admin'})
+    response = add_building.lambda_handler({'body': json.dumps({
+        'name': name,
+        'user_id': 'user_9876543210',
+        'wings': ['A'],
+        'wing_details': {'A': {'total_floors': 2, 'units_per_floor': 2}}
+    })}, None)
+    assert response['statusCode'] == 200, response
+    return json.loads(response['body'])['building_info']
+
+
+def test_reservation_lives_outside_buildings(tables):
+    info = create(tables)
+
+    buildings = tables['Buildings-dev'].scan()['Items']
+    assert [b['building_id'] for b in buildings] == [info['building_id']]
+
+    reservation = tables['BuildingCodes-dev'].get_item(Key={'building_code': info['building_code']})['Item']
+    assert reservation['building_id'] == info['building_id']
+
+
+def test_reserved_code_is_not_reused(tables, monkeypatch):
+    first = create(tables)
+    # Force the same first candidate for the second building
+    monkeypatch.setattr(add_building, 'generate_building_code', lambda name, building_id: first['building_code'])
+
+    second = create(tables)
+
+    assert second['building_code'] != first['building_code']
+    assert len(tables['BuildingCodes-dev'].scan()['Items']) == 2
@@ -0,0 +1,35 @@
+import importlib.util
+import os
+
+from conftest import ROOT
+
+spec = importlib.util.spec_from_file_location(
+    'archive_connection_requests', os.path.join(ROOT, 'project_utils', 'archive_connection_requests.py')
+)
+archiver = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(archiver)
+
+
+def test_resubmitted_rejection_is_archived(tables, tmp_path):
+    request_id = 'REQ-0000000000000001'
+    tables['ConnectionRequests-dev'].put_item(Item={
+        'request_id': request_id, 'user_id': 'user_9876543210', 'building_id': 'BLD-1',
+        'status': 'pending', 'requested_at': '2026-09-10T00:00:00', 'updated_at': '2026-09-10T00:00:00'
+    })
+    tables['ConnectionRequestHistory-dev'].put_item(Item={
+        'history_id': f"{request_id}#2026-08-05T00:00:00", 'request_id': request_id,
+        'user_id': 'user_9876543210', 'building_id': 'BLD-1', 'status': 'rejected',
+        'requested_at': '2026-08-01T00:00:00', 'rejected_at': '2026-08-05T00:00:00',
+        'updated_at': '2026-08-05T00:00:00', 'superseded_at': '2026-09-10T00:00:00'
+    })
+
+    for table_name, key_name in (('ConnectionRequests-dev', 'request_id'),
+                                 ('ConnectionRequestHistory-dev', 'history_id')):
+        archiver.archive_table(tables[table_name], key_name, '2026-10', str(tmp_path))
+
+    rows = list(archiver.read_archive(str(tmp_path)))
+    assert [(row['request_id'], row['status']) for row in rows] == [(request_id, 'rejected')]
+    assert 'history_id' not in rows[0]
+    assert tables['ConnectionRequestHistory-dev'].scan()['Items'] == []
+    # The open resubmission stays put
+    assert tables['ConnectionRequests-dev'].get_item(Key={'request_id': request_id})['Item']['status'] == 'pending'
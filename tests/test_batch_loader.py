@@ -0,0 +1,149 @@
+import json
+
+import pytest
+
+from common import batch_loader
+
+
+def put_buildings(table, count):
+    with table.batch_writer() as writer:
+        for i in range(count):
+            writer.put_item(Item={
+                'building_id': f"BLD-{i:03d}",
+                'building_name': f"Tower {i}",
+                'building_code': f"TWR{i:03d}",
+                'user_id': 'owner_1'
+            })
+
+
+def test_load_buildings_chunks_and_dedupes(tables, count_calls):
+    put_buildings(tables['Buildings-dev'], 150)
+    ids = [f"BLD-{i:03d}" for i in range(150)] * 2 + ['BLD-MISSING', None, '']
+
+    with count_calls(batch_loader.dynamodb) as calls:
+        buildings = batch_loader.load_buildings(ids, 'Buildings-dev')
+
+    assert len(buildings) == 150
+    assert buildings['BLD-042']['building_name'] == 'Tower 42'
+    assert 'BLD-MISSING' not in buildings
+    # 151 unique ids -> two BatchGetItem calls of at most 100 keys
+    assert calls.count('BatchGetItem') == 2
+    assert calls.count('GetItem') == 0
+
+
+def test_load_buildings_with_no_ids_makes_no_calls(tables, count_calls):
+    with count_calls(batch_loader.dynamodb) as calls:
+        assert batch_loader.load_buildings([], 'Buildings-dev') == {}
+    assert calls.calls == []
+
+
+def test_get_my_units_loads_buildings_in_one_batch(tables, count_calls):
+    from unit import get_my_units
+
+    put_buildings(tables['Buildings-dev'], 30)
+    with tables['UserUnits-dev'].batch_writer() as writer:
+        for i in range(30):
+            writer.put_item(Item={
+                'unit_id': f"UNIT-{i}", 'user_id': 'user_1', 'building_id': f"BLD-{i:03d}",
+                'wings': 'A', 'floor': 1, 'unit_number': '101', 'status': 'active'
+            })
+    with tables['UserBuildingRoles-dev'].batch_writer() as writer:
+        for i in range(30):
+            writer.put_item(Item={
+                'user_building_composite': f"user_1#BLD-{i:03d}", 'user_id': 'user_1',
+                'building_id': f"BLD-{i:03d}", 'role': 'member'
+            })
+
+    with count_calls(batch_loader.dynamodb, get_my_units.dynamodb) as calls:
+        response = get_my_units.lambda_handler({'queryStringParameters': {'user_id': 'user_1'}}, None)
+
+    body = json.loads(response['body'])
+    assert response['statusCode'] == 200
+    assert body['count'] == 30
+    assert calls.count('BatchGetItem', 'Buildings-dev') == 1
+    assert calls.count('GetItem', 'Buildings-dev') == 0
+
+
+def test_get_user_building_loads_connected_buildings_in_one_batch(tables, count_calls):
+    from building import get_user_building
+
+    put_buildings(tables['Buildings-dev'], 25)
+    with tables['UserBuildingRoles-dev'].batch_writer() as writer:
+        for i in range(25):
+            writer.put_item(Item={
+                'user_building_composite': f"user_1#BLD-{i:03d}", 'user_id': 'user_1',
+                'building_id': f"BLD-{i:03d}", 'role': 'member'
+            })
+
+    with count_calls(batch_loader.dynamodb, get_user_building.dynamodb) as calls:
+        response = get_user_building.lambda_handler({'queryStringParameters': {'user_id': 'user_1'}}, None)
+
+    body = json.loads(response['body'])
+    assert body['connected_count'] == 25
+    assert calls.count('BatchGetItem', 'Buildings-dev') == 1
+    assert calls.count('GetItem', 'Buildings-dev') == 0
+
+
+def test_get_user_connected_buildings_loads_buildings_in_one_batch(tables, count_calls):
+    from connections import get_user_connected_buildings
+
+    put_buildings(tables['Buildings-dev'], 24)
+    with tables['UserUnits-dev'].batch_writer() as writer:
+        for i in range(20):
+            writer.put_item(Item={
+                'unit_id': f"UNIT-{i}", 'user_id': 'user_1', 'building_id': f"BLD-{i:03d}",
+                'wings': 'A', 'floor': 1, 'unit_number': '101', 'status': 'active',
+                'assigned_at': '2026-01-01T00:00:00'
+            })
+    with tables['ConnectionRequests-dev'].batch_writer() as writer:
+        for i in range(20, 24):
+            writer.put_item(Item={
+                'request_id': f"REQ-{i}", 'user_id': 'user_1', 'building_id': f"BLD-{i:03d}",
+                'wing': 'A', 'floor': '2', 'unit_number': '201',
+                'status': 'pending' if i % 2 else 'rejected', 'requested_at': '2026-01-01T00:00:00'
+            })
+
+    with count_calls(batch_loader.dynamodb, get_user_connected_buildings.dynamodb) as calls:
+        response = get_user_connected_buildings.lambda_handler(
+            {'queryStringParameters': {'user_id': 'user_1'}}, None
+        )
+
+    body = json.loads(response['body'])
+    assert len(body['connected_buildings']) == 20
+    assert len(body['pending_requests']) == 2
+    assert len(body['rejected_requests']) == 2
+    assert calls.count('BatchGetItem', 'Buildings-dev') == 1
+    assert calls.count('GetItem', 'Buildings-dev') == 0
+
+
+def always_throttled(RequestItems):
+    return {'Responses': {}, 'UnprocessedKeys': RequestItems}
+
+
+def test_leftover_unprocessed_keys_raise(monkeypatch):
+    monkeypatch.setattr(batch_loader.dynamodb, 'batch_get_item', always_throttled)
+    monkeypatch.setattr(batch_loader.time, 'sleep', lambda seconds: None)
+
+    with pytest.raises(batch_loader.UnprocessedKeysError) as excinfo:
+        batch_loader.load_buildings(['BLD-001', 'BLD-002'], 'Buildings-dev')
+
+    assert excinfo.value.unprocessed_keys['Buildings-dev']['Keys'] == [
+        {'building_id': 'BLD-001'}, {'building_id': 'BLD-002'}
+    ]
+
+
+def test_throttled_payment_validation_is_not_a_404(tables, monkeypatch):
+    from payment import payment_processing
+
+    tables['Users-dev'].put_item(Item={'user_id': 'user_1'})
+    monkeypatch.setattr(batch_loader.dynamodb, 'batch_get_item', always_throttled)
+    monkeypatch.setattr(batch_loader.time, 'sleep', lambda seconds: None)
+
+    response = payment_processing.lambda_handler({
+        'httpMethod': 'POST',
+        'path': '/payment/process',
+        'body': json.dumps({'payment_method': 'cash', 'user_id': 'user_1', 'building_id': 'BLD-1',
+                            'amount': 100, 'maintenance_id': 'MAINT-1'})
+    }, None)
+
+    assert response['statusCode'] == 503
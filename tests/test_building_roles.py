@@ -0,0 +1,47 @@
+from common import building_roles
+
+
+def put_role(table, user_id, building_id, role):
+    table.put_item(Item={
+        'user_building_composite': building_roles.composite_key(user_id, building_id),
+        'user_id': user_id,
+        'building_id': building_id,
+        'role': role
+    })
+
+
+def test_found_role_is_cached(tables, count_calls):
+    put_role(tables['UserBuildingRoles-dev'], 'user_1', 'BLD-1', 'admin')
+
+    with count_calls(building_roles.dynamodb) as calls:
+        assert building_roles.check_user_is_admin('user_1', 'BLD-1')
+        assert building_roles.check_user_has_any_role('user_1', 'BLD-1')
+        assert not building_roles.check_user_is_member('user_1', 'BLD-1')
+
+    assert calls.count('GetItem') == 1
+
+
+def test_miss_is_not_cached(tables):
+    assert building_roles.get_user_role('user_1', 'BLD-1') is None
+
+    # Granted by another function, whose invalidation never reaches this container
+    put_role(tables['UserBuildingRoles-dev'], 'user_1', 'BLD-1', 'member')
+
+    assert building_roles.get_user_role('user_1', 'BLD-1') == 'member'
+
+
+def test_invalidate_drops_cached_role(tables):
+    table = tables['UserBuildingRoles-dev']
+    put_role(table, 'user_1', 'BLD-1', 'member')
+    put_role(table, 'user_1', 'BLD-2', 'member')
+    assert building_roles.get_user_role('user_1', 'BLD-1') == 'member'
+    assert building_roles.get_user_role('user_1', 'BLD-2') == 'member'
+
+    put_role(table, 'user_1', 'BLD-1', 'admin')
+    put_role(table, 'user_1', 'BLD-2', 'admin')
+    building_roles.invalidate_user_role('user_1', 'BLD-1')
+    assert building_roles.get_user_role('user_1', 'BLD-1') == 'admin'
+    assert building_roles.get_user_role('user_1', 'BLD-2') == 'member'
+
+    building_roles.invalidate_user_role('user_1')
+    assert building_roles.get_user_role('user_1', 'BLD-2') == 'admin'
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from common import request_processing
+from connections import bulk_process_connection_requests as bulk_process
+
+ADMIN = {'user_id': 'user_admin'}
+
+
+@pytest.fixture
+def requests_table(tables, monkeypatch):
+    monkeypatch.setattr(bulk_process, 'get_caller_roles', lambda event: (ADMIN, {'BLD-1': 'admin'}, None))
+    table = tables['ConnectionRequests-dev']
+    # One resident asking for two flats in the same building
+    for request_id, unit_number in (('REQ-1', '101'), ('REQ-2', '102')):
+        table.put_item(Item={
+            'request_id': request_id, 'user_id': 'user_9000000001', 'user_name': 'Resident',
+            'user_mobile': '9000000001', 'building_id': 'BLD-1', 'wing': 'A', 'floor': '1',
+            'unit_number': unit_number, 'status': 'pending', 'requested_at': '2026-10-01T00:00:00'
+        })
+    return table
+
+
+def approve(request_ids):
+    response = bulk_process.lambda_handler({'body': json.dumps({
+        'action': 'approve', 'request_ids': request_ids
+    })}, None)
+    return json.loads(response['body'])
+
+
+def test_same_user_and_building_are_all_approved(requests_table, tables):
+    body = approve(['REQ-1', 'REQ-2'])
+
+    assert body['summary'] == {'approved': 2}
+    assert len(tables['UserUnits-dev'].scan()['Items']) == 2
+
+
+def test_conflicting_transaction_is_retried(requests_table, monkeypatch):
+    client = request_processing.dynamodb.meta.client
+    real_transact = client.transact_write_items
+    conflicts = []
+
+    def conflict_once(**kwargs):
+        if not conflicts:
+            conflicts.append(True)
+            raise ClientError({
+                'Error': {'Code': 'TransactionCanceledException', 'Message': 'Transaction cancelled'},
+                'CancellationReasons': [{'Code': 'None'}, {'Code': 'None'}, {'Code': 'TransactionConflict'}]
+            }, 'TransactWriteItems')
+        return real_transact(**kwargs)
+
+    monkeypatch.setattr(client, 'transact_write_items', conflict_once)
+
+    assert approve(['REQ-1'])['summary'] == {'approved': 1}
+    assert conflicts == [True]
@@ -0,0 +1,145 @@
+import json
+
+import boto3
+import pytest
+
+from auth import bulk_register
+from common import building_roles
+from common.pagination import encode_next_token
+
+BUILDING_ID = 'BLD-1'
+
+
+@pytest.fixture
+def user_pool(tables, monkeypatch):
+    pool_id = boto3.client('cognito-idp').create_user_pool(PoolName='residents')['UserPool']['Id']
+    monkeypatch.setattr(bulk_register, 'USER_POOL_ID', pool_id)
+    monkeypatch.setattr(
+        bulk_register, 'authorize_building',
+        lambda event, building_id, allowed_roles: ({'user_id': 'user_admin'}, 'admin', None)
+    )
+    return pool_id
+
+
+def resident(mobile, role='member', name=None):
+    return {'name': name or f"Resident {mobile}", 'mobile': mobile, 'password': 'Secret#123', 'role': role}
+
+
+def register(residents, checkpoint=None, context=None):
+    body = {'building_id': BUILDING_ID, 'residents': residents}
+    if checkpoint:
+        body['checkpoint'] = checkpoint
+    response = bulk_register.lambda_handler({'body': json.dumps(body)}, context)
+    assert response['statusCode'] == 200, response
+    return json.loads(response['body'])
+
+
+def role_key(mobile):
+    return {'user_building_composite': building_roles.composite_key(f"user_{mobile}", BUILDING_ID)}
+
+
+def test_import_creates_cognito_users_and_records(user_pool, tables):
+    body = register([resident('9000000001'), resident('9000000002', role='Admin')])
+
+    assert body['summary'] == {'created': 2}
+    cognito = boto3.client('cognito-idp')
+    assert cognito.admin_get_user(UserPoolId=user_pool, Username='+919000000001')['UserStatus'] == 'CONFIRMED'
+    assert tables['Users-dev'].get_item(Key={'user_id': 'user_9000000001'})['Item']['name'] == 'Resident 9000000001'
+    assert tables['UserBuildingRoles-dev'].get_item(Key=role_key('9000000002'))['Item']['role'] == 'admin'
+
+
+def test_reimport_keeps_attributes_it_does_not_set(user_pool, tables):
+    tables['Users-dev'].put_item(Item={
+        'user_id': 'user_9000000001', 'name': 'Old Name', 'mobile': '9000000001',
+        'status': 'active', 'created_at': '2025-01-01T00:00:00', 'last_login': '2026-10-01T08:00:00'
+    })
+    tables['UserBuildingRoles-dev'].put_item(Item={
+        **role_key('9000000001'), 'user_id': 'user_9000000001', 'building_id': BUILDING_ID, 'role': 'member',
+        'created_at': '2025-01-01T00:00:00', 'approved_by': 'user_admin', 'wing': 'A', 'floor': '3',
+        'unit_number': '301'
+    })
+
+    assert register([resident('9000000001', name='New Name')])['summary'] == {'created': 1}
+
+    user = tables['Users-dev'].get_item(Key={'user_id': 'user_9000000001'})['Item']
+    assert (user['name'], user['last_login'], user['created_at']) == (
+        'New Name', '2026-10-01T08:00:00', '2025-01-01T00:00:00'
+    )
+    # The role did not change, so tokens need no refresh
+    assert 'roles_updated_at' not in user
+    role = tables['UserBuildingRoles-dev'].get_item(Key=role_key('9000000001'))['Item']
+    assert (role['approved_by'], role['wing'], role['floor'], role['unit_number']) == ('user_admin', 'A', '3', '301')
+
+
+def test_role_change_invalidates_cached_role_and_tokens(user_pool, tables):
+    register([resident('9000000001', role='admin')])
+    assert building_roles.get_user_role('user_9000000001', BUILDING_ID) == 'admin'
+
+    register([resident('9000000001', role='member')])
+
+    assert building_roles.get_user_role('user_9000000001', BUILDING_ID) == 'member'
+    user = tables['Users-dev'].get_item(Key={'user_id': 'user_9000000001'})['Item']
+    assert user['roles_updated_at'] > 0
+
+
+def test_unknown_role_is_invalid(user_pool, tables):
+    body = register([resident('9000000001', role='superuser'), resident('9000000002')])
+
+    assert body['summary'] == {'invalid': 1, 'created': 1}
+    assert body['results'][0]['error'].startswith('Role must be one of')
+    assert 'Item' not in tables['UserBuildingRoles-dev'].get_item(Key=role_key('9000000001'))
+
+
+def test_resumed_import_still_sees_duplicates_before_the_checkpoint(user_pool, tables):
+    residents = [resident('9000000001'), resident('9000000002'), resident('9000000001', name='Someone Else')]
+    checkpoint = encode_next_token({
+        'offset': 2, 'digest': bulk_register.residents_digest(BUILDING_ID, residents)
+    })
+
+    body = register(residents, checkpoint=checkpoint)
+
+    assert body['results'] == [{'row': 2, 'status': 'invalid', 'error': 'Duplicate mobile in this import'}]
+    assert 'Item' not in tables['Users-dev'].get_item(Key={'user_id': 'user_9000000001'})
+
+
+class ShortOnTime:
+    def get_remaining_time_in_millis(self):
+        return 1000
+
+
+def test_checkpoint_when_out_of_time(user_pool):
+    residents = [resident(f"90000000{i:02d}") for i in range(3)]
+
+    body = register(residents, context=ShortOnTime())
+    assert body['results'] == [] and body['checkpoint']
+
+    resumed = register(residents, checkpoint=body['checkpoint'])
+    assert resumed['summary'] == {'created': 3} and resumed['checkpoint'] is None
+
+
+def test_existing_account_only_gets_the_role(user_pool, tables):
+    cognito = boto3.client('cognito-idp')
+    client_id = cognito.create_user_pool_client(
+        UserPoolId=user_pool, ClientName='app', ExplicitAuthFlows=['ALLOW_ADMIN_USER_PASSWORD_AUTH']
+    )['UserPoolClient']['ClientId']
+    cognito.admin_create_user(
+        UserPoolId=user_pool, Username='+919000000001', MessageAction='SUPPRESS',
+        UserAttributes=[{'Name': 'name', 'Value': 'Owner'}]
+    )
+    cognito.admin_set_user_password(
+        UserPoolId=user_pool, Username='+919000000001', Password='Owner#456', Permanent=True
+    )
+    tables['Users-dev'].put_item(Item={'user_id': 'user_9000000001', 'name': 'Owner', 'mobile': '9000000001'})
+
+    body = register([resident('9000000001', name='Intruder')])
+
+    assert body['summary'] == {'exists': 1}
+    # The owner's password still works and the profile is unchanged
+    cognito.admin_initiate_auth(
+        UserPoolId=user_pool, ClientId=client_id, AuthFlow='ADMIN_USER_PASSWORD_AUTH',
+        AuthParameters={'USERNAME': '+919000000001', 'PASSWORD': 'Owner#456'}
+    )
+    attributes = cognito.admin_get_user(UserPoolId=user_pool, Username='+919000000001')['UserAttributes']
+    assert {'Name': 'name', 'Value': 'Owner'} in attributes
+    assert tables['Users-dev'].get_item(Key={'user_id': 'user_9000000001'})['Item']['name'] == 'Owner'
+    assert tables['UserBuildingRoles-dev'].get_item(Key=role_key('9000000001'))['Item']['role'] == 'member'
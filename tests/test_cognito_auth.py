@@ -0,0 +1,56 @@
+import jwt
+import pytest
+
+from common import building_roles, cognito_auth, common_utils
+
+
+@pytest.fixture
+def caller(tables, token_signer, jwks_client):
+    jwks_client(jwt.PyJWKClient(common_utils.COGNITO_JWKS_URL, seed_jwk_set={'keys': [token_signer.jwk]}))
+    return token_signer
+
+
+def event_for(signer, **claims):
+    token = signer.token(building_roles='{"BLD-1":"a"}', **claims)
+    return {'headers': {'Authorization': f"Bearer {token}"}}
+
+
+def test_claim_authorizes_without_role_lookup(caller, tables, count_calls):
+    with count_calls(cognito_auth.dynamodb, building_roles.dynamodb) as calls:
+        user, role, error = cognito_auth.authorize_building(event_for(caller), 'BLD-1', allowed_roles=('admin',))
+
+    assert error is None and role == 'admin'
+    assert calls.count('GetItem', 'UserBuildingRoles-dev') == 0
+    assert calls.count('Query', 'UserBuildingRoles-dev') == 0
+
+
+def test_token_minted_in_the_second_of_a_role_change_must_refresh(caller, tables):
+    event = event_for(caller, iat=1_700_000_100)
+    tables['Users-dev'].put_item(Item={'user_id': 'user_9999999999', 'roles_updated_at': 1_700_000_100})
+
+    _, _, error = cognito_auth.authorize_building(event, 'BLD-1')
+
+    assert error['statusCode'] == 401
+
+
+def test_token_older_than_role_change_must_refresh(caller, tables):
+    event = event_for(caller, iat=1_700_000_000)
+    tables['Users-dev'].put_item(Item={'user_id': 'user_9999999999', 'roles_updated_at': 1_700_000_100})
+
+    _, _, error = cognito_auth.authorize_building(event, 'BLD-1')
+
+    assert error['statusCode'] == 401
+
+
+def test_unreadable_role_stamp_falls_back_to_role_table(caller, tables, monkeypatch):
+    def broken_table(name):
+        raise RuntimeError('DynamoDB unavailable')
+
+    monkeypatch.setattr(cognito_auth.dynamodb, 'Table', broken_table)
+
+    # The claim says admin, but without the stamp it cannot be trusted and
+    # UserBuildingRoles has no role for the caller
+    _, _, error = cognito_auth.authorize_building(event_for(caller), 'BLD-1')
+
+    assert error['statusCode'] == 403
+    assert cognito_auth.get_roles_updated_at('user_9999999999') is None
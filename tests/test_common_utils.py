@@ -0,0 +1,40 @@
+import jwt
+
+from common import common_utils
+
+
+def bearer(token):
+    return {'headers': {'Authorization': f"Bearer {token}"}}
+
+
+def test_verified_claims_are_copied_out_of_the_cache(token_signer, jwks_client):
+    jwks_client(jwt.PyJWKClient(common_utils.COGNITO_JWKS_URL, seed_jwk_set={'keys': [token_signer.jwk]}))
+    event = bearer(token_signer.token())
+
+    user, error = common_utils.get_user_from_token(event)
+    assert error is None and user['user_id'] == 'user_9999999999'
+    user['claims']['custom:role'] = 'admin'
+
+    again, _ = common_utils.get_user_from_token(event)
+    assert again['role'] is None
+    assert 'custom:role' not in again['claims']
+    again['claims']['sub'] = 'someone-else'
+
+    assert common_utils.get_user_from_token(event)[0]['sub'] == 'sub-1'
+
+
+def test_nested_cached_claims_are_copied(token_signer, jwks_client):
+    jwks_client(jwt.PyJWKClient(common_utils.COGNITO_JWKS_URL, seed_jwk_set={'keys': [token_signer.jwk]}))
+    token = token_signer.token(**{'cognito:groups': ['residents']})
+
+    common_utils.verify_cognito_token(token)['cognito:groups'].append('admins')
+
+    assert common_utils.verify_cognito_token(token)['cognito:groups'] == ['residents']
+
+
+def test_token_for_another_client_is_rejected(token_signer, jwks_client):
+    jwks_client(jwt.PyJWKClient(common_utils.COGNITO_JWKS_URL, seed_jwk_set={'keys': [token_signer.jwk]}))
+
+    user, error = common_utils.get_user_from_token(bearer(token_signer.token(aud='other-client')))
+
+    assert user is None and error['statusCode'] == 401
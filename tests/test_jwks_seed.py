@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+
+from common import common_utils
+from conftest import TokenSigner
+
+
+class JWKSServer:
+    """Local stand-in for the user pool's /.well-known/jwks.json"""
+
+    def __init__(self):
+        self.keys = []
+        self.fetches = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.fetches += 1
+                body = json.dumps({'keys': server.keys}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/.well-known/jwks.json"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def jwks_server(monkeypatch, jwks_client):
+    server = JWKSServer()
+    monkeypatch.setattr(common_utils, 'COGNITO_JWKS_URL', server.url)
+    yield server
+    server.close()
+
+
+def seed_with(monkeypatch, *signers, issuer=None):
+    seed = {'issuer': issuer or common_utils.COGNITO_ISSUER, 'keys': [s.jwk for s in signers]}
+    monkeypatch.setenv('COGNITO_JWKS_JSON', json.dumps(seed))
+
+
+def verify(signer):
+    return common_utils.verify_cognito_token(signer.token())
+
+
+def test_seed_verifies_with_jwks_endpoint_down(monkeypatch, jwks_client, token_signer):
+    # Nothing listens on port 1: any fetch fails
+    monkeypatch.setattr(common_utils, 'COGNITO_JWKS_URL', 'http://127.0.0.1:1/.well-known/jwks.json')
+    seed_with(monkeypatch, token_signer)
+
+    assert verify(token_signer)['sub'] == 'sub-1'
+
+    # A kid the seed does not know still needs the endpoint
+    with pytest.raises(jwt.PyJWKClientError):
+        verify(TokenSigner('unknown-key'))
+
+
+def test_seed_for_another_pool_is_ignored(monkeypatch, jwks_server, token_signer):
+    jwks_server.keys = [token_signer.jwk]
+    seed_with(monkeypatch, token_signer, issuer='https://cognito-idp.ap-south-1.amazonaws.com/ap-south-1_other')
+
+    assert verify(token_signer)['sub'] == 'sub-1'
+    assert jwks_server.fetches == 1
+
+
+def test_key_rotated_in_after_snapshot_is_fetched_once(monkeypatch, jwks_server, token_signer):
+    rotated = TokenSigner('test-key-2')
+    seed_with(monkeypatch, token_signer)
+    jwks_server.keys = [token_signer.jwk, rotated.jwk]
+
+    assert verify(rotated)['sub'] == 'sub-1'
+    assert jwks_server.fetches == 1
+
+    # The live set now serves both keys without another fetch
+    assert verify(token_signer)['sub'] == 'sub-1'
+    assert verify(rotated)['sub'] == 'sub-1'
+    assert jwks_server.fetches == 1
+
+
+def test_unknown_kids_do_not_hammer_the_endpoint(monkeypatch, jwks_server, token_signer):
+    seed_with(monkeypatch, token_signer)
+    jwks_server.keys = [token_signer.jwk]
+
+    for i in range(5):
+        with pytest.raises(jwt.PyJWKClientError):
+            verify(TokenSigner(f"forged-{i}"))
+
+    # One forced refresh, then the min_refresh_interval rate limit holds
+    assert jwks_server.fetches == 1
+
+
+def test_kid_miss_does_not_wait_on_a_frozen_background_refresh(monkeypatch, jwks_server, token_signer):
+    rotated = TokenSigner('test-key-2')
+    seed_with(monkeypatch, token_signer)
+    jwks_server.keys = [token_signer.jwk, rotated.jwk]
+    client = common_utils.get_jwks_client()
+
+    # A background refresh started in an earlier invocation and frozen with
+    # the sandbox: it holds the fetch lock and never finishes
+    def frozen_refresh():
+        if client._refreshing:
+            return
+        client._fetch_lock.acquire()
+        client._refreshing = True
+        client._refresh_done = threading.Event()
+
+    monkeypatch.setattr(client, '_refresh_in_background', frozen_refresh)
+
+    started = time.monotonic()
+    assert verify(rotated)['sub'] == 'sub-1'
+
+    assert time.monotonic() - started < 3 * client.refresh_wait
+    assert jwks_server.fetches == 1
@@ -0,0 +1,50 @@
+"""
+Import-time budget for the vendored jwt package, measured in a fresh
+interpreter with `python -X importtime`. cryptography must only load when
+an asymmetric algorithm is first used.
+"""
+import os
+import subprocess
+import sys
+
+VENDORED_PACKAGES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'lambda_functions', 'python')
+IMPORT_BUDGET_MS = 60
+RUNS = 5
+
+
+def import_profile(code='import jwt'):
+    """Return {module: cumulative microseconds} for a fresh `python -c code`"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=VENDORED_PACKAGES, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative_us, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        if cumulative_us.isdigit():
+            modules[name] = int(cumulative_us)
+    return modules
+
+
+def imports_cryptography(modules):
+    return any(m == 'cryptography' or m.startswith('cryptography.') for m in modules)
+
+
+def test_import_stays_within_budget_without_cryptography():
+    timings = []
+    for _ in range(RUNS):
+        modules = import_profile()
+        assert not imports_cryptography(modules), 'import jwt pulled in cryptography'
+        timings.append(modules['jwt'] / 1000)
+
+    # Best of several runs, so a noisy neighbour does not fail the build
+    assert min(timings) <= IMPORT_BUDGET_MS, f"import jwt took {min(timings):.1f} ms"
+
+
+def test_cryptography_loads_on_first_rs256_use():
+    modules = import_profile("import jwt; jwt.get_algorithm_by_name('RS256')")
+
+    assert imports_cryptography(modules)
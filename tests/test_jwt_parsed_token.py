@@ -0,0 +1,40 @@
+import jwt
+import pytest
+
+
+def test_decoding_a_parsed_token_twice_returns_independent_claims(token_signer):
+    parsed = jwt.parse(token_signer.token())
+    key = jwt.PyJWK.from_dict(token_signer.jwk).key
+
+    first = jwt.decode(parsed, key=key, algorithms=['RS256'], options={'verify_aud': False})
+    first['sub'] = 'tampered'
+    first['exp'] = 0
+
+    second = jwt.decode_complete(parsed, key=key, algorithms=['RS256'], options={'verify_aud': False})
+
+    assert second['payload']['sub'] == 'sub-1'
+    assert second['payload'] is not first
+    assert parsed.claims['sub'] == 'sub-1'
+
+
+def test_cached_claims_are_still_validated(token_signer):
+    parsed = jwt.parse(token_signer.token(aud='client-a'))
+    key = jwt.PyJWK.from_dict(token_signer.jwk).key
+
+    assert jwt.decode(parsed, key=key, algorithms=['RS256'], audience='client-a')['aud'] == 'client-a'
+    with pytest.raises(jwt.InvalidAudienceError):
+        jwt.decode(parsed, key=key, algorithms=['RS256'], audience='client-b')
+
+
+def test_nested_claims_are_not_shared(token_signer):
+    parsed = jwt.parse(token_signer.token(**{'cognito:groups': ['residents'], 'building_roles': {'BLD-1': 'm'}}))
+    key = jwt.PyJWK.from_dict(token_signer.jwk).key
+
+    first = jwt.decode(parsed, key=key, algorithms=['RS256'], options={'verify_aud': False})
+    first['cognito:groups'].append('admins')
+    first['building_roles']['BLD-1'] = 'a'
+
+    second = jwt.decode(parsed, key=key, algorithms=['RS256'], options={'verify_aud': False})
+
+    assert second['cognito:groups'] == ['residents']
+    assert second['building_roles'] == {'BLD-1': 'm'}
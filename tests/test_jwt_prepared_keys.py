@@ -0,0 +1,22 @@
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import prepared_key_cache
+
+
+def test_only_public_verification_keys_are_cached():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    prepared_key_cache.clear()
+
+    token = jwt.encode({'sub': 'user'}, private_pem, algorithm='RS256')
+    assert not prepared_key_cache._entries
+
+    assert jwt.decode(token, public_pem, algorithms=['RS256']) == {'sub': 'user'}
+    assert [key for _, key in prepared_key_cache._entries] == [public_pem]
+    prepared_key_cache.clear()
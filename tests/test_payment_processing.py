@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from payment import payment_processing
+
+
+@pytest.fixture
+def bills(tables):
+    tables['Users-dev'].put_item(Item={'user_id': 'user_1'})
+    tables['MembersTable-dev'].put_item(Item={'user_id': 'user_1', 'building_id': 'BLD-1'})
+    tables['MaintenanceRecords-dev'].put_item(Item={
+        'maintenance_id': 'MAINT-1', 'building_id': 'BLD-1', 'status': 'unpaid'
+    })
+    tables['UnitMaintenanceBills-dev'].put_item(Item={
+        'unit_maintenance_id': 'UMB-1', 'maintenance_id': 'MAINT-1', 'building_id': 'BLD-1',
+        'status': 'unpaid', 'unpaid_building_id': 'BLD-1'
+    })
+    return tables
+
+
+def pay(**fields):
+    body = {'payment_method': 'cash', 'user_id': 'user_1', 'building_id': 'BLD-1', 'amount': 1500, **fields}
+    response = payment_processing.lambda_handler(
+        {'httpMethod': 'POST', 'path': '/payment/process', 'body': json.dumps(body)}, None
+    )
+    return response['statusCode'], json.loads(response['body'])
+
+
+def status(table, key):
+    return table.get_item(Key=key)['Item'].get('status')
+
+
+def test_unit_payment_marks_only_the_unit_bill(bills):
+    code, _ = pay(maintenance_id='MAINT-1', unit_maintenance_id='UMB-1')
+
+    assert code == 201
+    assert status(bills['UnitMaintenanceBills-dev'], {'unit_maintenance_id': 'UMB-1'}) == 'paid'
+    assert status(bills['MaintenanceRecords-dev'], {'maintenance_id': 'MAINT-1'}) == 'unpaid'
+
+    # Another unit's payment against the same maintenance record still goes through
+    bills['UnitMaintenanceBills-dev'].put_item(Item={
+        'unit_maintenance_id': 'UMB-2', 'maintenance_id': 'MAINT-1', 'building_id': 'BLD-1', 'status': 'unpaid'
+    })
+    code, _ = pay(maintenance_id='MAINT-1', unit_maintenance_id='UMB-2')
+    assert code == 201
+
+
+def test_maintenance_payment_without_unit_bill(bills):
+    code, _ = pay(maintenance_id='MAINT-1')
+
+    assert code == 201
+    assert status(bills['MaintenanceRecords-dev'], {'maintenance_id': 'MAINT-1'}) == 'paid'
+
+
+def test_second_payment_is_already_paid(bills):
+    assert pay(unit_maintenance_id='UMB-1')[0] == 201
+
+    code, body = pay(unit_maintenance_id='UMB-1')
+
+    assert code == 409
+    assert body['reason'] == 'UNIT_MAINTENANCE_ALREADY_PAID'
+    assert bills['PaymentRecords-dev'].scan()['Count'] == 1
+
+
+@pytest.mark.parametrize('bill, reason', [
+    ({'building_id': 'BLD-2', 'status': 'unpaid'}, 'UNIT_MAINTENANCE_BUILDING_MISMATCH'),
+    (None, 'UNIT_MAINTENANCE_NOT_FOUND'),
+])
+def test_write_conflict_reasons(bills, bill, reason):
+    # The bill changed between validation and the transaction
+    table = bills['UnitMaintenanceBills-dev']
+    if bill:
+        table.put_item(Item={'unit_maintenance_id': 'UMB-1', **bill})
+    else:
+        table.delete_item(Key={'unit_maintenance_id': 'UMB-1'})
+    record = {'payment_id': 'PAY-1', 'building_id': 'BLD-1', 'unit_maintenance_id': 'UMB-1'}
+
+    with pytest.raises(payment_processing.BillNotPayable) as excinfo:
+        payment_processing.record_payment(record, '2026-10-01T00:00:00')
+
+    assert excinfo.value.reason == reason
+    assert not isinstance(excinfo.value, payment_processing.BillAlreadyPaid)
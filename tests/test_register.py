@@ -0,0 +1,35 @@
+import json
+
+import boto3
+import pytest
+
+from auth import register
+from common import building_roles
+
+
+@pytest.fixture
+def user_pool(tables, monkeypatch):
+    pool_id = boto3.client('cognito-idp').create_user_pool(PoolName='residents')['UserPool']['Id']
+    monkeypatch.setattr(register, 'USER_POOL_ID', pool_id)
+    return pool_id
+
+
+def register_resident(role):
+    response = register.lambda_handler({'body': json.dumps({
+        'name': 'Resident', 'mobile': '9000000001', 'password': 'Secret#123',
+        'building_id': 'BLD-1', 'role': role
+    })}, None)
+    assert response['statusCode'] in (200, 201), response
+    return response
+
+
+def test_role_change_revokes_older_tokens(user_pool, tables):
+    register_resident('admin')
+    assert building_roles.get_user_role('user_9000000001', 'BLD-1') == 'admin'
+    assert 'roles_updated_at' not in tables['Users-dev'].get_item(Key={'user_id': 'user_9000000001'})['Item']
+
+    register_resident('member')
+
+    user = tables['Users-dev'].get_item(Key={'user_id': 'user_9000000001'})['Item']
+    assert user['roles_updated_at'] > 0
+    assert building_roles.get_user_role('user_9000000001', 'BLD-1') == 'member'
@@ -0,0 +1,77 @@
+import json
+
+from connections import submit_connection_request
+
+BODY = {
+    'user_id': 'user_9876543210',
+    'user_name': 'Resident',
+    'user_mobile': '+919876543210',
+    'building_id': 'BLD-1',
+    'wing': 'A',
+    'floor': '2',
+    'unit_number': '201'
+}
+
+
+def submit(tables):
+    tables['Buildings-dev'].put_item(Item={
+        'building_id': 'BLD-1', 'building_name': 'Sunrise Heights', 'building_code': 'SUN001', 'wings': ['A']
+    })
+    response = submit_connection_request.lambda_handler({'body': json.dumps(BODY)}, None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def set_status(tables, request_id, status):
+    tables['ConnectionRequests-dev'].update_item(
+        Key={'request_id': request_id},
+        UpdateExpression='SET #status = :status, updated_at = :updated_at',
+        ExpressionAttributeNames={'#status': 'status'},
+        ExpressionAttributeValues={':status': status, ':updated_at': f"2026-01-01T00:00:00-{status}"}
+    )
+
+
+def test_new_request_is_pending(tables):
+    status, body = submit(tables)
+
+    assert status == 201
+    item = tables['ConnectionRequests-dev'].get_item(Key={'request_id': body['request_id']})['Item']
+    assert item['status'] == 'pending'
+
+
+def test_pending_request_is_not_resubmitted(tables):
+    _, first = submit(tables)
+
+    status, body = submit(tables)
+
+    assert status == 400
+    assert body['request_id'] == first['request_id']
+    assert 'pending' in body['message']
+
+
+def test_approved_request_is_not_replaced(tables):
+    _, first = submit(tables)
+    set_status(tables, first['request_id'], 'approved')
+
+    status, body = submit(tables)
+
+    assert status == 400
+    assert 'approved' in body['message']
+    item = tables['ConnectionRequests-dev'].get_item(Key={'request_id': first['request_id']})['Item']
+    assert item['status'] == 'approved'
+    assert tables['ConnectionRequestHistory-dev'].scan()['Items'] == []
+
+
+def test_rejected_request_is_kept_when_resubmitted(tables):
+    _, first = submit(tables)
+    set_status(tables, first['request_id'], 'rejected')
+
+    status, body = submit(tables)
+
+    assert status == 201
+    item = tables['ConnectionRequests-dev'].get_item(Key={'request_id': first['request_id']})['Item']
+    assert item['status'] == 'pending'
+    history = tables['ConnectionRequestHistory-dev'].scan()['Items']
+    assert len(history) == 1
+    assert history[0]['request_id'] == first['request_id']
+    assert history[0]['status'] == 'rejected'
+    assert history[0]['history_id'] == f"{first['request_id']}#2026-01-01T00:00:00-rejected"
@@ -0,0 +1,149 @@
+import json
+
+import pytest
+
+from common import building_roles
+from unit import unit_maintenance_bill
+
+ADMIN = 'user_admin'
+BILL_ITEMS = [{'name': 'Maintenance', 'amount': 1500}]
+
+
+@pytest.fixture
+def building(tables):
+    tables['UserBuildingRoles-dev'].put_item(Item={
+        'user_building_composite': building_roles.composite_key(ADMIN, 'BLD-1'),
+        'user_id': ADMIN, 'building_id': 'BLD-1', 'role': 'admin'
+    })
+    with tables['UserUnits-dev'].batch_writer() as writer:
+        for i, unit_number in enumerate(['101', '102', '201']):
+            writer.put_item(Item={
+                'unit_id': f"UNIT-{i}", 'user_id': f"user_{i}", 'building_id': 'BLD-1',
+                'wings': 'A', 'floor': unit_number[0], 'unit_number': unit_number, 'status': 'active'
+            })
+    return tables
+
+
+def call(method, path, body):
+    response = unit_maintenance_bill.lambda_handler(
+        {'httpMethod': method, 'path': path, 'body': json.dumps(body)}, None
+    )
+    return response['statusCode'], json.loads(response['body'])
+
+
+def bulk(maintenance_id='MAINT-1'):
+    return call('POST', '/unit_maintenance_bill/bulk', {
+        'building_id': 'BLD-1', 'maintenance_id': maintenance_id, 'user_id': ADMIN, 'bill_items': BILL_ITEMS
+    })
+
+
+def test_bulk_skips_unit_billed_by_single_post(building):
+    code, _ = call('POST', '/unit_maintenance_bill', {
+        'building_id': 'BLD-1', 'maintenance_id': 'MAINT-1', 'user_id': ADMIN,
+        'wings': 'A', 'floor': 1, 'unit_no': '101', 'bill_items': BILL_ITEMS
+    })
+    assert code == 201
+
+    code, body = bulk()
+
+    assert code == 200
+    assert body['summary'] == {'created': 2, 'exists': 1}
+    assert building['UnitMaintenanceBills-dev'].scan()['Count'] == 3
+
+
+def test_bulk_rerun_creates_nothing(building):
+    assert bulk()[1]['summary'] == {'created': 3}
+
+    assert bulk()[1]['summary'] == {'exists': 3}
+    assert building['UnitMaintenanceBills-dev'].scan()['Count'] == 3
+
+
+def test_bulk_never_replaces_a_paid_bill(building, monkeypatch):
+    assert bulk()[1]['summary'] == {'created': 3}
+    table = building['UnitMaintenanceBills-dev']
+    paid_id = unit_maintenance_bill.bulk_bill_id('MAINT-1', unit_maintenance_bill.unit_key('A', 1, '101'))
+    table.update_item(
+        Key={'unit_maintenance_id': paid_id},
+        UpdateExpression='SET payment_status = :paid REMOVE unpaid_building_id',
+        ExpressionAttributeValues={':paid': 'paid'}
+    )
+    # The index read lags behind the writes
+    monkeypatch.setattr(unit_maintenance_bill, 'billed_unit_keys', lambda building_id, maintenance_id: set())
+
+    assert bulk()[1]['summary'] == {'exists': 3}
+    assert table.get_item(Key={'unit_maintenance_id': paid_id})['Item']['payment_status'] == 'paid'
+
+
+def test_bulk_ignores_cycles_sharing_a_prefix(building):
+    assert bulk('MAINT-1')[1]['summary'] == {'created': 3}
+
+    assert bulk('MAINT-10')[1]['summary'] == {'created': 3}
+
+
+def list_bills(**params):
+    response = unit_maintenance_bill.lambda_handler({
+        'httpMethod': 'GET', 'path': '/unit_maintenance_bill',
+        'queryStringParameters': {'building_id': 'BLD-1', **params}
+    }, None)
+    return json.loads(response['body'])['data']
+
+
+def test_cycle_listing_does_not_match_longer_ids(building):
+    bulk('MAINT-1')
+    bulk('MAINT-10')
+
+    assert {b['maintenance_id'] for b in list_bills(maintenance_id='MAINT-1')} == {'MAINT-1'}
+    assert len(list_bills(maintenance_id='MAINT-1', wing='A', floor='1')) == 2
+    assert len(list_bills(maintenance_id='MAINT-10', payment_status='unpaid')) == 3
+
+
+@pytest.mark.parametrize('stage, index', [
+    (1, 'BuildingIndex'), (2, 'UnitLocationIndex'), (3, 'UnitLocationIndex')
+])
+def test_unit_listing_waits_for_its_index(building, monkeypatch, stage, index):
+    monkeypatch.setattr(unit_maintenance_bill, 'BILL_INDEX_STAGE', stage)
+    params = {'wing': 'A', 'floor': '1', 'unit_no': '101'}
+
+    assert unit_maintenance_bill.choose_bill_index('BLD-1', params)[0]['IndexName'] == index
+    bulk()
+    assert [b['unit_no'] for b in list_bills(**params)] == ['101']
+
+
+@pytest.mark.parametrize('stage, index', [
+    (1, 'BuildingIndex'), (2, 'BuildingIndex'), (3, 'UnpaidBuildingIndex')
+])
+def test_unpaid_listing_waits_for_its_index(building, monkeypatch, stage, index):
+    monkeypatch.setattr(unit_maintenance_bill, 'BILL_INDEX_STAGE', stage)
+
+    assert unit_maintenance_bill.choose_bill_index('BLD-1', {'payment_status': 'unpaid'})[0]['IndexName'] == index
+    bulk()
+    assert len(list_bills(payment_status='unpaid')) == 3
+
+
+def test_selective_filter_reads_a_bounded_number_of_pages(building, count_calls):
+    table = building['UnitMaintenanceBills-dev']
+    with table.batch_writer() as writer:
+        for i in range(60):
+            writer.put_item(Item=unit_maintenance_bill.build_unit_bill(
+                f"UNIT-BILL-{i:03d}", 'BLD-1', 'MAINT-1', 'user_match' if i == 59 else 'user_other',
+                'A', 1, f"{i:03d}", BILL_ITEMS, 1500, None
+            ))
+
+    found = []
+    queries_per_request = []
+    params = {'building_id': 'BLD-1', 'filter_user_id': 'user_match', 'limit': '5'}
+    while True:
+        with count_calls(unit_maintenance_bill.unit_maintenance_table) as calls:
+            response = unit_maintenance_bill.lambda_handler({
+                'httpMethod': 'GET', 'path': '/unit_maintenance_bill', 'queryStringParameters': params
+            }, None)
+        queries_per_request.append(calls.count('Query'))
+        body = json.loads(response['body'])
+        found.extend(body['data'])
+        if not body['next_token']:
+            break
+        params = {**params, 'next_token': body['next_token']}
+
+    assert [b['unit_maintenance_id'] for b in found] == ['UNIT-BILL-059']
+    assert max(queries_per_request) == unit_maintenance_bill.BILL_LIST_MAX_PAGES
+    assert len(queries_per_request) > 1
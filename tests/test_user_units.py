@@ -0,0 +1,55 @@
+import pytest
+
+from common import user_units
+
+
+@pytest.fixture
+def units(tables):
+    table = tables['UserUnits-dev']
+    table.put_item(Item={
+        'unit_id': 'UNIT-1', 'user_id': 'user_1', 'building_id': 'BLD-1', 'wings': 'A', 'floor': 1,
+        'unit_number': '101', 'unit_location': user_units.unit_location_key('BLD-1', 'A', 1, '101'),
+        'status': 'active'
+    })
+    # Written before unit_location existed
+    table.put_item(Item={
+        'unit_id': 'UNIT-2', 'user_id': 'user_1', 'building_id': 'BLD-1', 'wings': 'A', 'floor': 2,
+        'unit_number': '201', 'status': 'inactive'
+    })
+    table.put_item(Item={
+        'unit_id': 'UNIT-3', 'user_id': 'user_2', 'building_id': 'BLD-2', 'wings': 'B', 'floor': 1,
+        'unit_number': '101', 'status': 'active'
+    })
+    return table
+
+
+def unit_ids(items):
+    return sorted(item['unit_id'] for item in items)
+
+
+@pytest.mark.parametrize('stage', [1, 2, 3, 4])
+def test_lookups_agree_at_every_stage(units, monkeypatch, stage):
+    monkeypatch.setattr(user_units, 'INDEX_STAGE', stage)
+
+    assert unit_ids(user_units.get_units_for_user(units, 'user_1')) == ['UNIT-1', 'UNIT-2']
+    assert unit_ids(user_units.get_units_for_building(units, 'BLD-1')) == ['UNIT-1', 'UNIT-2']
+    assert unit_ids(user_units.get_units_for_user(
+        units, 'user_1',
+        FilterExpression='#stat = :statval',
+        ExpressionAttributeValues={':statval': 'active'},
+        ExpressionAttributeNames={'#stat': 'status'}
+    )) == ['UNIT-1']
+    assert unit_ids(user_units.get_units_at_location(units, 'BLD-1', 'A', '1', '101')) == ['UNIT-1']
+
+
+@pytest.mark.parametrize('stage, index_reads', [(1, 0), (2, 1), (3, 2), (4, 3)])
+def test_indexes_are_read_only_after_they_are_built(units, monkeypatch, count_calls, stage, index_reads):
+    monkeypatch.setattr(user_units, 'INDEX_STAGE', stage)
+
+    with count_calls(units) as calls:
+        user_units.get_units_for_user(units, 'user_1')
+        user_units.get_units_for_building(units, 'BLD-1')
+        user_units.get_units_at_location(units, 'BLD-1', 'A', '1', '101')
+
+    assert calls.count('Query') == index_reads
+    assert calls.count('Scan') == 3 - index_reads